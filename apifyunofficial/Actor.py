@@ -1,5 +1,6 @@
-import requests
+import tempfile
 
+from . import common, waiter
 from .ApifyABC import ApifyABC
 
 
@@ -7,7 +8,7 @@ class ActorABC(ApifyABC):
     def __init__(self, actor_id, session, config):
         super().__init__(session, config)
         self._actor_id = actor_id
-        self._base_url = 'https://api.apify.com/v2/acts/' + self.get_actor_id()
+        self._base_url = common._api_url + '/v2/acts/' + self.get_actor_id()
 
     def get_actor_id(self):
         """Returns: actor_id (str): actor ID"""
@@ -15,13 +16,13 @@ class ActorABC(ApifyABC):
 
 
 class Actor(ActorABC):
-    def __init__(self, actor_id, session=requests.Session(), config="apify_config.json"):
+    def __init__(self, actor_id, session=None, config="apify_config.json"):
         """Class for interacting with Apify actors
         https://www.apify.com/docs/api/v2#/reference/actors
 
         Args:
             actor_id (str): actor ID or <username>~<actor name>
-            session (requests.Session object): used to send the HTTP requests (default: new session)
+            session (requests.Session object): used to send the HTTP requests (default: shared session)
             config (str, path-like): path to JSON file with user ID and token
         """
         super().__init__(actor_id, session, config)
@@ -33,7 +34,7 @@ class Actor(ActorABC):
         Returns:
             actor_details (JSON object): actor details
         """
-        return super()._get()
+        return super()._get(cacheable=True)
 
     def update(self, settings={}):
         """Updates actor settings
@@ -61,7 +62,7 @@ class Actor(ActorABC):
             version_list (JSON object): basic information about each version
         """
         url = self._base_url + "/versions"
-        return super()._get(url)
+        return super()._get(url, cacheable=True)
 
     def create_version(self):
         """Creates actor version
@@ -100,12 +101,15 @@ class Actor(ActorABC):
         url = self._base_url + "/builds"
         return super()._get(url, None, **kwargs)
 
-    def build(self, version, **kwargs):
+    def build(self, version, build_cache=None, force=False, **kwargs):
         """Builds an actor
         https://www.apify.com/docs/api/v2#/reference/actors/build-collection/build-actor
 
         Args:
             version (str): version number to be built
+            build_cache (buildcache.BuildCache): if given, reuses the last build of the same version source
+                and build options instead of building again (default: None)
+            force (bool): if True, builds even if build_cache holds a build of the same source (default: False)
         kwargs:
             useCache (bool): whether use a cache to speed up the build process (default: False)
             betaPackages (bool): whether actor is built with beta versions of Apify NPM packages
@@ -115,6 +119,8 @@ class Actor(ActorABC):
         Returns:
             build_list (JSON object): list of runs and their metadata
         """
+        if build_cache is not None:
+            return build_cache.build(self, version, force, **kwargs)
         url = self._base_url + "/builds"
         kwargs["version"] = version
         return super()._post(url, None, **kwargs)
@@ -164,12 +170,13 @@ class Actor(ActorABC):
         url = self._base_url + "/runs"
         return super()._post(url, input_, **kwargs)
 
-    def run_synchronously(self, input_=None, **kwargs):
+    def run_synchronously(self, input_=None, stream=False, **kwargs):
         """Runs actor and returns its output
         https://www.apify.com/docs/api/v2#/reference/actors/run-actor-synchronously
 
         Args:
             input_ (JSON object): custom input fields (default: None)
+            stream (bool): if True, returns the output before its body is downloaded (default: False)
         kwargs:
             outputRecordKey (str): key to return from default key-value store (default: 'OUTPUT')
             timeout (int): timeout for the run (default: timeout from default run configuration)
@@ -177,10 +184,11 @@ class Actor(ActorABC):
             build (str): tag or number of actor build to run (default: build from default run configuration)
 
         Returns:
-            out (JSON object): run output
+            out (JSON object, str, bytes or Actor.RunOutput): run output, decoded according to its content type,
+                or the streamed output if stream is True
         """
         url = self._base_url + "/run-sync"
-        return super()._post(url, input_, **kwargs)
+        return _run_synchronously(self, url, input_, stream, kwargs)
 
     def Run(self, run_id):
         """Class for interacting with Apify actor runs
@@ -195,18 +203,18 @@ class Actor(ActorABC):
 
 
 class Task(ApifyABC):
-    def __init__(self, task_id, session=requests.Session(), config="apify_config.json"):
+    def __init__(self, task_id, session=None, config="apify_config.json"):
         """Class for interacting with Apify actor tasks
         https://www.apify.com/docs/api/v2#/reference/actor-tasks
 
         Args:
             task_id (str): actor ID or <username>~<actor name>
-            session (requests.Session object): used to send the HTTP requests (default: new session)
+            session (requests.Session object): used to send the HTTP requests (default: shared session)
             config (str, path-like): path to JSON file with user ID and token
         """
         super().__init__(session, config)
         self._task_id = task_id
-        self._base_url = 'https://api.apify.com/v2/actor-tasks/' + self.get_task_id()
+        self._base_url = common._api_url + '/v2/actor-tasks/' + self.get_task_id()
 
     def get_task_id(self):
         """Returns: task_id (str): actor task ID"""
@@ -219,7 +227,7 @@ class Task(ApifyABC):
         Returns:
             task_details (JSON object): actor details
         """
-        return super()._get()
+        return super()._get(cacheable=True)
 
     def update(self, settings={}):
         """Updates task settings
@@ -270,20 +278,134 @@ class Task(ApifyABC):
         url = self._base_url + "/runs"
         return super()._post(url, input_, **kwargs)
 
-    def run_synchronously(self, input_={}, **kwargs):
+    def run_synchronously(self, input_={}, stream=False, **kwargs):
         """Runs task and returns its output
         https://www.apify.com/docs/api/v2#/reference/actor-tasks/run-task-synchronously/run-task-synchronously
 
         Args:
             input_ (JSON object): custom input fields (default: None)
+            stream (bool): if True, returns the output before its body is downloaded (default: False)
         kwargs:
             outputRecordKey (str): key to return from default key-value store (default: 'OUTPUT')
 
         Returns:
-            out (JSON object): run output
+            out (JSON object, str, bytes or Actor.RunOutput): run output, decoded according to its content type,
+                or the streamed output if stream is True
         """
         url = self._base_url + "/run-sync"
-        return super()._get(url, input_, **kwargs)
+        return _run_synchronously(self, url, input_, stream, kwargs)
+
+
+class RunOutput:
+    def __init__(self, response):
+        """Output of a synchronous run, read from the response as it downloads
+        Use as a context manager, or read it to the end, to release the connection.
+
+        Args:
+            response (requests.Response): run-sync response
+        """
+        self.content_type = response.headers.get("Content-Type", "application/octet-stream")
+        self._response = response
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def is_json(self):
+        """Returns: json (bool): whether the output is JSON or JSON lines"""
+        return _is_json_type(self._mime_type())
+
+    def iter_chunks(self, chunk_size=1 << 16):
+        """Yields: chunk (bytes): raw body, chunk_size bytes at a time (default: 64 KiB)"""
+        try:
+            yield from self._response.iter_content(chunk_size)
+        finally:
+            self.close()
+
+    def iter_items(self):
+        """Decodes JSON output one item at a time
+
+        Yields:
+            item (JSON object): each element of a top-level JSON array, each line of JSON lines,
+                or the whole document if it is not an array
+        """
+        if not self.is_json():
+            self.close()
+            raise ValueError("output of type {0} is not JSON".format(self.content_type))
+        return common._iter_json(self._response, self._mime_type() in _jsonl_types)
+
+    def save(self, file=None, chunk_size=1 << 16):
+        """Streams the body to a file
+
+        Args:
+            file (str, path-like or binary file object): where to write the body (default: None, a temporary file)
+            chunk_size (int): number of bytes read at a time (default: 64 KiB)
+
+        Returns:
+            out (str or file object): path to the file, or file if it is a file object
+        """
+        if file is None:
+            f = tempfile.NamedTemporaryFile(delete=False)
+        elif hasattr(file, "write"):
+            f = file
+        else:
+            f = open(file, "wb")
+        try:
+            for chunk in self.iter_chunks(chunk_size):
+                f.write(chunk)
+        finally:
+            if f is not file:
+                f.close()
+        return f.name if file is None else file
+
+    def decode(self):
+        """Returns: out (JSON object, str or bytes): whole body, decoded if it is JSON or text"""
+        if self._mime_type() in _jsonl_types:
+            return list(self.iter_items())
+        try:
+            if self.is_json():
+                return common._decode(self._response)
+            if self._mime_type().startswith("text/"):
+                return self._response.text
+            return self._response.content
+        finally:
+            self.close()
+
+    def close(self):
+        """Releases the connection, dropping the rest of the body"""
+        self._response.close()
+
+    def _mime_type(self):
+        return _mime_type(self.content_type)
+
+
+# Content types of run outputs holding one JSON document per line
+_jsonl_types = ("application/jsonl", "application/x-ndjson")
+
+
+def _mime_type(content_type):
+    """Returns: mime_type (str): content type without its parameters, lowercased"""
+    return content_type.split(";")[0].strip().lower()
+
+
+def _is_json_type(mime_type):
+    """Returns: json (bool): whether a body of mime_type is JSON or JSON lines"""
+    return mime_type in ("application/json",) + _jsonl_types or mime_type.endswith("+json")
+
+
+def _run_synchronously(obj, url, input_, stream, kwargs):
+    kwargs.setdefault("token", obj.get_token())
+    body = {} if input_ is None else common._json_body(input_)
+    r = common._send(obj.get_session(), "POST", url, params=kwargs, stream=stream, **body)
+    try:
+        r.raise_for_status()
+    except Exception:
+        r.close()
+        raise
+    output = RunOutput(r)
+    return output if stream else output.decode()
 
 
 class _Build(ActorABC):
@@ -313,6 +435,19 @@ class _Build(ActorABC):
         url = self._base_url.replace(self.get_build_id(), "abort" + self.get_build_id())
         return super()._post(url)
 
+    def wait(self, timeout=None, callback=None):
+        """Waits for the build to finish in the background, sharing a few long-polling connections with every other
+        waiting run and build
+
+        Args:
+            timeout (float): number of seconds after which the wait ends even if the build is still going (default: None, no limit)
+            callback (callable): called with the latest build details once the wait ends (default: None)
+
+        Returns:
+            future (concurrent.futures.Future): resolves to the latest build details
+        """
+        return waiter.get_run_waiter().wait_for(self, timeout, callback)
+
 
 class _Run(ActorABC):
     def __init__(self, actor_id, run_id, session, config):
@@ -346,6 +481,19 @@ class _Run(ActorABC):
         url = self._base_url.replace(self.get_run_id(), "abort" + self.get_run_id())
         return super()._post(url)
 
+    def wait(self, timeout=None, callback=None):
+        """Waits for the run to finish in the background, sharing a few long-polling connections with every other
+        waiting run and build
+
+        Args:
+            timeout (float): number of seconds after which the wait ends even if the run is still going (default: None, no limit)
+            callback (callable): called with the latest run details once the wait ends (default: None)
+
+        Returns:
+            future (concurrent.futures.Future): resolves to the latest run details
+        """
+        return waiter.get_run_waiter().wait_for(self, timeout, callback)
+
 
 class _Version(ActorABC):
     def __init__(self, actor_id, version_number, session, config):
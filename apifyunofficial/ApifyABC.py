@@ -1,14 +1,16 @@
-from . import common
+from . import cache, common
 
 
 class ApifyABC:
     def __init__(self, session, config):
         self._user_id, self._token = common._get_auth(config)
-        self.set_session(session)
         self._config = config
+        self.set_session(session)
 
     def get_session(self):
         """Returns: session (requests.Session): session used for requests"""
+        if self._session is None:
+            self._session = common._get_session(self._config)
         return self._session
 
     def get_token(self):
@@ -18,37 +20,67 @@ class ApifyABC:
     def set_session(self, session):
         """Changes the session object used for requests
         Args:
-            session (requests.Session): session used for requests
+            session (requests.Session): session used for requests, None for the session shared by the config
         """
         self._session = session
 
+    def set_cache(self, response_cache):
+        """Caches metadata GET responses for every object and function sharing this object's session
+        Run, build and execution statuses, records and items are never cached.
+        Args:
+            response_cache (cache.ResponseCache): cache to use, None to stop caching
+        """
+        if response_cache is None:
+            cache.ResponseCache.uninstall(self.get_session())
+        else:
+            response_cache.install(self.get_session())
+
+    def set_cassette(self, cassette):
+        """Records or replays the requests of every object and function sharing this object's session
+        Args:
+            cassette (cassette.Cassette): cassette to use, None to send requests to the API again
+        """
+        if cassette is None:
+            from .cassette import Cassette
+
+            Cassette.unmount(self.get_session())
+        else:
+            cassette.mount(self.get_session())
+
     def _delete(self):
-        r = self.get_session().delete(self._base_url, params={"token": self.get_token()})
+        r = common._send(self.get_session(), "DELETE", self._base_url, params={"token": self.get_token()})
+        common._invalidate(self.get_session(), self._base_url)
         r.raise_for_status()
 
-    def _get(self, url=None, data=None, **kwargs):
+    def _get(self, url=None, data=None, stream=False, cacheable=False, **kwargs):
         url = self._base_url if url is None else url
         kwargs.setdefault("token", self.get_token())
+        if data is None and not stream:
+            return common._cached_get(self.get_session(), url, kwargs, cacheable)
         if data is None:
-            r = self.get_session().get(url, params=kwargs)
+            r = common._send(self.get_session(), "GET", url, params=kwargs, stream=stream)
         else:
-            r = self.get_session().get(url, params=kwargs, json=data)
+            r = common._send(self.get_session(), "GET", url, params=kwargs, stream=stream, **common._json_body(data))
         r.raise_for_status()
-        return r.json()
+        if stream:
+            return common._iter_json(r, kwargs.get("format") == "jsonl")
+        return common._decode(r)
 
     def _put(self, url=None, data=None, **kwargs):
         kwargs.setdefault("token", self.get_token())
         url = self._base_url if url is None else url
-        r = self.get_session().put(url, params=kwargs, json=data)
+        r = common._send(self.get_session(), "PUT", url, params=kwargs, **common._json_body(data))
+        common._invalidate(self.get_session(), url)
         r.raise_for_status()
-        return r.json()
+        return common._decode(r)
 
     def _post(self, url=None, data=None, **kwargs):
         url = self._base_url if url is None else url
         kwargs.setdefault("token", self.get_token())
         if data is None:
-            r = self.get_session().post(url, params=kwargs)
+            r = common._send(self.get_session(), "POST", url, params=kwargs)
         else:
-            r = self.get_session().post(url, params=kwargs, json=data)
+            r = common._send(self.get_session(), "POST", url, params=kwargs, **common._json_body(data))
+        common._invalidate(self.get_session(), url)
         r.raise_for_status()
-        return r.json()
+        return common._decode(r)
@@ -1,9 +1,7 @@
 import itertools
 import time
-import urllib.request
-
-import requests
 
+from . import common, waiter
 from .ApifyABC import ApifyABC
 
 
@@ -15,19 +13,21 @@ class CrawlerABC(ApifyABC):
 
 
 class Crawler(CrawlerABC):
-    def __init__(self, crawler_id, session=requests.Session(), config="apify_config.json"):
+    def __init__(self, crawler_id, session=None, config="apify_config.json"):
         """Class for interacting with Apify crawlers
         https://www.apify.com/docs/api/v1#/reference/crawlers
 
         Args:
             crawler_id (str): ID of Apify crawler
-            session (requests.Session object): used to send the HTTP requests (default: new session)
+            session (requests.Session object): used to send the HTTP requests (default: shared session)
             config (str, path-like): path to JSON file with user ID and token
         """
         super().__init__(session, config)
         self._crawler_id = crawler_id
-        self._base_url = 'https://api.apify.com/v1/' + \
+        self._base_url = common._api_url + '/v1/' + \
             self.get_user_id() + '/crawlers/' + self.get_crawler_id()
+        # Last execution details by status filter, with the time they were fetched
+        self._last_execution = {}
 
     def get_crawler_id(self):
         """Returns: crawler_id (str): crawler ID"""
@@ -76,27 +76,23 @@ class Crawler(CrawlerABC):
             wait (int): max. number of seconds the server waits for execution to finish (default: 0)
 
         Returns:
-            execution_details (JSON object): execution details
+            execution_details (JSON object): latest execution details
         """
         if len(kwargs.get("tag", "")) > 64:
             raise ValueError("tag cannot be longer than 64 characters")
         url = self._base_url + '/execute'
         kwargs.setdefault("token", self.get_token())
-        r = self.get_session().post(url, params=kwargs, json=settings)
-        r.raise_for_status()
-        status = r.json()["status"]
-        if status == "RUNNING":
-            # Check status every minute
-            wait = kwargs.get("wait", 0)
-            time_elapsed = min(wait, 120)
-            time_left = wait - time_elapsed
-            details_url = r.json()["detailsUrl"]
-            while time_left > 0 and status == "RUNNING":
-                sleep = min(time_left, 60)
-                time.sleep(sleep)
-                status = self.get_session().get(details_url).json()["status"]
+        r = common._send(self.get_session(), "POST", url, params=kwargs, **common._json_body(settings))
+        common._invalidate(self.get_session(), url)
+        self._last_execution.clear()
         r.raise_for_status()
-        return r.json()
+        details = common._decode(r)
+        # The server waits at most 120 seconds; the shared waiter polls for the rest of the time
+        time_left = kwargs.get("wait", 0) - 120
+        if details["status"] == "RUNNING" and time_left > 0:
+            execution = Execution(details["_id"], session=self.get_session(), config=self._config)
+            details = execution.wait(time_left).result()
+        return details
 
     def get_list_of_executions(self, **kwargs):
         """Gets the crawler's list of executions
@@ -115,18 +111,26 @@ class Crawler(CrawlerABC):
         url = self._base_url + "/execs"
         return super()._get(url, None, **kwargs)
 
-    def get_last_execution(self, **kwargs):
+    def get_last_execution(self, max_age=5, **kwargs):
         """Gets information about the crawler's last execution
         https://www.apify.com/docs/api/v1#/reference/executions/last-execution/get-last-execution
 
         Args:
+            max_age (float): number of seconds details fetched earlier by this object are reused, 0 to always fetch them (default: 5)
         kwargs:
             status (str): filter for the execution status (default: no filter)
 
         Returns:
             execution_details (JSON object): execution details
         """
-        return self.get_list_of_executions(desc=1)[0]
+        status = kwargs.get("status")
+        fetched = self._last_execution.get(status)
+        if fetched is not None and time.monotonic() - fetched[0] < max_age:
+            return fetched[1]
+        url = self._base_url + "/lastExec"
+        details = super()._get(url, None, **kwargs)
+        self._last_execution[status] = (time.monotonic(), details)
+        return details
 
     def get_last_execution_results(self, status=None, combine=False, **kwargs):
         """Gets results from the last crawler execution
@@ -134,7 +138,7 @@ class Crawler(CrawlerABC):
 
         Args:
             status (str): filter for the execution status (default: no filter)
-            combine (bool): if each page function result is a JSON object, combine them into one (if format == "json" and attachment == 0) (default: False)
+            combine (bool): if True, returns the page function results instead of the whole results, with list results flattened (if format is "json" or "jsonl" and attachment == 0) (default: False)
         kwargs:
             format (str): format of the results, either "json", "jsonl", "csv", "html", "xlsx", "xml" or "rss". (default: "json")
             simplified (int): if 1, then results are returned without metadata (default: 0)
@@ -153,13 +157,8 @@ class Crawler(CrawlerABC):
         Returns:
             out (JSON object or str): path to download file if attachment == 0 else execution results
         """
-        if status is None:
-            execution_id = self.get_last_execution()["_id"]
-        else:
-            execution_id = self.get_last_execution(status=status)["_id"]
-
+        execution_id = self.get_last_execution(status=status)["_id"]
         execution = Execution(execution_id, session=self.get_session(), config=self._config)
-
         return execution.get_results(combine=combine, **kwargs)
 
     def stop_last_execution(self):
@@ -171,6 +170,7 @@ class Crawler(CrawlerABC):
         """
         execution_id = self.get_last_execution()["_id"]
         execution = Execution(execution_id, session=self.get_session(), config=self._config)
+        self._last_execution.clear()
         return execution.stop()
 
 
@@ -179,18 +179,18 @@ class ExecutionError(Exception):
 
 
 class Execution(CrawlerABC):
-    def __init__(self, execution_id, session=requests.Session(), config="apify_config.json"):
+    def __init__(self, execution_id, session=None, config="apify_config.json"):
         """Class for interacting with Apify executions
         https://www.apify.com/docs/api/v1#/reference/executions
 
         Args:
             crawler_id (str): ID of Apify crawler
-            session (requests.Session object): used to send the HTTP requests (default: new session)
+            session (requests.Session object): used to send the HTTP requests (default: shared session)
             config (str, path-like): path to JSON file with user ID and token
         """
         super().__init__(session, config)
         self._execution_id = execution_id
-        self._base_url = "https://api.apify.com/v1/execs/" + self.get_execution_id()
+        self._base_url = common._api_url + "/v1/execs/" + self.get_execution_id()
 
     def get_execution_id(self):
         """Returns: execution_id (str): crawler ID"""
@@ -215,19 +215,37 @@ class Execution(CrawlerABC):
         """
         return super()._get()
 
-    def get_results(self, combine=False, **kwargs):
+    def wait(self, timeout=None, callback=None):
+        """Waits for the execution to finish in the background, sharing one thread with every other waiting execution
+
+        Args:
+            timeout (float): number of seconds after which the wait ends even if the execution is still running (default: None, no limit)
+            callback (callable): called with the latest execution details once the wait ends (default: None)
+
+        Returns:
+            future (concurrent.futures.Future): resolves to the latest execution details
+        """
+        return waiter.get_execution_waiter().wait_for(self, timeout, callback)
+
+    def get_results(self, combine=False, file=None, progress=None, stream=False, follow=False, poll_interval=1.0,
+                    **kwargs):
         """ Gets execution results
         https://www.apify.com/docs/api/v1#/reference/executions
 
         Args:
-            combine (bool): if each page function result is a JSON object, combine them into one (if format == "json" and attachment == 0) (default: False)
+            combine (bool): if True, returns the page function results instead of the whole results, with list results flattened (if format is "json" or "jsonl" and attachment == 0) (default: False)
+            stream (bool): if True and format is "json" or "jsonl", results are decoded while they download and yielded one at a time (default: False)
+            file (str, path-like or binary file object): where to stream the results if attachment == 1 (default: None, a temporary file)
+            progress (callable): called with bytes downloaded, total bytes and bytes/sec while streaming if attachment == 1 (default: None)
+            follow (bool): if True, yields results as the running execution saves them, until it finishes; limit is then the page size (if format is "json" or "jsonl") (default: False)
+            poll_interval (float): number of seconds between polls for new results if follow is True (default: 1.0)
         kwargs:
             format (str): format of the results, either "json", "jsonl", "csv", "html", "xlsx", "xml" or "rss". (default: "json")
             simplified (int): if 1, then results are returned without metadata (default: 0)
             offset (int): rank of first request to return (default: 0)
             limit (int): maximum number of page results to return (default: 10000)
             desc (int): if 1, results are returned from most-recently to least-recently saved in database
-            attachment (int): if 1, results will be saved to working directory and not returned (default: 0)
+            attachment (int): if 1, results will be streamed to file and not returned (default: 0)
             delimiter (str): delimiter character for CSV format (default: ",")
             bom (int): if 1, results for all formats will be prefixed by UTF-8 BOM. If 0, BOM will be skipped (default: None)
             xmlRoot (str): default root element name of XML output (default: "results")
@@ -237,7 +255,7 @@ class Execution(CrawlerABC):
             skipHeaderRow (int): if 1, header row is skipped in CSV format (default: 0)
 
         Returns:
-            out (JSON object or str): path to download file if attachment == 1 else execution results
+            out (JSON object, iterator, str or file object): file, or path to download file if attachment == 1, else execution results
 
         """
         url = self._base_url + "/results"
@@ -249,25 +267,75 @@ class Execution(CrawlerABC):
             raise ValueError("Accepted formats: {0}".format(accepted_formats))
 
         if kwargs.get("attachment") == 1:
-            file_name, headers = urllib.request.urlretrieve(url)
-            return file_name
+            return common._download(self.get_session(), url, kwargs, file, progress)
+
+        if follow and format_ in ("json", "jsonl"):
+            return self._follow_results(combine, poll_interval, kwargs)
 
-        r = self.get_session().get(url, params=kwargs)
+        combine = combine and format_ in ("json", "jsonl")
+        stream = stream and format_ in ("json", "jsonl")
+        # Combined results are decoded while they download so that only the combined list is held in memory
+        r = common._send(self.get_session(), "GET", url, params=kwargs, stream=stream or combine)
         r.raise_for_status()
+        if combine:
+            results = _combine(common._iter_json(r, format_ == "jsonl"), kwargs.get("simplified", 0))
+            return results if stream else list(results)
+        if stream:
+            return common._iter_json(r, format_ == "jsonl")
         if format_ in ("json", "jsonl"):
-            result = r.json()
-            if combine:
-                simplified = kwargs.get("simplified", 0)
-                for i, r in enumerate(result):
-                    error = r.get("errorInfo")
-                    if error:
-                        raise ExecutionError(error)
-                    result[i] = r if simplified else r["pageFunctionResult"]
-
-                if len(result) > 0:
-                    if isinstance(result[0], list):
-                        result = list(itertools.chain.from_iterable(result))
+            return common._decode(r)
+        return r.text
+
+    def _follow_results(self, combine, poll_interval, kwargs):
+        kwargs["format"] = "json"
+        offset = kwargs.pop("offset", 0)
+        limit = kwargs.pop("limit", 1000)
+        pages = common._follow(lambda o, n: self.get_results(offset=o, limit=n, **kwargs),
+                               lambda: not waiter._is_active(waiter._fetch_details(self)), offset, limit, poll_interval)
+        for page in pages:
+            yield from _combine(page, kwargs.get("simplified", 0)) if combine else page
+
+    def iter_results(self, combine=False, limit=1000, prefetch=2, offset=0, **kwargs):
+        """Iterates over every execution result, fetching the next pages while the current one is consumed
+        https://www.apify.com/docs/api/v1#/reference/executions
+
+        Args:
+            combine (bool): if True, yields each page function result instead of the whole result, with list results flattened (default: False)
+            limit (int): number of results per page (default: 1000)
+            prefetch (int): maximum number of pages in flight or waiting to be consumed (default: 2)
+            offset (int): rank of first result to return (default: 0)
+        kwargs:
+            simplified (int): if 1, then results are returned without metadata (default: 0)
+            desc (int): if 1, results are returned from most-recently to least-recently saved in database
+            hideUrl (int): if 1, "url" field will not be added to each page function result (default: 0)
+            skipFailedPages (int): if 1, pages with errors are skipped are errorInfo is hidden (default: 0)
+
+        Yields:
+            result (JSON object): execution result, or page function result if combine is True
 
+        Raises:
+            ExecutionError: if combine is True and a page failed
+        """
+        kwargs["format"] = "json"
+        offsets = itertools.count(offset, limit)
+        pages = common._iter_prefetched(lambda o: self.get_results(offset=o, limit=limit, **kwargs), offsets, prefetch)
+        try:
+            for page in pages:
+                yield from _combine(page, kwargs.get("simplified", 0)) if combine else page
+                if len(page) < limit:
+                    return
+        finally:
+            pages.close()
+
+
+def _combine(results, simplified):
+    """Yields: result (JSON object): each page function result, list results flattened"""
+    for result in results:
+        error = result.get("errorInfo")
+        if error:
+            raise ExecutionError(error)
+        result = result if simplified else result["pageFunctionResult"]
+        if isinstance(result, list):
+            yield from result
         else:
-            result = r.text
-        return result
+            yield result
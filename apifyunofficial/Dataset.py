@@ -1,23 +1,25 @@
-import urllib.request
-
-import requests
+import concurrent.futures
+import itertools
+import threading
+import time
 
+from . import codec, common, waiter
 from .ApifyABC import ApifyABC
 
 
 class Dataset(ApifyABC):
-    def __init__(self, dataset_id, session=requests.Session(), config="apify_config.json"):
+    def __init__(self, dataset_id, session=None, config="apify_config.json"):
         """Class for interacting with Apify datasets
         https://www.apify.com/docs/api/v2#/reference/datasets/dataset/
 
         Args:
             dataset_id (str): dataset ID or <username>~<dataset name>
-            session (requests.Session object): used to send the HTTP requests (default: new session)
+            session (requests.Session object): used to send the HTTP requests (default: shared session)
             config (str, path-like): path to JSON file with user ID and token
         """
         super().__init__(session, config)
         self._dataset_id = dataset_id
-        self._base_url = "https://api.apify.com/v2/datasets/" + self.get_dataset_id()
+        self._base_url = common._api_url + "/v2/datasets/" + self.get_dataset_id()
 
     def get_dataset_id(self):
         """Returns: dataset_id (str): dataset ID"""
@@ -38,12 +40,14 @@ class Dataset(ApifyABC):
         """
         return super()._delete()
 
-    def get_items(self, **kwargs):
+    def get_items(self, file=None, progress=None, stream=False, **kwargs):
         """Gets items stored in the dataset
         https://www.apify.com/docs/api/v2#/reference/datasets/item-collection/get-items
 
         Args:
-            combine (bool): if each page function result is a JSON object, combine them into one (if format == "json" and attachment == 0) (default: False)
+            stream (bool): if True and format is "json" or "jsonl", items are decoded while they download and yielded one at a time (default: False)
+            file (str, path-like or binary file object): where to stream the items if attachment == 1 (default: None, a temporary file)
+            progress (callable): called with bytes downloaded, total bytes and bytes/sec while streaming if attachment == 1 (default: None)
         kwargs:
             format (str): format of the results, either "json", "jsonl", "csv", "html", "xlsx", "xml" or "rss". (default: "json")
             offset (int): rank of first item to return (default: 0)
@@ -52,7 +56,7 @@ class Dataset(ApifyABC):
             omit (str): comma-separated list of fields to omit (default: none)
             unwind (str): name of a field to unwind. If it's an array, its items are split into separate records
             desc (int): if 1, results are returned from most-recently to least-recently saved in database
-            attachment (int): if 1, results will be saved to working directory and not returned (default: 0)
+            attachment (int): if 1, results will be streamed to file and not returned (default: 0)
             delimiter (str): delimiter character for CSV format (default: ",")
             bom (int): if 1, results for all formats will be prefixed by UTF-8 BOM. If 0, BOM will be skipped (default: None)
             xmlRoot (str): default root element name of XML output (default: "items")
@@ -60,7 +64,7 @@ class Dataset(ApifyABC):
             skipHeaderRow (int): if 1, header row is skipped in CSV format (default: 0)
 
         Returns:
-            out (JSON object or str): path to download file if attachment == 1 else execution results
+            out (JSON object, iterator, str or file object): file, or path to download file if attachment == 1, else dataset items
         """
         url = self._base_url + "/items"
         kwargs.setdefault("token", self.get_token())
@@ -71,12 +75,110 @@ class Dataset(ApifyABC):
             raise ValueError("Accepted formats: {0}".format(accepted_formats))
 
         if kwargs.get("attachment") == 1:
-            file_name, headers = urllib.request.urlretrieve(url)
-            return file_name
+            return common._download(self.get_session(), url, kwargs, file, progress)
 
-        r = self.get_session().get(url, params=kwargs)
+        stream = stream and format_ in ("json", "jsonl")
+        r = common._send(self.get_session(), "GET", url, params=kwargs, stream=stream)
         r.raise_for_status()
-        return r.json() if format_ in ("json", "jsonl") else r.text
+        if stream:
+            return common._iter_json(r, format_ == "jsonl")
+        return common._decode(r) if format_ in ("json", "jsonl") else r.text
+
+    def iter_items(self, limit=1000, prefetch=2, offset=0, follow=None, poll_interval=1.0, **kwargs):
+        """Iterates over every item in the dataset, fetching the next pages while the current one is consumed
+        https://www.apify.com/docs/api/v2#/reference/datasets/item-collection/get-items
+
+        Args:
+            limit (int): number of items per page (default: 1000)
+            prefetch (int): maximum number of pages in flight or waiting to be consumed (default: 2)
+            offset (int): rank of first item to return (default: 0)
+            follow (Actor.Run): run writing to the dataset; if given, items are yielded as the run pushes them, until it finishes; cannot be combined with unwind (default: None)
+            poll_interval (float): number of seconds between polls for new items if follow is given (default: 1.0)
+        kwargs:
+            fields (str): comma-separated list of fields to return (default: all)
+            omit (str): comma-separated list of fields to omit (default: none)
+            unwind (str): name of a field to unwind. If it's an array, its items are split into separate records
+            desc (int): if 1, results are returned from most-recently to least-recently saved in database
+
+        Yields:
+            item (JSON object): dataset item
+        """
+        kwargs["format"] = "json"
+        if follow is not None:
+            if "unwind" in kwargs:
+                # Offsets count stored items, so the number of unwound items read says nothing about the next offset
+                raise ValueError("unwind cannot be used with follow")
+            pages = common._follow(lambda o, n: self.get_items(offset=o, limit=n, **kwargs),
+                                   lambda: not waiter._is_active(waiter._fetch_details(follow)), offset, limit,
+                                   poll_interval)
+            for page in pages:
+                yield from page
+            return
+        offsets = itertools.count(offset, limit)
+        pages = common._iter_prefetched(lambda o: self.get_items(offset=o, limit=limit, **kwargs), offsets, prefetch)
+        try:
+            for page in pages:
+                yield from page
+                # Unwinding can change the number of items per page, so only an empty page is conclusive
+                if len(page) == 0 or (len(page) < limit and "unwind" not in kwargs):
+                    return
+        finally:
+            pages.close()
+
+    def export(self, file=None, format_="jsonl", workers=4, chunk_size=10000, offset=0, **kwargs):
+        """Downloads the dataset as concurrent offset/limit ranges and writes them out in order
+        https://www.apify.com/docs/api/v2#/reference/datasets/item-collection/get-items
+
+        Args:
+            file (str, path-like or binary file object): where to write the items (default: None, return an iterator)
+            format_ (str): format of the items, either "jsonl" or "csv" (default: "jsonl")
+            workers (int): maximum number of ranges downloaded or waiting to be written at once (default: 4)
+            chunk_size (int): number of items per range (default: 10000)
+            offset (int): rank of first item to export (default: 0)
+        kwargs:
+            fields (str): comma-separated list of fields to return (default: all)
+            omit (str): comma-separated list of fields to omit (default: none)
+            desc (int): if 1, results are returned from most-recently to least-recently saved in database
+            delimiter (str): delimiter character for CSV format (default: ",")
+            bom (int): if 1, the output is prefixed by UTF-8 BOM. If 0, BOM will be skipped (default: None)
+            skipHeaderRow (int): if 1, header row is skipped in CSV format (default: 0)
+
+        Returns:
+            out (int or iterator of bytes): number of bytes written if file is given else the ranges' contents
+        """
+        if format_ not in ("jsonl", "csv"):
+            raise ValueError("Accepted formats: {0}".format(("jsonl", "csv")))
+        details = self.get()
+        item_count = details.get("data", details)["itemCount"]
+        url = self._base_url + "/items"
+        kwargs.setdefault("token", self.get_token())
+        kwargs["format"] = format_
+
+        def fetch(range_offset):
+            params = dict(kwargs, offset=range_offset, limit=chunk_size)
+            if range_offset != offset:
+                # Only the first range carries the header row and BOM
+                params["skipHeaderRow"] = 1
+                params["bom"] = 0
+            r = common._send(self.get_session(), "GET", url, params=params)
+            r.raise_for_status()
+            return r.content
+
+        def write(f):
+            # Counted here, since not every file object's write returns the number of bytes written
+            written = 0
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+            return written
+
+        chunks = common._iter_prefetched(fetch, range(offset, item_count, chunk_size), workers)
+        if file is None:
+            return chunks
+        if hasattr(file, "write"):
+            return write(file)
+        with open(file, "wb") as f:
+            return write(f)
 
     def put_items(self, data):
         """Saves item(s) into the dataset
@@ -87,3 +189,160 @@ class Dataset(ApifyABC):
         """
         url = self._base_url + "/items"
         return super()._put(url, data)
+
+    def writer(self, **kwargs):
+        """Creates a buffered writer that uploads items in concurrent batches
+
+        Args:
+        kwargs: see DatasetWriter
+
+        Returns:
+            writer (DatasetWriter): writer for this dataset
+        """
+        return DatasetWriter(self, **kwargs)
+
+
+class DatasetWriter:
+    def __init__(self, dataset, max_bytes=5 * 1024 * 1024, workers=4, flush_interval=None, ordered=False):
+        """Buffers items and uploads them to a dataset in batches
+        Use as a context manager, or call close() to upload the remaining items.
+
+        Args:
+            dataset (Dataset): dataset to write to
+            max_bytes (int): maximum size of one batch once encoded (default: 5 MiB)
+            workers (int): maximum number of batches uploaded at once (default: 4)
+            flush_interval (float): maximum number of seconds an item waits in the buffer (default: None, no limit)
+            ordered (bool): if True, batches are uploaded one at a time so items keep their order (default: False)
+        """
+        self._dataset = dataset
+        self._url = dataset._base_url + "/items"
+        self._max_bytes = max_bytes
+        self._workers = 1 if ordered else workers
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._workers)
+        self._slots = threading.BoundedSemaphore(self._workers)
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffer_bytes = 2
+        self._buffer_since = None
+        self._stats_lock = threading.Lock()
+        self._error = None
+        self._items = 0
+        self._bytes = 0
+        self._batches = 0
+        self._start = time.monotonic()
+        self._closed = threading.Event()
+        self._timer = None
+        if flush_interval is not None:
+            self._timer = threading.Thread(target=self._flush_periodically, args=(flush_interval,), daemon=True)
+            self._timer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, item):
+        """Adds an item to the buffer, uploading the buffer first if the item would not fit
+
+        Args:
+            item (JSON object): item to store
+        """
+        self._raise_error()
+        encoded = codec.dumps(item)
+        if len(encoded) + 2 > self._max_bytes:
+            raise ValueError("item of {0} bytes exceeds max_bytes".format(len(encoded)))
+        with self._lock:
+            self._check_open()
+            if self._buffer and self._buffer_bytes + len(encoded) + 1 > self._max_bytes:
+                self._flush()
+            self._buffer.append(encoded)
+            self._buffer_bytes += len(encoded) + 1
+            if self._buffer_since is None:
+                self._buffer_since = time.monotonic()
+
+    def write_many(self, items):
+        """Adds items to the buffer
+
+        Args:
+            items (iterable of JSON objects): items to store
+        """
+        for item in items:
+            self.write(item)
+
+    def flush(self):
+        """Uploads the buffered items without waiting for the upload to finish"""
+        self._raise_error()
+        with self._lock:
+            self._check_open()
+            self._flush()
+
+    def close(self):
+        """Uploads the buffered items and waits for every upload to finish"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        with self._lock:
+            self._flush()
+        self._executor.shutdown(wait=True)
+        self._raise_error()
+
+    def stats(self):
+        """Returns: stats (dict): items, bytes and batches uploaded, elapsed seconds and throughput"""
+        seconds = time.monotonic() - self._start
+        return {
+            "items": self._items,
+            "bytes": self._bytes,
+            "batches": self._batches,
+            "seconds": seconds,
+            "items_per_sec": self._items / seconds if seconds else 0.0,
+            "bytes_per_sec": self._bytes / seconds if seconds else 0.0,
+        }
+
+    def _flush(self):
+        # Called with the lock held; blocks while every worker is busy so the buffer stays bounded
+        if not self._buffer:
+            return
+        body = b"[" + b",".join(self._buffer) + b"]"
+        count = len(self._buffer)
+        self._buffer = []
+        self._buffer_bytes = 2
+        self._buffer_since = None
+        self._slots.acquire()
+        self._executor.submit(self._upload, body, count).add_done_callback(self._on_done)
+
+    def _upload(self, body, count):
+        r = common._send(self._dataset.get_session(), "PUT", self._url, params={"token": self._dataset.get_token()},
+                         data=body, headers={"Content-Type": "application/json"})
+        common._invalidate(self._dataset.get_session(), self._url)
+        r.raise_for_status()
+        return count, len(body)
+
+    def _on_done(self, future):
+        self._slots.release()
+        error = future.exception()
+        with self._stats_lock:
+            if error is not None:
+                self._error = self._error or error
+                return
+            count, size = future.result()
+            self._items += count
+            self._bytes += size
+            self._batches += 1
+
+    def _flush_periodically(self, interval):
+        while not self._closed.wait(min(interval, 1.0)):
+            with self._lock:
+                if self._buffer_since is not None and time.monotonic() - self._buffer_since >= interval:
+                    self._flush()
+
+    def _check_open(self):
+        # Called with the lock held; close() uploads the last buffer under the same lock after setting _closed
+        if self._closed.is_set():
+            raise RuntimeError("writer is closed")
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
@@ -1,5 +1,4 @@
-import requests
-
+from . import common
 from .ApifyABC import ApifyABC
 
 
@@ -7,7 +6,7 @@ class QueueABC(ApifyABC):
     def __init__(self, queue_id, session, config):
         super().__init__(session, config)
         self._queue_id = queue_id
-        self._base_url = 'https://api.apify.com/v2/request-queues/' + self.get_queue_id()
+        self._base_url = common._api_url + '/v2/request-queues/' + self.get_queue_id()
 
     def get_queue_id(self):
         """Returns: queue_id (str): queue ID"""
@@ -15,13 +14,13 @@ class QueueABC(ApifyABC):
 
 
 class Queue(QueueABC):
-    def __init__(self, queue_id, session=requests.Session(), config="apify_config.json"):
+    def __init__(self, queue_id, session=None, config="apify_config.json"):
         """Class for interacting with Apify request queues
         https://www.apify.com/docs/api/v2#/reference/request-queues/queue/
 
         Args:
             queue_id (str): queue ID or <username>~<queue name>
-            session (requests.Session object): used to send the HTTP requests (default: new session)
+            session (requests.Session object): used to send the HTTP requests (default: shared session)
             config (str, path-like): path to JSON file with user ID and token
         """
         super().__init__(queue_id, session, config)
@@ -33,7 +32,7 @@ class Queue(QueueABC):
         Returns:
             queue_details (JSON object): queue details
         """
-        return super()._get()
+        return super()._get(cacheable=True)
 
     def delete(self):
         """Deletes queue
@@ -1,5 +1,4 @@
-import requests
-
+from . import common
 from .ApifyABC import ApifyABC
 
 
@@ -7,7 +6,7 @@ class StoreABC(ApifyABC):
     def __init__(self, store_id, session, config):
         super().__init__(session, config)
         self._store_id = store_id
-        self._base_url = 'https://api.apify.com/v2/key-value-stores/' + self.get_store_id()
+        self._base_url = common._api_url + '/v2/key-value-stores/' + self.get_store_id()
 
     def get_store_id(self):
         """Returns: store_id (str): store ID"""
@@ -15,13 +14,13 @@ class StoreABC(ApifyABC):
 
 
 class Store(StoreABC):
-    def __init__(self, store_id, session=requests.Session(), config="apify_config.json"):
+    def __init__(self, store_id, session=None, config="apify_config.json"):
         """Class for interacting with Apify key-value stores
         https://www.apify.com/docs/api/v2#/reference/key-value-stores
 
         Args:
             store_id (str): key-value store ID or <username>~<store name>
-            session (requests.Session object): used to send the HTTP requests (default: new session)
+            session (requests.Session object): used to send the HTTP requests (default: shared session)
             config (str, path-like): path to JSON file with user ID and token
         """
         super().__init__(store_id, session, config)
@@ -33,7 +32,7 @@ class Store(StoreABC):
         Returns:
             store_details (JSON object): store details
         """
-        return super()._get()
+        return super()._get(cacheable=True)
 
     def delete(self):
         """Deletes the actor
@@ -103,9 +102,10 @@ class _Record(StoreABC):
         headers = {"Content-Type": mime_type}
         if gzip:
             headers["Content-Encoding"] = "gzip"
-        r = self.get_session().put(self._base_url, params={"token": self.get_token()}, json={self.get_record_key(): value}, headers=headers)
+        r = common._send(self.get_session(), "PUT", self._base_url, params={"token": self.get_token()}, **common._json_body({self.get_record_key(): value}, headers))
+        common._invalidate(self.get_session(), self._base_url)
         r.raise_for_status()
-        return r.json()
+        return common._decode(r)
 
     def delete(self):
         """Deletes record
@@ -131,6 +131,6 @@ class _Record(StoreABC):
         headers = {"Content-Type": mime_type}
         if gzip:
             headers["Content-Encoding"] = "gzip"
-        r = self.get_session().get(url, params={"token": self.get_token()}, headers=headers)
+        r = common._send(self.get_session(), "GET", url, params={"token": self.get_token()}, headers=headers)
         r.raise_for_status()
-        return r.json()
+        return common._decode(r)
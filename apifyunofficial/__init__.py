@@ -1,7 +1,70 @@
+import importlib
+import sys
+import types
+
 name = "apifyunofficial"
-from .Actor import Actor, Task
-from .Crawler import Crawler, Execution
-from .Dataset import Dataset
-from .Queue import Queue
-from .Store import Store
-from .functions import *
+
+# Submodules are imported on first attribute access so that importing the package stays cheap
+_exports = {
+    "Actor": ".Actor",
+    "Task": ".Actor",
+    "Crawler": ".Crawler",
+    "Execution": ".Crawler",
+    "Dataset": ".Dataset",
+    "Queue": ".Queue",
+    "Store": ".Store",
+    "Cassette": ".cassette",
+    "BuildCache": ".buildcache",
+    "ResponseCache": ".cache",
+    "InMemoryRecorder": ".metrics",
+    "Scheduler": ".scheduler",
+    "BatchRunner": ".batch",
+    "ExecutionWaiter": ".waiter",
+    "RunWaiter": ".waiter",
+    "CredentialProvider": ".credentials",
+    "DictCredentials": ".credentials",
+    "EnvCredentials": ".credentials",
+    "FileCredentials": ".credentials",
+    "create_crawler": ".functions",
+    "create_actor": ".functions",
+    "create_dataset": ".functions",
+    "create_key_value_store": ".functions",
+    "create_request_queue": ".functions",
+    "create_task": ".functions",
+    "get_list_of_crawlers": ".functions",
+    "get_list_of_actors": ".functions",
+    "get_list_of_datasets": ".functions",
+    "get_list_of_key_value_stores": ".functions",
+    "get_list_of_request_queues": ".functions",
+    "get_list_of_tasks": ".functions",
+    "get_public_user_data": ".functions",
+    "get_private_user_data": ".functions",
+    "get_results_of_executions": ".functions",
+    "run_and_iter_items": ".functions",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(attr):
+    module = _exports.get(attr)
+    if module is None:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, attr))
+    value = getattr(importlib.import_module(module, __name__), attr)
+    globals()[attr] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
+
+
+class _LazyModule(types.ModuleType):
+    def __setattr__(self, attr, value):
+        # Importing a submodule binds it on the package, which would shadow the class of the same name
+        if attr in _exports and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(attr, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
@@ -0,0 +1,215 @@
+from .. import codec, common as sync_common
+from ..Actor import _is_json_type, _jsonl_types, _mime_type
+from . import common
+from .ApifyABC import AsyncApifyABC
+
+
+class AsyncActorABC(AsyncApifyABC):
+    def __init__(self, actor_id, session, config):
+        super().__init__(session, config)
+        self._actor_id = actor_id
+        self._base_url = sync_common._api_url + '/v2/acts/' + self.get_actor_id()
+
+    def get_actor_id(self):
+        """Returns: actor_id (str): actor ID"""
+        return self._actor_id
+
+
+class AsyncActor(AsyncActorABC):
+    def __init__(self, actor_id, session=None, config="apify_config.json"):
+        """Asyncio version of Actor
+        https://www.apify.com/docs/api/v2#/reference/actors
+
+        Args:
+            actor_id (str): actor ID or <username>~<actor name>
+            session (aiohttp.ClientSession object): used to send the HTTP requests (default: shared session)
+            config (str, path-like): path to JSON file with user ID and token
+        """
+        super().__init__(actor_id, session, config)
+
+    async def get(self):
+        """See Actor.get"""
+        return await super()._get()
+
+    async def update(self, settings={}):
+        """See Actor.update"""
+        return await super()._put(data=settings)
+
+    async def delete(self):
+        """See Actor.delete"""
+        return await super()._delete()
+
+    async def get_list_of_versions(self):
+        """See Actor.get_list_of_versions"""
+        url = self._base_url + "/versions"
+        return await super()._get(url)
+
+    async def create_version(self):
+        """See Actor.create_version"""
+        url = self._base_url + "/versions"
+        return await super()._post(url)
+
+    def Version(self, version_number):
+        """See Actor.Version"""
+        return _AsyncVersion(self.get_actor_id(), version_number, self._session, self._config)
+
+    async def get_list_of_builds(self, **kwargs):
+        """See Actor.get_list_of_builds"""
+        url = self._base_url + "/builds"
+        return await super()._get(url, None, **kwargs)
+
+    async def build(self, version, **kwargs):
+        """See Actor.build"""
+        url = self._base_url + "/builds"
+        kwargs["version"] = version
+        return await super()._post(url, None, **kwargs)
+
+    def Build(self, build_id):
+        """See Actor.Build"""
+        return _AsyncBuild(self.get_actor_id(), build_id, self._session, self._config)
+
+    async def get_list_of_runs(self, **kwargs):
+        """See Actor.get_list_of_runs"""
+        url = self._base_url + "/runs"
+        return await super()._get(url, None, **kwargs)
+
+    async def run(self, input_={}, **kwargs):
+        """See Actor.run"""
+        url = self._base_url + "/runs"
+        return await super()._post(url, input_, **kwargs)
+
+    async def run_synchronously(self, input_=None, **kwargs):
+        """See Actor.run_synchronously; the output is always downloaded whole, as with stream=False"""
+        url = self._base_url + "/run-sync"
+        return await _run_synchronously(self, url, input_, kwargs)
+
+    def Run(self, run_id):
+        """See Actor.Run"""
+        return _AsyncRun(self.get_actor_id(), run_id, self._session, self._config)
+
+
+class AsyncTask(AsyncApifyABC):
+    def __init__(self, task_id, session=None, config="apify_config.json"):
+        """Asyncio version of Task
+        https://www.apify.com/docs/api/v2#/reference/actor-tasks
+
+        Args:
+            task_id (str): actor ID or <username>~<actor name>
+            session (aiohttp.ClientSession object): used to send the HTTP requests (default: shared session)
+            config (str, path-like): path to JSON file with user ID and token
+        """
+        super().__init__(session, config)
+        self._task_id = task_id
+        self._base_url = sync_common._api_url + '/v2/actor-tasks/' + self.get_task_id()
+
+    def get_task_id(self):
+        """Returns: task_id (str): actor task ID"""
+        return self._task_id
+
+    async def get(self):
+        """See Task.get"""
+        return await super()._get()
+
+    async def update(self, settings={}):
+        """See Task.update"""
+        return await super()._put(data=settings)
+
+    async def delete(self):
+        """See Task.delete"""
+        return await super()._delete()
+
+    async def get_list_of_runs(self, **kwargs):
+        """See Task.get_list_of_runs"""
+        url = self._base_url + "/runs"
+        return await super()._get(url, None, **kwargs)
+
+    async def run_asynchronously(self, input_={}, **kwargs):
+        """See Task.run_asynchronously"""
+        url = self._base_url + "/runs"
+        return await super()._post(url, input_, **kwargs)
+
+    async def run_synchronously(self, input_={}, **kwargs):
+        """See Task.run_synchronously; the output is always downloaded whole, as with stream=False"""
+        url = self._base_url + "/run-sync"
+        return await _run_synchronously(self, url, input_, kwargs)
+
+
+class _AsyncBuild(AsyncActorABC):
+    def __init__(self, actor_id, build_id, session, config):
+        super().__init__(actor_id, session, config)
+        self._build_id = build_id
+        self._base_url += "/builds/" + self.get_build_id()
+
+    def get_build_id(self):
+        """Returns: build_id (str): actor build ID"""
+        return self._build_id
+
+    async def get(self, **kwargs):
+        """See Actor.Build.get"""
+        return await super()._get(None, None, **kwargs)
+
+    async def abort(self):
+        """See Actor.Build.abort"""
+        url = self._base_url.replace(self.get_build_id(), "abort" + self.get_build_id())
+        return await super()._post(url)
+
+
+class _AsyncRun(AsyncActorABC):
+    def __init__(self, actor_id, run_id, session, config):
+        super().__init__(actor_id, session, config)
+        self._run_id = run_id
+        self._base_url += "/runs/" + self.get_run_id()
+
+    def get_run_id(self):
+        """Returns: run_id (str): actor run ID"""
+        return self._run_id
+
+    async def get(self, **kwargs):
+        """See Actor.Run.get"""
+        return await super()._get(None, None, **kwargs)
+
+    async def abort(self):
+        """See Actor.Run.abort"""
+        url = self._base_url.replace(self.get_run_id(), "abort" + self.get_run_id())
+        return await super()._post(url)
+
+
+class _AsyncVersion(AsyncActorABC):
+    def __init__(self, actor_id, version_number, session, config):
+        super().__init__(actor_id, session, config)
+        self._version_number = version_number
+        self._base_url += "/versions/" + self.get_version_number()
+
+    def get_version_number(self):
+        """Returns: version_number (str): actor version number"""
+        return self._version_number
+
+    async def get(self):
+        """See Actor.Version.get"""
+        return await super()._get()
+
+    async def update(self, settings={}):
+        """See Actor.Version.update"""
+        return await super()._put(data=settings)
+
+    async def delete(self):
+        """See Actor.Version.delete"""
+        return await super()._delete()
+
+
+async def _run_synchronously(obj, url, input_, kwargs):
+    """Returns: out (JSON object, str or bytes): run output, decoded according to its content type like
+    Actor.RunOutput.decode"""
+    kwargs.setdefault("token", obj.get_token())
+    body = {} if input_ is None else sync_common._json_body(input_)
+    async with common._scheduled(obj.get_session(), "POST", url, params=common._params(kwargs), **body) as r:
+        r.raise_for_status()
+        mime_type = _mime_type(r.headers.get("Content-Type", "application/octet-stream"))
+        if mime_type.startswith("text/"):
+            return await r.text()
+        content = await r.read()
+    if mime_type in _jsonl_types:
+        return [codec.loads(line) for line in content.splitlines() if line.strip()]
+    if _is_json_type(mime_type):
+        return codec.loads(content) if content else None
+    return content
@@ -0,0 +1,42 @@
+from .. import common as sync_common
+from . import common
+
+
+class AsyncApifyABC:
+    def __init__(self, session, config):
+        self._user_id, self._token = sync_common._get_auth(config)
+        self.set_session(session)
+        self._config = config
+
+    def get_session(self):
+        """Returns: session (aiohttp.ClientSession): session used for requests"""
+        return common._get_default_session() if self._session is None else self._session
+
+    def get_token(self):
+        """Returns: token (str): API token"""
+        return self._token
+
+    def set_session(self, session):
+        """Changes the session object used for requests
+        Args:
+            session (aiohttp.ClientSession): session used for requests, None for the shared session
+        """
+        self._session = session
+
+    async def _delete(self):
+        await common._request(self.get_session(), "DELETE", self._base_url, {"token": self.get_token()})
+
+    async def _get(self, url=None, data=None, **kwargs):
+        url = self._base_url if url is None else url
+        kwargs.setdefault("token", self.get_token())
+        return await common._request(self.get_session(), "GET", url, kwargs, data)
+
+    async def _put(self, url=None, data=None, **kwargs):
+        kwargs.setdefault("token", self.get_token())
+        url = self._base_url if url is None else url
+        return await common._request(self.get_session(), "PUT", url, kwargs, data)
+
+    async def _post(self, url=None, data=None, **kwargs):
+        url = self._base_url if url is None else url
+        kwargs.setdefault("token", self.get_token())
+        return await common._request(self.get_session(), "POST", url, kwargs, data)
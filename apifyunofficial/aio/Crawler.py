@@ -0,0 +1,146 @@
+import asyncio
+
+from .. import common as sync_common
+from ..Crawler import _combine
+from . import common
+from .ApifyABC import AsyncApifyABC
+
+
+class AsyncCrawlerABC(AsyncApifyABC):
+
+    def get_user_id(self):
+        """Returns: user_id (str): API user ID"""
+        return self._user_id
+
+
+class AsyncCrawler(AsyncCrawlerABC):
+    def __init__(self, crawler_id, session=None, config="apify_config.json"):
+        """Asyncio version of Crawler
+        https://www.apify.com/docs/api/v1#/reference/crawlers
+
+        Args:
+            crawler_id (str): ID of Apify crawler
+            session (aiohttp.ClientSession object): used to send the HTTP requests (default: shared session)
+            config (str, path-like): path to JSON file with user ID and token
+        """
+        super().__init__(session, config)
+        self._crawler_id = crawler_id
+        self._base_url = sync_common._api_url + '/v1/' + \
+            self.get_user_id() + '/crawlers/' + self.get_crawler_id()
+        self._last_execution = {}
+
+    def get_crawler_id(self):
+        """Returns: crawler_id (str): crawler ID"""
+        return self._crawler_id
+
+    async def get_settings(self, **kwargs):
+        """See Crawler.get_settings"""
+        return await super()._get(None, None, **kwargs)
+
+    async def update_settings(self, settings={}):
+        """See Crawler.update_settings"""
+        return await super()._put(data=settings)
+
+    async def delete(self):
+        """See Crawler.delete"""
+        return await super()._delete()
+
+    async def start(self, settings={}, **kwargs):
+        """See Crawler.start
+        Polls the execution details every minute once the server stops waiting.
+
+        Returns:
+            execution_details (JSON object): latest execution details
+        """
+        if len(kwargs.get("tag", "")) > 64:
+            raise ValueError("tag cannot be longer than 64 characters")
+        url = self._base_url + '/execute'
+        details = await super()._post(url, settings, **kwargs)
+        self._last_execution.clear()
+        wait = kwargs.get("wait", 0)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait - min(wait, 120)
+        execution = AsyncExecution(details["_id"], self._session, self._config)
+        while details["status"] == "RUNNING" and loop.time() < deadline:
+            await asyncio.sleep(min(deadline - loop.time(), 60))
+            details = await execution.get_details()
+        return details
+
+    async def get_list_of_executions(self, **kwargs):
+        """See Crawler.get_list_of_executions"""
+        url = self._base_url + "/execs"
+        return await super()._get(url, None, **kwargs)
+
+    async def get_last_execution(self, max_age=5, **kwargs):
+        """See Crawler.get_last_execution"""
+        loop = asyncio.get_running_loop()
+        status = kwargs.get("status")
+        fetched = self._last_execution.get(status)
+        if fetched is not None and loop.time() - fetched[0] < max_age:
+            return fetched[1]
+        url = self._base_url + "/lastExec"
+        details = await super()._get(url, None, **kwargs)
+        self._last_execution[status] = (loop.time(), details)
+        return details
+
+    async def get_last_execution_results(self, status=None, combine=False, **kwargs):
+        """See Crawler.get_last_execution_results"""
+        execution_id = (await self.get_last_execution(status=status))["_id"]
+        execution = AsyncExecution(execution_id, session=self._session, config=self._config)
+        return await execution.get_results(combine=combine, **kwargs)
+
+    async def stop_last_execution(self):
+        """See Crawler.stop_last_execution"""
+        execution_id = (await self.get_last_execution())["_id"]
+        execution = AsyncExecution(execution_id, session=self._session, config=self._config)
+        self._last_execution.clear()
+        return await execution.stop()
+
+
+class AsyncExecution(AsyncCrawlerABC):
+    def __init__(self, execution_id, session=None, config="apify_config.json"):
+        """Asyncio version of Execution
+        https://www.apify.com/docs/api/v1#/reference/executions
+
+        Args:
+            execution_id (str): ID of crawler execution
+            session (aiohttp.ClientSession object): used to send the HTTP requests (default: shared session)
+            config (str, path-like): path to JSON file with user ID and token
+        """
+        super().__init__(session, config)
+        self._execution_id = execution_id
+        self._base_url = sync_common._api_url + "/v1/execs/" + self.get_execution_id()
+
+    def get_execution_id(self):
+        """Returns: execution_id (str): execution ID"""
+        return self._execution_id
+
+    async def stop(self):
+        """See Execution.stop"""
+        url = self._base_url + "/stop"
+        return await super()._post(url)
+
+    async def get_details(self):
+        """See Execution.get_details"""
+        return await super()._get()
+
+    async def get_results(self, combine=False, **kwargs):
+        """See Execution.get_results"""
+        url = self._base_url + "/results"
+        kwargs.setdefault("token", self.get_token())
+        format_ = kwargs.get("format", "json").lower()
+        accepted_formats = ("json", "jsonl", "csv", "html",
+                            "rss", "xlsx", "xml", None)
+        if format_ not in accepted_formats:
+            raise ValueError("Accepted formats: {0}".format(accepted_formats))
+
+        if kwargs.get("attachment") == 1:
+            return await common._download(self.get_session(), url, kwargs)
+
+        if format_ not in ("json", "jsonl"):
+            return await common._request(self.get_session(), "GET", url, kwargs, text=True)
+
+        result = await common._request(self.get_session(), "GET", url, kwargs)
+        if combine:
+            return list(_combine(result, kwargs.get("simplified", 0)))
+        return result
@@ -0,0 +1,51 @@
+from .. import common as sync_common
+from . import common
+from .ApifyABC import AsyncApifyABC
+
+
+class AsyncDataset(AsyncApifyABC):
+    def __init__(self, dataset_id, session=None, config="apify_config.json"):
+        """Asyncio version of Dataset
+        https://www.apify.com/docs/api/v2#/reference/datasets/dataset/
+
+        Args:
+            dataset_id (str): dataset ID or <username>~<dataset name>
+            session (aiohttp.ClientSession object): used to send the HTTP requests (default: shared session)
+            config (str, path-like): path to JSON file with user ID and token
+        """
+        super().__init__(session, config)
+        self._dataset_id = dataset_id
+        self._base_url = sync_common._api_url + "/v2/datasets/" + self.get_dataset_id()
+
+    def get_dataset_id(self):
+        """Returns: dataset_id (str): dataset ID"""
+        return self._dataset_id
+
+    async def get(self):
+        """See Dataset.get"""
+        return await super()._get()
+
+    async def delete(self):
+        """See Dataset.delete"""
+        return await super()._delete()
+
+    async def get_items(self, **kwargs):
+        """See Dataset.get_items"""
+        url = self._base_url + "/items"
+        kwargs.setdefault("token", self.get_token())
+        format_ = kwargs.get("format", "json").lower()
+        accepted_formats = ("json", "jsonl", "csv", "html",
+                            "rss", "xlsx", "xml", None)
+        if format_ not in accepted_formats:
+            raise ValueError("Accepted formats: {0}".format(accepted_formats))
+
+        if kwargs.get("attachment") == 1:
+            return await common._download(self.get_session(), url, kwargs)
+
+        text = format_ not in ("json", "jsonl")
+        return await common._request(self.get_session(), "GET", url, kwargs, text=text)
+
+    async def put_items(self, data):
+        """See Dataset.put_items"""
+        url = self._base_url + "/items"
+        return await super()._put(url, data)
@@ -0,0 +1,81 @@
+from .. import common as sync_common
+from .ApifyABC import AsyncApifyABC
+
+
+class AsyncQueueABC(AsyncApifyABC):
+    def __init__(self, queue_id, session, config):
+        super().__init__(session, config)
+        self._queue_id = queue_id
+        self._base_url = sync_common._api_url + '/v2/request-queues/' + self.get_queue_id()
+
+    def get_queue_id(self):
+        """Returns: queue_id (str): queue ID"""
+        return self._queue_id
+
+
+class AsyncQueue(AsyncQueueABC):
+    def __init__(self, queue_id, session=None, config="apify_config.json"):
+        """Asyncio version of Queue
+        https://www.apify.com/docs/api/v2#/reference/request-queues/queue/
+
+        Args:
+            queue_id (str): queue ID or <username>~<queue name>
+            session (aiohttp.ClientSession object): used to send the HTTP requests (default: shared session)
+            config (str, path-like): path to JSON file with user ID and token
+        """
+        super().__init__(queue_id, session, config)
+
+    async def get(self):
+        """See Queue.get"""
+        return await super()._get()
+
+    async def delete(self):
+        """See Queue.delete"""
+        return await super()._delete()
+
+    async def add_request(self, unique_key, url, method, **kwargs):
+        """See Queue.add_request"""
+        accepted_methods = ("CONNECT", "DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT", "TRACE")
+        if method not in accepted_methods:
+            raise ValueError("accepted methods: {0}".format(accepted_methods))
+
+        url_ = self._base_url + "/requests"
+        data = {"uniqueKey": unique_key, "url": url, "method": method}
+        return await super()._post(url_, data, **kwargs)
+
+    def Request(self, request_id):
+        """See Queue.Request"""
+        return _AsyncRequest(self.get_queue_id(), request_id, self._session, self._config)
+
+    async def get_head(self, **kwargs):
+        """See Queue.get_head"""
+        url = self._base_url + "/head"
+        return await super()._get(url, None, **kwargs)
+
+
+class _AsyncRequest(AsyncQueueABC):
+    def __init__(self, queue_id, request_id, session, config):
+        super().__init__(queue_id, session, config)
+        self._request_id = request_id
+        self._base_url += "/requests/" + self.get_request_id()
+
+    def get_request_id(self):
+        """Returns: request_id (str): queue request ID"""
+        return self._request_id
+
+    async def get(self):
+        """See Queue.Request.get"""
+        return await super()._get()
+
+    async def update(self, id, unique_key, url, method, **kwargs):
+        """See Queue.Request.update"""
+        accepted_methods = ("CONNECT", "DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT", "TRACE")
+        if method not in accepted_methods:
+            raise ValueError("accepted methods: {0}".format(accepted_methods))
+
+        data = {"id": id, "uniqueKey": unique_key, "url": url, "method": method}
+        return await super()._put(None, data, **kwargs)
+
+    async def delete(self):
+        """See Queue.Request.delete"""
+        return await super()._delete()
@@ -0,0 +1,86 @@
+from .. import common as sync_common
+from . import common
+from .ApifyABC import AsyncApifyABC
+
+
+class AsyncStoreABC(AsyncApifyABC):
+    def __init__(self, store_id, session, config):
+        super().__init__(session, config)
+        self._store_id = store_id
+        self._base_url = sync_common._api_url + '/v2/key-value-stores/' + self.get_store_id()
+
+    def get_store_id(self):
+        """Returns: store_id (str): store ID"""
+        return self._store_id
+
+
+class AsyncStore(AsyncStoreABC):
+    def __init__(self, store_id, session=None, config="apify_config.json"):
+        """Asyncio version of Store
+        https://www.apify.com/docs/api/v2#/reference/key-value-stores
+
+        Args:
+            store_id (str): key-value store ID or <username>~<store name>
+            session (aiohttp.ClientSession object): used to send the HTTP requests (default: shared session)
+            config (str, path-like): path to JSON file with user ID and token
+        """
+        super().__init__(store_id, session, config)
+
+    async def get(self):
+        """See Store.get"""
+        return await super()._get()
+
+    async def delete(self):
+        """See Store.delete"""
+        return await super()._delete()
+
+    async def get_list_of_keys(self, **kwargs):
+        """See Store.get_list_of_keys"""
+        url = self._base_url + "/keys"
+        return await super()._get(url, None, **kwargs)
+
+    def Record(self, record_key):
+        """See Store.Record"""
+        return _AsyncRecord(self.get_store_id(), record_key, self._session, self._config)
+
+
+class _AsyncRecord(AsyncStoreABC):
+    def __init__(self, store_id, record_key, session, config):
+        super().__init__(store_id, session, config)
+        self._record_key = record_key
+        self._base_url += "/records/" + self.get_record_key()
+
+    def get_record_key(self):
+        """Returns: record_key (str): store record key"""
+        return self._record_key
+
+    async def get(self, **kwargs):
+        """See Store.Record.get"""
+        return await super()._get(None, None, **kwargs)
+
+    async def put(self, value, mime_type="application/json", gzip=False):
+        """See Store.Record.put"""
+        if mime_type.lower() in ("application/json", "application/javascript") and gzip is False:
+            return await super()._put(None, value)
+
+        headers = {"Content-Type": mime_type}
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+        params = {"token": self.get_token()}
+        return await common._request(self.get_session(), "PUT", self._base_url, params, {self.get_record_key(): value}, headers)
+
+    async def delete(self):
+        """See Store.Record.delete"""
+        return await super()._delete()
+
+    async def get_direct_upload_url(self, mime_type="application/json", gzip=False):
+        """See Store.Record.get_direct_upload_url"""
+        url = self._base_url + "/direct-upload-url"
+        if mime_type.lower() in ("application/json", "application/javascript") and gzip is False:
+            return await super()._get(url)
+
+        headers = {"Content-Type": mime_type}
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+        params = {"token": self.get_token()}
+        return await common._request(self.get_session(), "GET", url, params, None, headers)
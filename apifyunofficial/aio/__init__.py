@@ -0,0 +1,7 @@
+from .Actor import AsyncActor, AsyncTask
+from .Crawler import AsyncCrawler, AsyncExecution
+from .Dataset import AsyncDataset
+from .Queue import AsyncQueue
+from .Store import AsyncStore
+from .common import close_default_session, create_session
+from .functions import *
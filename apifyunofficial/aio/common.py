@@ -0,0 +1,214 @@
+import asyncio
+import tempfile
+import time
+import weakref
+
+import aiohttp
+
+from .. import codec, common, metrics, scheduler, singleflight
+
+_default_sessions = weakref.WeakKeyDictionary()
+
+# Identical GETs sent while one is in flight wait for it instead of reaching the API
+_flights = singleflight.AsyncSingleFlight()
+
+
+def create_session(limit=100, limit_per_host=0):
+    """Creates a session whose connection pool is shared by every request made with it
+    Must be called while an event loop is running.
+
+    Args:
+        limit (int): maximum number of concurrent connections (default: 100)
+        limit_per_host (int): maximum number of concurrent connections per host, 0 for no limit (default: 0)
+
+    Returns:
+        session (aiohttp.ClientSession): session used for requests
+    """
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host)
+    return aiohttp.ClientSession(connector=connector)
+
+
+def _get_default_session():
+    """Returns: session (aiohttp.ClientSession): session shared by the running event loop"""
+    loop = asyncio.get_running_loop()
+    session = _default_sessions.get(loop)
+    if session is None or session.closed:
+        session = create_session()
+        _default_sessions[loop] = session
+    return session
+
+
+async def close_default_session():
+    """Closes the session shared by the running event loop, if any"""
+    session = _default_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+def _params(kwargs):
+    """Converts query parameters the way requests does, since aiohttp only accepts str, int and float"""
+    return {k: v if isinstance(v, str) else str(v) for k, v in kwargs.items() if v is not None}
+
+
+async def _request(session, method, url, params=None, data=None, headers=None, text=False):
+    """Sends a request and decodes its response
+    Args:
+        session (aiohttp.ClientSession): used to send the HTTP requests
+        method (str): HTTP method
+        url (str): url to request
+        params (dict): query parameters
+        data (JSON object): request body (default: None)
+        headers (dict): additional headers (default: None)
+        text (bool): if True, the body is returned as text instead of JSON (default: False)
+
+    Returns:
+        out (JSON object or str): response body, or None if the response is empty
+    """
+    params = _params(params or {})
+    if metrics.get_recorder() is not None and metrics._operation.get() is None:
+        # Shared requests run in their own task, away from the calling method's frames
+        with metrics.operation(metrics._current_operation()):
+            return await _request(session, method, url, params, data, headers, text)
+    if method == "GET" and data is None:
+        # Concurrent identical calls share one request; each caller decodes its own copy of the body
+        key = (session, url, tuple(sorted(params.items())), tuple(sorted((headers or {}).items())), text)
+        body = await _flights.do(key, lambda: _send(session, method, url, params, None, headers, text))
+    else:
+        body = await _send(session, method, url, params, data, headers, text)
+    if text or not body:
+        return body if text else None
+    recorder = metrics.get_recorder()
+    if recorder is None:
+        return codec.loads(body)
+    start = time.perf_counter()
+    out = codec.loads(body)
+    recorder.on_decode(metrics._current_operation(), time.perf_counter() - start, len(body))
+    return out
+
+
+async def _send(session, method, url, params, data, headers, text):
+    kwargs = {"headers": headers} if data is None else common._json_body(data, headers)
+    async with _scheduled(session, method, url, params=params, **kwargs) as r:
+        r.raise_for_status()
+        return await r.text() if text else await r.read()
+
+
+class _scheduled:
+    def __init__(self, session, method, url, **kwargs):
+        """Async context manager sending a request through the global scheduler, like common._send"""
+        self._args = session, method, url
+        self._kwargs = kwargs
+        self._scheduler = scheduler.get_scheduler()
+        self._response = None
+        self._recorder = metrics.get_recorder()
+        self._event = None
+
+    async def __aenter__(self):
+        session, method, url = self._args
+        if self._recorder is not None:
+            body = self._kwargs.get("data")
+            self._event = metrics.RequestEvent(metrics._current_operation(), method, scheduler._endpoint_class(url),
+                                               bytes_sent=len(body) if isinstance(body, bytes) else 0)
+        limited = not scheduler._is_long_poll(url, self._kwargs.get("params"))
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            if self._scheduler is not None:
+                await asyncio.sleep(self._scheduler.admit(url))
+                if limited:
+                    await self._scheduler.acquire_async()
+            sent = time.perf_counter()
+            try:
+                r = await session.request(method, url, **self._kwargs)
+            except BaseException as e:
+                if self._scheduler is not None:
+                    self._scheduler.release(False, limited)
+                if self._event is not None:
+                    self._event.error = type(e).__name__
+                    self._recorder.on_request(self._event)
+                raise
+            if self._event is not None:
+                self._event.queue += sent - start
+                self._event.ttfb = time.perf_counter() - sent
+            if self._scheduler is None:
+                return self._respond(r)
+            throttled = r.status == 429
+            self._scheduler.release(throttled, limited)
+            delay = self._scheduler.retry_delay(url, r.headers.get("Retry-After"), attempt) if throttled else None
+            if delay is None:
+                return self._respond(r)
+            r.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+            if self._event is not None:
+                self._event.backoff += delay
+                self._event.retries = attempt
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._response.release()
+        if self._event is not None:
+            self._event.download = time.perf_counter() - self._received
+            self._event.bytes_received = self._response.content_length
+            self._recorder.on_request(self._event)
+
+    def _respond(self, r):
+        self._response = r
+        self._received = time.perf_counter()
+        if self._event is not None:
+            self._event.status = r.status
+        return r
+
+
+async def _download(session, url, params, chunk_size=1 << 16):
+    """Streams a response body to a temporary file
+    Args:
+        session (aiohttp.ClientSession): used to send the HTTP requests
+        url (str): url to request
+        params (dict): query parameters
+        chunk_size (int): number of bytes read at a time (default: 64 KiB)
+
+    Returns:
+        file_name (str): path to the downloaded file
+    """
+    async with _scheduled(session, "GET", url, params=_params(params)) as r:
+        r.raise_for_status()
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            async for chunk in r.content.iter_chunked(chunk_size):
+                f.write(chunk)
+            return f.name
+
+
+async def _get_list(url, session, config, **kwargs):
+    """Gets list of items
+    Args:
+        url (str): url to get
+        session (aiohttp.ClientSession object): used to send the HTTP requests (default: shared session)
+        config (str, path-like): path to JSON file with user ID and token
+        kwargs used by calling function
+
+    Returns:
+        list_of_items (JSON object): basic information about each object
+    """
+    user_id, token = common._get_auth(config)
+    kwargs.setdefault("token", token)
+    session = _get_default_session() if session is None else session
+    return await _request(session, "GET", url, kwargs)
+
+
+async def _create(url, session, config, settings, **kwargs):
+    """Creates item
+    Args:
+        url (str): url to get
+        session (aiohttp.ClientSession object): used to send the HTTP requests (default: shared session)
+        config (str, path-like): path to JSON file with user ID and token
+        settings (JSON object): object settings
+        kwargs used by calling function
+
+    Returns:
+        item (JSON object): object
+    """
+    user_id, token = common._get_auth(config)
+    kwargs.setdefault("token", token)
+    session = _get_default_session() if session is None else session
+    data = None if settings in ({}, None) else settings
+    return await _request(session, "POST", url, kwargs, data)
@@ -0,0 +1,135 @@
+import asyncio
+import math
+
+from .. import common as sync_common
+from .. import waiter
+from . import common
+from .Actor import AsyncActor, AsyncTask
+from .Dataset import AsyncDataset
+
+
+async def create_crawler(session=None, config="apify_config.json", settings={}):
+    """See apifyunofficial.create_crawler"""
+    user_id, token = sync_common._get_auth(config)
+    url = sync_common._api_url + "/v1/" + user_id + "/crawlers"
+    return await common._create(url, session, config, settings)
+
+
+async def create_actor(settings, session=None, config="apify_config.json", **kwargs):
+    """See apifyunofficial.create_actor"""
+    url = sync_common._api_url + "/v2/acts"
+    return await common._create(url, session, config, settings, **kwargs)
+
+
+async def create_dataset(name, session=None, config="apify_config.json", **kwargs):
+    """See apifyunofficial.create_dataset"""
+    url = sync_common._api_url + "/v2/datasets"
+    return await common._create(url, session, config, {}, name=name)
+
+
+async def create_key_value_store(name, session=None, config="apify_config.json"):
+    """See apifyunofficial.create_key_value_store"""
+    url = sync_common._api_url + "/v2/key-value-stores"
+    return await common._create(url, session, config, {}, name=name)
+
+
+async def create_request_queue(name, session=None, config="apify_config.json"):
+    """See apifyunofficial.create_request_queue"""
+    url = sync_common._api_url + "/v2/request-queues"
+    return await common._create(url, session, config, None, name=name)
+
+
+async def create_task(session=None, config="apify_config.json", settings={}):
+    """See apifyunofficial.create_task"""
+    url = sync_common._api_url + "/v2/actor-tasks"
+    return await common._create(url, session, config, settings)
+
+
+async def get_list_of_crawlers(session=None, config="apify_config.json", **kwargs):
+    """See apifyunofficial.get_list_of_crawlers"""
+    user_id, token = sync_common._get_auth(config)
+    url = sync_common._api_url + "/v1/" + user_id + "/crawlers"
+    return await common._get_list(url, session, config, **kwargs)
+
+
+async def get_list_of_actors(session=None, config="apify_config.json", **kwargs):
+    """See apifyunofficial.get_list_of_actors"""
+    url = sync_common._api_url + "/v2/acts"
+    return await common._get_list(url, session, config, **kwargs)
+
+
+async def get_list_of_datasets(session=None, config="apify_config.json", **kwargs):
+    """See apifyunofficial.get_list_of_datasets"""
+    url = sync_common._api_url + "/v2/datasets"
+    return await common._get_list(url, session, config, **kwargs)
+
+
+async def get_list_of_key_value_stores(session=None, config="apify_config.json", **kwargs):
+    """See apifyunofficial.get_list_of_key_value_stores"""
+    url = sync_common._api_url + "/v2/key-value-stores"
+    return await common._get_list(url, session, config, **kwargs)
+
+
+async def get_list_of_request_queues(session=None, config="apify_config.json", **kwargs):
+    """See apifyunofficial.get_list_of_request_queues"""
+    url = sync_common._api_url + "/v2/request-queues"
+    return await common._get_list(url, session, config, **kwargs)
+
+
+async def get_list_of_tasks(session=None, config="apify_config.json", **kwargs):
+    """See apifyunofficial.get_list_of_tasks"""
+    url = sync_common._api_url + "/v2/actor-tasks"
+    return await common._get_list(url, session, config, **kwargs)
+
+
+async def get_public_user_data(user_id, session=None):
+    """See apifyunofficial.get_public_user_data"""
+    url = sync_common._api_url + "/v2/users/" + user_id
+    session = common._get_default_session() if session is None else session
+    return await common._request(session, "GET", url)
+
+
+async def get_private_user_data(session=None, config="apify_config.json"):
+    """See apifyunofficial.get_private_user_data"""
+    url = sync_common._api_url + "/v2/users/me"
+    return await common._get_list(url, session, config)
+
+
+async def run_and_iter_items(actor_id, input_={}, session=None, config="apify_config.json", task=False, follow=False,
+                             wait=None, limit=1000, poll_interval=1.0, item_kwargs=None, **kwargs):
+    """See apifyunofficial.run_and_iter_items
+    The run is waited for with long polls, which also pace the polls for new items if follow is True.
+    """
+    if follow and "unwind" in (item_kwargs or {}):
+        raise ValueError("unwind cannot be used with follow")
+    session = common._get_default_session() if session is None else session
+    if task:
+        details = await AsyncTask(actor_id, session, config).run_asynchronously(input_, **kwargs)
+    else:
+        details = await AsyncActor(actor_id, session, config).run(input_, **kwargs)
+    details = details.get("data", details)
+    run = AsyncActor(details["actId"], session, config).Run(details["id"])
+    dataset = AsyncDataset(details["defaultDatasetId"], session, config)
+    item_kwargs = dict(item_kwargs or {}, format="json")
+    loop = asyncio.get_running_loop()
+    deadline = None if wait is None or follow else loop.time() + wait
+    active = waiter._is_active(details)
+    offset = 0
+    while True:
+        if follow or not active:
+            page = await dataset.get_items(offset=offset, limit=limit, **item_kwargs)
+            # Offsets count stored items, which unwinding turns into any number of items
+            offset += limit if "unwind" in item_kwargs else len(page)
+            for item in page:
+                yield item
+            # Unwinding can change the number of items per page, so only an empty page is conclusive
+            if len(page) >= limit or (page and "unwind" in item_kwargs):
+                continue
+            if not active:
+                return
+        seconds = poll_interval if follow else 60
+        if deadline is not None:
+            seconds = min(seconds, max(0, deadline - loop.time()))
+        details = await run.get(waitForFinish=math.ceil(seconds))
+        # One more read after the run finishes picks up the items it pushed since the last one
+        active = waiter._is_active(details) and (deadline is None or loop.time() < deadline)
@@ -0,0 +1,122 @@
+import collections
+import concurrent.futures
+import time
+
+import requests
+
+from . import functions, waiter
+from .Actor import _Run
+
+# Responses of a start rejected because the account is at its limits; the start is retried once runs finish
+_rejected_statuses = (402, 429)
+# Highest number of runs in flight when neither concurrency nor the account limits are known
+_default_concurrency = 8
+_end = object()
+
+
+class BatchRunner:
+    def __init__(self, target, concurrency=None, max_retries=8, backoff=1.0, max_backoff=60.0, run_waiter=None,
+                 **kwargs):
+        """Runs an actor or task once per input, keeping a bounded number of runs in flight
+        The number of runs in flight is limited by concurrency and by the account's concurrent-run and memory
+        limits. When the API rejects a start because the account is at its limits, the limit drops to the runs
+        in flight and the start is retried once one of them finishes; it then grows back by one per finished run.
+        Runs whose wait ends by timeout while they are still going are yielded without growing the limit.
+
+        Args:
+            target (Actor or Task): actor or task to run
+            concurrency (int): highest number of runs in flight (default: None, the account limits, or 8 if the
+                account does not report them)
+            max_retries (int): number of rejected starts of one input after which the batch fails (default: 8)
+            backoff (float): number of seconds to wait before retrying a start while no run is in flight (default: 1.0)
+            max_backoff (float): maximum number of seconds to wait before retrying a start (default: 60.0)
+            run_waiter (waiter.RunWaiter): waits for the runs (default: waiter shared by every run)
+        kwargs:
+            timeout (int): timeout for each run (default: timeout from default run configuration)
+            memory (int): memory limit of each run (in MB) (default: memory from default run configuration)
+            build (str): tag or number of actor build to run (default: build from default run configuration)
+        """
+        self._target = target
+        self._start = getattr(target, "run_asynchronously", None) or target.run
+        self._concurrency = concurrency
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._waiter = waiter.get_run_waiter() if run_waiter is None else run_waiter
+        self._kwargs = kwargs
+        self.limit = concurrency
+        self.rejected = 0
+
+    def get_account_limit(self):
+        """Gets the number of runs the account can have in flight, from its concurrent-run and memory limits
+        https://www.apify.com/docs/api/v2#/reference/users/private-data/get-private-user-data
+
+        Returns:
+            limit (int): number of concurrent runs allowed, or None if the account does not report its limits
+        """
+        user_data = functions.get_private_user_data(self._target.get_session(), self._target._config)
+        plan = user_data.get("data", user_data).get("plan") or {}
+        limits = []
+        if plan.get("maxConcurrentActorJobs"):
+            limits.append(plan["maxConcurrentActorJobs"])
+        if plan.get("maxActorMemoryGbytes") and self._kwargs.get("memory"):
+            limits.append(max(1, int(plan["maxActorMemoryGbytes"] * 1024 // self._kwargs["memory"])))
+        return min(limits) if limits else None
+
+    def run(self, inputs, timeout=None):
+        """Starts one run per input and yields each run as it finishes
+
+        Args:
+            inputs (iterable of JSON objects): custom input fields of each run
+            timeout (float): number of seconds after which the wait for a run ends even if it is still going
+                (default: None, no limit)
+
+        Yields:
+            input_ (JSON object), run_details (JSON object): input of each run and its latest details,
+                in the order the runs finish
+        """
+        limits = [limit for limit in (self._concurrency, self.get_account_limit()) if limit]
+        maximum = min(limits) if limits else _default_concurrency
+        self.limit = maximum
+        inputs = iter(inputs)
+        retries = collections.deque()
+        in_flight = {}
+        exhausted = False
+        while True:
+            while len(in_flight) < self.limit and (retries or not exhausted):
+                if retries:
+                    input_, attempts = retries.popleft()
+                else:
+                    input_ = next(inputs, _end)
+                    attempts = 0
+                    if input_ is _end:
+                        exhausted = True
+                        break
+                try:
+                    details = self._start(input_, **self._kwargs)
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code not in _rejected_statuses:
+                        raise
+                    if attempts >= self._max_retries:
+                        raise
+                    self.rejected += 1
+                    retries.appendleft((input_, attempts + 1))
+                    self.limit = max(1, len(in_flight))
+                    break
+                details = details.get("data", details)
+                run = _Run(details["actId"], details["id"], self._target.get_session(), self._target._config)
+                in_flight[self._waiter.wait_for(run, timeout)] = input_
+            if not in_flight:
+                if not retries:
+                    return
+                # Rejected with nothing of ours in flight: the account is busy with other runs
+                time.sleep(min(self._max_backoff, self._backoff * 2 ** (retries[0][1] - 1)))
+                continue
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                input_ = in_flight.pop(future)
+                details = future.result()
+                if not waiter._is_active(details):
+                    self.limit = min(maximum, self.limit + 1)
+                yield input_, details
+
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import requests
+
+from . import waiter
+
+# Version settings that determine what a build produces
+_source_settings = ("sourceType", "sourceCode", "sourceFiles", "gitRepoUrl", "tarballUrl", "gitHubGistUrl",
+                    "baseDockerImage", "envVars", "applyEnvVarsToBuild", "buildTag")
+
+# Build options that change what a build produces or how it is tagged
+_build_options = ("tag", "betaPackages", "useCache")
+
+# Source types whose whole source is held in the version settings; the others point at code that can change
+# behind an unchanged URL
+_inline_sources = ("SOURCE_CODE", "SOURCE_FILES")
+
+# Statuses of builds that can be reused: finished successfully, or still going with the same source
+_reusable_statuses = ("SUCCEEDED",) + waiter._active_statuses
+
+
+class BuildCache:
+    def __init__(self, path="apify_builds.sqlite"):
+        """Remembers which build was made from which actor version source, so unchanged sources are not rebuilt
+        Builds are keyed by actor, version number and a hash of the version's source settings and of the tag,
+        betaPackages and useCache options, and stored in a local SQLite database. A cached build is only reused
+        while the API still reports it as succeeded or going; versions built from a Git repository, tarball or
+        gist are always rebuilt, since their code can change without the settings changing.
+        The API returns secret environment variables masked, so changing only the value of a secret does not
+        invalidate the cached build; pass force=True to rebuild after such a change.
+
+        Args:
+            path (str, path-like): SQLite database file, ":memory:" for a cache that lasts as long as the object
+                (default: "apify_builds.sqlite")
+        """
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS builds (actor_id TEXT, version TEXT, "
+                                     "source_hash TEXT, build_id TEXT, created REAL, "
+                                     "PRIMARY KEY (actor_id, version, source_hash))")
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def build(self, actor, version, force=False, **kwargs):
+        """Builds an actor version, unless a build of the same source can be reused
+        https://www.apify.com/docs/api/v2#/reference/actors/build-collection/build-actor
+
+        Args:
+            actor (Actor): actor to build
+            version (str): version number to be built
+            force (bool): if True, builds even if a build of the same source exists (default: False)
+        kwargs:
+            useCache (bool): whether use a cache to speed up the build process (default: False)
+            betaPackages (bool): whether actor is built with beta versions of Apify NPM packages
+            tag (str): tag to be applied on success (default: taken from actor version's buildTag property)
+            waitForFinish (int): maximum number of seconds to wait for completion (default: 0)
+
+        Returns:
+            build_details (JSON object): details of the reused or new build
+        """
+        settings = actor.Version(version).get()
+        settings = settings.get("data", settings)
+        source_hash = _source_hash(settings, kwargs)
+        cacheable = settings.get("sourceType", "SOURCE_CODE") in _inline_sources
+        actor_id = actor.get_actor_id()
+        if cacheable and not force:
+            details = self._reusable(actor, version, source_hash, kwargs.get("waitForFinish"))
+            if details is not None:
+                self.hits += 1
+                return details
+        self.misses += 1
+        details = actor.build(version, **kwargs)
+        build_id = details.get("data", details)["id"]
+        if cacheable:
+            with self._lock, self._connection:
+                self._connection.execute("INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?, ?)",
+                                         (actor_id, version, source_hash, build_id, time.time()))
+        return details
+
+    def get_build_id(self, actor_id, version, source_hash):
+        """Returns: build_id (str): build recorded for the version source, or None"""
+        with self._lock:
+            row = self._connection.execute("SELECT build_id FROM builds WHERE actor_id = ? AND version = ? "
+                                           "AND source_hash = ?", (actor_id, version, source_hash)).fetchone()
+        return None if row is None else row[0]
+
+    def forget(self, actor_id, version=None):
+        """Drops the builds recorded for an actor
+
+        Args:
+            actor_id (str): actor ID, as given to Actor
+            version (str): only drop the builds of this version number (default: None, every version)
+        """
+        with self._lock, self._connection:
+            if version is None:
+                self._connection.execute("DELETE FROM builds WHERE actor_id = ?", (actor_id,))
+            else:
+                self._connection.execute("DELETE FROM builds WHERE actor_id = ? AND version = ?", (actor_id, version))
+
+    def close(self):
+        """Closes the database"""
+        with self._lock:
+            self._connection.close()
+
+    def _reusable(self, actor, version, source_hash, wait):
+        """Returns: build_details (JSON object): details of the recorded build if it can be reused, else None"""
+        build_id = self.get_build_id(actor.get_actor_id(), version, source_hash)
+        if build_id is None:
+            return None
+        params = {} if wait is None else {"waitForFinish": wait}
+        try:
+            details = waiter._fetch_details(actor.Build(build_id), **params)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            details = None
+        if details is not None and details.get("data", details).get("status") in _reusable_statuses:
+            return details
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM builds WHERE build_id = ?", (build_id,))
+        return None
+
+
+def _source_hash(settings, options):
+    """Returns: source_hash (str): SHA-256 of the settings an actor version is built from and of the build options"""
+    source = {name: settings[name] for name in _source_settings if settings.get(name) is not None}
+    source["options"] = {name: str(options[name]) for name in _build_options if options.get(name) is not None}
+    # Encoded with json rather than the pluggable codec, whose output differs between codecs, so that the recorded
+    # hashes stay valid whichever codec is in use; sorted keys hash equal settings the same whatever their order
+    return hashlib.sha256(json.dumps(source, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
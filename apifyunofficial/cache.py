@@ -0,0 +1,141 @@
+import collections
+import threading
+import time
+import weakref
+
+from . import codec, common
+
+_caches = weakref.WeakKeyDictionary()
+
+
+class _Entry:
+    __slots__ = ("body", "expires", "etag", "last_modified")
+
+    def __init__(self, body, expires, etag, last_modified):
+        self.body = body
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ResponseCache:
+    def __init__(self, ttl=60, maxsize=1024):
+        """Caches decoded GET responses by url and query parameters
+        Entries expire after ttl seconds; expired entries with an ETag or Last-Modified header
+        are revalidated with a conditional request instead of being downloaded again.
+        Writes through the same session invalidate the object, its sub-resources and its parents.
+
+        Args:
+            ttl (float): number of seconds a response is served without contacting the API (default: 60)
+            maxsize (int): maximum number of responses kept, least recently used first out (default: 1024)
+        """
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def install(self, session):
+        """Caches the metadata GET requests (Actor, Task, Store and Queue details, actor versions and the
+        get_list_of_* functions) sent by every object and function using session
+
+        Args:
+            session (requests.Session): session whose responses are cached
+        """
+        _caches[session] = self
+
+    @staticmethod
+    def uninstall(session):
+        """Stops caching the responses of session
+
+        Args:
+            session (requests.Session): session whose responses are cached
+        """
+        _caches.pop(session, None)
+
+    def clear(self):
+        """Forgets every cached response"""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, session, url, params):
+        """Gets a decoded response, from the cache when it is fresh
+
+        Args:
+            session (requests.Session): used to send the HTTP requests
+            url (str): url to get
+            params (dict): query parameters
+
+        Returns:
+            out (JSON object): decoded response
+        """
+        return codec.loads(self.get_body(session, url, params))
+
+    def get_body(self, session, url, params):
+        """Gets a response body, from the cache when it is fresh
+
+        Args:
+            session (requests.Session): used to send the HTTP requests
+            url (str): url to get
+            params (dict): query parameters
+
+        Returns:
+            body (bytes): response body
+        """
+        key = (url, tuple(sorted((k, str(v)) for k, v in params.items())))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.expires > time.monotonic():
+                    self.hits += 1
+                    return entry.body
+
+        headers = {}
+        if entry is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+        r = common._send(session, "GET", url, params=params, headers=headers)
+        if r.status_code == 304 and entry is not None:
+            with self._lock:
+                self.revalidations += 1
+                entry.expires = time.monotonic() + self._ttl
+            return entry.body
+        r.raise_for_status()
+
+        body = r.content
+        etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = _Entry(body, time.monotonic() + self._ttl, etag, last_modified)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return body
+
+    def invalidate(self, url):
+        """Forgets the responses for url, its sub-resources and its parent collections
+
+        Args:
+            url (str): url of the object that changed
+        """
+        url = url.rstrip("/")
+        parents = set()
+        parent = url
+        while parent.count("/") > 3:
+            parent = parent.rsplit("/", 1)[0]
+            parents.add(parent)
+        with self._lock:
+            for key in [key for key in self._entries
+                        if key[0] in parents or key[0] == url or key[0].startswith(url + "/")]:
+                del self._entries[key]
+
+
+def get_cache(session):
+    """Returns: cache (ResponseCache): cache installed on session, or None"""
+    return _caches.get(session)
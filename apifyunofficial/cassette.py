@@ -0,0 +1,151 @@
+import base64
+import collections
+import gzip
+import hashlib
+import io
+import json
+import threading
+import time
+import urllib.parse
+
+import requests
+import urllib3
+
+from . import codec, common
+
+# Hop-by-hop and encoding headers that no longer describe the stored body
+_dropped_headers = ("content-encoding", "transfer-encoding", "content-length", "connection", "keep-alive")
+
+
+class CassetteError(Exception):
+    pass
+
+
+class Cassette(requests.adapters.HTTPAdapter):
+    def __init__(self, path, mode="replay", time_scale=1.0, redact=("token",)):
+        """Transport that records real request/response pairs to a compact file, or replays them offline
+        The file holds gzipped JSON lines. Requests are matched on method, path, query and body hash, without the
+        host and the redacted query parameters, so a replay needs neither the network nor live credentials.
+        JSON bodies are hashed in a canonical form, so a replay matches whichever codec encoded them.
+        Identical requests are answered in the order they were recorded, the last answer repeating.
+
+        Args:
+            path (str, path-like): cassette file
+            mode (str): "record" to send requests and save them, "replay" to answer them from the file (default: "replay")
+            time_scale (float): replayed responses take their recorded duration times time_scale,
+                0 to answer at once (default: 1.0)
+            redact (tuple of str): query parameters kept out of the file and of request matching (default: ("token",))
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError("Accepted modes: {0}".format(("record", "replay")))
+        super().__init__(pool_connections=16, pool_maxsize=32)
+        self.mode = mode
+        self.time_scale = time_scale
+        self._redact = set(redact)
+        self._lock = threading.Lock()
+        self._file = None
+        self._interactions = collections.defaultdict(collections.deque)
+        if mode == "record":
+            self._file = gzip.open(path, "wb")
+            return
+        with gzip.open(path, "rb") as f:
+            for line in f:
+                interaction = codec.loads(line)
+                self._interactions[(interaction["method"], interaction["url"], interaction["body"])].append(interaction)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def mount(self, session):
+        """Sends every request of session through the cassette
+
+        Args:
+            session (requests.Session): session to record or replay
+        """
+        session.mount("https://", self)
+        session.mount("http://", self)
+
+    @staticmethod
+    def unmount(session):
+        """Sends the requests of session to the API again
+
+        Args:
+            session (requests.Session): session to restore
+        """
+        adapter = common._new_adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def session(self):
+        """Returns: session (requests.Session): new session whose requests go through the cassette"""
+        session = requests.Session()
+        self.mount(session)
+        return session
+
+    def close(self):
+        """Finishes writing the file when recording, and closes the pooled connections"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        super().close()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = self._key(request)
+        if self.mode == "record":
+            return self._record(key, request, stream, timeout, verify, cert, proxies)
+        with self._lock:
+            answers = self._interactions.get(key)
+            if not answers:
+                raise CassetteError("no recorded response for {0} {1}".format(key[0], key[1]))
+            interaction = answers.popleft() if len(answers) > 1 else answers[0]
+        if self.time_scale:
+            time.sleep(interaction["duration"] * self.time_scale)
+        raw = urllib3.HTTPResponse(body=io.BytesIO(base64.b64decode(interaction["content"])),
+                                   headers=interaction["headers"], status=interaction["status"],
+                                   reason=interaction["reason"], preload_content=False, decode_content=False)
+        return self.build_response(request, raw)
+
+    def _record(self, key, request, stream, timeout, verify, cert, proxies):
+        start = time.perf_counter()
+        r = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        ttfb = time.perf_counter() - start
+        content = r.content
+        headers = {name: value for name, value in r.headers.items() if name.lower() not in _dropped_headers}
+        headers["Content-Length"] = str(len(content))
+        interaction = {"method": key[0], "url": key[1], "body": key[2], "status": r.status_code,
+                       "reason": r.reason, "headers": headers, "content": base64.b64encode(content).decode("ascii"),
+                       "ttfb": ttfb, "duration": time.perf_counter() - start}
+        line = codec.dumps(interaction) + b"\n"
+        with self._lock:
+            if self._file is None:
+                raise CassetteError("cassette is closed")
+            self._file.write(line)
+        return r
+
+    def _key(self, request):
+        url = urllib.parse.urlsplit(request.url)
+        query = sorted((k, v) for k, v in urllib.parse.parse_qsl(url.query, keep_blank_values=True)
+                       if k not in self._redact)
+        path = url.path + ("?" + urllib.parse.urlencode(query) if query else "")
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if body and request.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        if body and "json" in request.headers.get("Content-Type", ""):
+            body = _canonical_json(body)
+        return request.method, path, hashlib.sha1(body).hexdigest() if body else ""
+
+
+def _canonical_json(body):
+    """Returns: body (bytes): JSON body encoded with sorted keys and no spaces, the same whichever codec encoded
+    it, or unchanged if it is not valid JSON"""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
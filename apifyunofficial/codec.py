@@ -0,0 +1,137 @@
+import json
+
+
+class JSONCodec:
+    name = "json"
+
+    def dumps(self, obj):
+        """Returns: data (bytes): obj encoded as UTF-8 JSON"""
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data):
+        """Returns: obj (JSON object): data (bytes or str) decoded"""
+        return json.loads(data)
+
+
+# Encodes and decodes what the faster codecs reject or alter (integers over 64 bits, NaN and Infinity), so that
+# installing them changes no results
+_fallback = JSONCodec()
+
+# Every digit mapped to "0", so that a run of digits is found with one substring search
+_digits = bytes.maketrans(b"123456789", b"000000000")
+
+
+def _decodes_big_ints(loads):
+    """Returns: lossless (bool): whether loads keeps integers over 64 bits exact or rejects them, rather than
+    turning them into floats as some versions of the faster codecs do"""
+    try:
+        return isinstance(loads(b"18446744073709551617"), int)
+    except ValueError:
+        return True
+
+
+def _lossless_loads(loads, data, scan):
+    """Returns: obj (JSON object): data decoded with loads, or with json where loads would lose or reject any of it
+
+    Args:
+        scan (bool): whether to decode documents holding 19 digits in a row (possibly an integer over 64 bits)
+            with json; long fractions and strings match too, and are then merely decoded more slowly
+    """
+    if scan and b"0" * 19 in (data.encode("utf-8") if isinstance(data, str) else data).translate(_digits):
+        return _fallback.loads(data)
+    try:
+        return loads(data)
+    except ValueError:
+        # NaN, Infinity and, in some versions, integers over 64 bits are accepted by json only; invalid
+        # documents raise json's own error
+        return _fallback.loads(data)
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._scan = not _decodes_big_ints(orjson.loads)
+
+    def dumps(self, obj):
+        """Returns: data (bytes): obj encoded as UTF-8 JSON"""
+        try:
+            return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return _fallback.dumps(obj)
+
+    def loads(self, data):
+        """Returns: obj (JSON object): data (bytes or str) decoded"""
+        return _lossless_loads(self._orjson.loads, data, self._scan)
+
+
+class UjsonCodec:
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+        self._scan = not _decodes_big_ints(ujson.loads)
+
+    def dumps(self, obj):
+        """Returns: data (bytes): obj encoded as UTF-8 JSON"""
+        try:
+            return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+        except (TypeError, OverflowError):
+            return _fallback.dumps(obj)
+
+    def loads(self, data):
+        """Returns: obj (JSON object): data (bytes or str) decoded"""
+        return _lossless_loads(self._ujson.loads, data, self._scan)
+
+
+_codecs = {"json": JSONCodec, "orjson": OrjsonCodec, "ujson": UjsonCodec}
+
+# Fastest first; the stdlib is always available
+_preference = ("orjson", "ujson", "json")
+
+_codec = None
+
+
+def available_codecs():
+    """Returns: names (list of str): codecs that can be used in this environment"""
+    names = []
+    for name in _preference:
+        try:
+            _codecs[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_codec():
+    """Returns: codec: codec used to encode request bodies and decode responses"""
+    global _codec
+    if _codec is None:
+        _codec = _codecs[available_codecs()[0]]()
+    return _codec
+
+
+def set_codec(codec):
+    """Changes the codec used to encode request bodies and decode responses
+
+    Args:
+        codec (str or object): "json", "orjson", "ujson", or any object with dumps (returning bytes) and loads methods
+    """
+    global _codec
+    _codec = _codecs[codec]() if isinstance(codec, str) else codec
+
+
+def dumps(obj):
+    """Returns: data (bytes): obj encoded with the current codec"""
+    return get_codec().dumps(obj)
+
+
+def loads(data):
+    """Returns: obj (JSON object): data decoded with the current codec"""
+    return get_codec().loads(data)
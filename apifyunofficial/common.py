@@ -1,26 +1,348 @@
+import codecs
+import collections
+import concurrent.futures
+import itertools
 import json
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+
+from . import cache, codec, credentials, metrics, scheduler, singleflight
+
+# Root of the Apify API, overridable to point the client at a stand-in server
+_api_url = os.environ.get("APIFY_API_URL", "https://api.apify.com").rstrip("/")
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# Identical GETs sent while one is in flight wait for it instead of reaching the API
+_flights = singleflight.SingleFlight()
+
+
+def _get_session(config=None):
+    """Gets the session shared by every object using the same config, creating it on first use
+    Args:
+        config (str, path-like, dict or source): config the session is shared by (default: None)
+
+    Returns:
+        session (requests.Session): pooled session
+    """
+    key = None if config is None else credentials._as_source(config).key()
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            import requests
+
+            session = requests.Session()
+            adapter = _new_adapter()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def _new_adapter():
+    """Returns: adapter (requests.adapters.HTTPAdapter): transport keeping enough connections for concurrent calls"""
+    import requests
+
+    return requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32)
 
 
 def _get_auth(config):
-    """Parses config file for auth info
+    """Gets auth info, parsing the config only when it changed since the last call
     Args:
-        config (str, path-like): path to JSON file with user ID and token
+        config (str, path-like, dict or source): path to JSON file with user ID and token,
+            dict with "user" and "token" fields, or a source such as credentials.EnvCredentials()
 
     Returns:
         user_id (str): Apify user ID
         token (str): Apify token
     """
-    with open(config) as f:
-        data = json.load(f)
-        return data['user'], data['token']
+    return credentials.get_credentials(config)
+
+
+def _send(session, method, url, **kwargs):
+    """Sends a request through the global scheduler, which paces it and retries it while it is throttled
+    Args:
+        session (requests.Session object): used to send the HTTP requests
+        method (str): HTTP method
+        url (str): url to request
+        kwargs: passed to session.request
+
+    Returns:
+        r (requests.Response): response
+    """
+    scheduler_ = scheduler.get_scheduler()
+    recorder = metrics.get_recorder()
+    if recorder is None:
+        if scheduler_ is None:
+            return session.request(method, url, **kwargs)
+        return scheduler_.send(session, method, url, **kwargs)
+
+    operation = metrics._current_operation()
+    body = kwargs.get("data")
+    event = metrics.RequestEvent(operation, method, scheduler._endpoint_class(url),
+                                 bytes_sent=len(body) if isinstance(body, bytes) else 0)
+    trace = {"sent": time.perf_counter()}
+    try:
+        if scheduler_ is None:
+            r = session.request(method, url, **kwargs)
+        else:
+            r = scheduler_.send(session, method, url, trace=trace, **kwargs)
+    except Exception as e:
+        event.error = type(e).__name__
+        recorder.on_request(event)
+        raise
+    event.status = r.status_code
+    event.retries = trace.get("retries", 0)
+    event.queue = trace.get("queue", 0.0)
+    event.backoff = trace.get("backoff", 0.0)
+    event.ttfb = r.elapsed.total_seconds()
+    if kwargs.get("stream"):
+        length = r.headers.get("Content-Length")
+        event.bytes_received = int(length) if length is not None else None
+    else:
+        event.download = max(0.0, time.perf_counter() - trace["sent"] - event.ttfb)
+        event.bytes_received = len(r.content)
+    recorder.on_request(event)
+    r._apify_operation = operation
+    return r
+
+
+def _json_body(data, headers=None):
+    """Builds the request arguments sending data as JSON encoded with the configured codec
+    Args:
+        data (JSON object): request body
+        headers (dict): additional headers (default: None)
+
+    Returns:
+        kwargs (dict): data and headers arguments for the session
+    """
+    headers = dict(headers or {})
+    headers.setdefault("Content-Type", "application/json")
+    return {"data": codec.dumps(data), "headers": headers}
+
+
+def _decode(r):
+    """Returns: out (JSON object): response body decoded with the configured codec, None if it is empty"""
+    if not r.content:
+        return None
+    recorder = metrics.get_recorder()
+    if recorder is None:
+        return codec.loads(r.content)
+    start = time.perf_counter()
+    out = codec.loads(r.content)
+    operation = getattr(r, "_apify_operation", None) or metrics._current_operation()
+    recorder.on_decode(operation, time.perf_counter() - start, len(r.content))
+    return out
+
+
+def _cached_get(session, url, params, cacheable=False):
+    """Gets url and decodes the response, through the response cache installed on the session if cacheable
+    Concurrent identical calls share one request; each caller decodes its own copy of the body.
+    Args:
+        session (requests.Session object): used to send the HTTP requests
+        url (str): url to get
+        params (dict): query parameters
+        cacheable (bool): whether the response describes rarely-changing metadata that may be served from the
+            response cache; statuses, records and items always come from the API (default: False)
+
+    Returns:
+        out (JSON object): decoded response
+    """
+    key = (session, url, tuple(sorted((k, str(v)) for k, v in params.items())), cacheable)
+    body = _flights.do(key, lambda: _get_body(session, url, params, cacheable))
+    recorder = metrics.get_recorder()
+    if recorder is None:
+        return codec.loads(body)
+    start = time.perf_counter()
+    out = codec.loads(body)
+    recorder.on_decode(metrics._current_operation(), time.perf_counter() - start, len(body))
+    return out
+
+
+def _get_body(session, url, params, cacheable):
+    response_cache = cache.get_cache(session) if cacheable else None
+    if response_cache is not None:
+        return response_cache.get_body(session, url, params)
+    r = _send(session, "GET", url, params=params)
+    r.raise_for_status()
+    return r.content
 
 
-def _get_list(url, session, config, **kwargs):
+def _invalidate(session, url):
+    """Drops cached responses made stale by a write to url
+    Args:
+        session (requests.Session object): session the write was sent with
+        url (str): url that was written to
+    """
+    response_cache = cache.get_cache(session)
+    if response_cache is not None:
+        response_cache.invalidate(url)
+
+
+def _iter_json(r, jsonl=False, chunk_size=1 << 16):
+    """Decodes a streamed response one item at a time, closing it when done
+    Args:
+        r (requests.Response): response sent with stream=True
+        jsonl (bool): if True, the body holds one JSON document per line (default: False)
+        chunk_size (int): number of bytes read at a time (default: 64 KiB)
+
+    Yields:
+        item (JSON object): each element of a top-level JSON array, each line of JSONL,
+            or the whole document if it is not an array
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    chunks = (text_decoder.decode(chunk) for chunk in r.iter_content(chunk_size))
+    buffer = ""
+    try:
+        if jsonl:
+            for chunk in chunks:
+                *lines, buffer = (buffer + chunk).split("\n")
+                for line in lines:
+                    if line.strip():
+                        yield codec.loads(line)
+            buffer += text_decoder.decode(b"", final=True)
+            if buffer.strip():
+                yield codec.loads(buffer)
+            return
+
+        for chunk in chunks:
+            buffer += chunk
+            if buffer.strip():
+                break
+        buffer = buffer.lstrip()
+        if not buffer:
+            return
+        if not buffer.startswith("["):
+            yield codec.loads(buffer + "".join(chunks))
+            return
+
+        position = 1
+        finished = False
+        while True:
+            # An item is complete once a delimiter follows it, otherwise a number such as "1." or "2e" could
+            # still be cut short at the end of the chunk
+            while position < len(buffer):
+                char = buffer[position]
+                if char in " \t\r\n,":
+                    position += 1
+                    continue
+                if char == "]":
+                    return
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if finished:
+                        raise
+                    break
+                if not finished and (end == len(buffer) or buffer[end] not in " \t\r\n,]"):
+                    break
+                yield item
+                position = end
+            if finished:
+                raise ValueError("unterminated JSON array in response")
+            buffer = buffer[position:]
+            position = 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                finished = True
+            else:
+                buffer += chunk
+    finally:
+        r.close()
+
+
+def _download(session, url, params, file=None, progress=None, chunk_size=1 << 16, retries=5):
+    """Streams a response body to a file, resuming with Range requests after an interruption
+    Args:
+        session (requests.Session object): used to send the HTTP requests
+        url (str): url to download
+        params (dict): query parameters
+        file (str, path-like or binary file object): where to write the body (default: None, a temporary file)
+        progress (callable): called after each chunk with the bytes downloaded, the total size
+            (None if unknown) and the average speed in bytes/sec (default: None)
+        chunk_size (int): number of bytes read at a time (default: 64 KiB)
+        retries (int): maximum number of times the download is resumed (default: 5)
+
+    Returns:
+        out (str or file object): path to the downloaded file, or file if it is a file object
+    """
+    import requests
+
+    if file is None:
+        f = tempfile.NamedTemporaryFile(delete=False)
+    elif hasattr(file, "write"):
+        f = file
+    else:
+        f = open(file, "wb")
+    # Minimal writables (only write) cannot be rewound, so a download into them cannot start over
+    seekable = getattr(f, "seekable", None)
+    start_position = f.tell() if seekable is not None and seekable() and hasattr(f, "truncate") else None
+    downloaded = 0
+    total = None
+    start = time.monotonic()
+    try:
+        while True:
+            # Ranges count encoded bytes, so the body is requested unencoded for its offsets to match the file
+            headers = {"Accept-Encoding": "identity"}
+            if downloaded:
+                headers["Range"] = "bytes={0}-".format(downloaded)
+            try:
+                with _send(session, "GET", url, params=params, headers=headers, stream=True) as r:
+                    r.raise_for_status()
+                    if downloaded and (r.status_code != 206 or _range_start(r) != downloaded):
+                        # The server ignored the range or answered another one, so the download starts over
+                        if start_position is None:
+                            raise IOError("cannot resume download of {0} into an unseekable file".format(url))
+                        f.seek(start_position)
+                        f.truncate()
+                        downloaded = 0
+                        if r.status_code == 206:
+                            continue
+                    length = r.headers.get("Content-Length")
+                    total = downloaded + int(length) if length is not None else None
+                    for chunk in r.iter_content(chunk_size):
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        if progress is not None:
+                            progress(downloaded, total, downloaded / max(time.monotonic() - start, 1e-9))
+            except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
+                if retries <= 0:
+                    raise
+            else:
+                if total is None or downloaded >= total:
+                    break
+                if retries <= 0:
+                    raise IOError("download of {0} stopped after {1} of {2} bytes".format(url, downloaded, total))
+            retries -= 1
+    finally:
+        if f is not file:
+            f.close()
+    return f.name if file is None else file
+
+
+def _range_start(r):
+    """Returns: start (int): first byte of the body sent in a 206 response, from its Content-Range, or None"""
+    match = re.match(r"bytes (\d+)-", r.headers.get("Content-Range", ""))
+    return None if match is None else int(match.group(1))
+
+
+def _get_list(url, session, config, cacheable=False, **kwargs):
     """Gets list of items
     Args:
         url (str): url to get
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
+        cacheable (bool): whether the list may be served from the response cache (default: False)
         kwargs used by calling function
 
     Returns:
@@ -28,16 +350,15 @@ def _get_list(url, session, config, **kwargs):
     """
     user_id, token = _get_auth(config)
     kwargs.setdefault("token", token)
-    r = session.get(url, params=kwargs)
-    r.raise_for_status()
-    return r.json()
+    session = _get_session(config) if session is None else session
+    return _cached_get(session, url, kwargs, cacheable)
 
 
 def _create(url, session, config, settings, **kwargs):
     """Creates item
     Args:
         url (str): url to get
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
         settings (JSON object): object settings
         kwargs used by calling function
@@ -47,9 +368,124 @@ def _create(url, session, config, settings, **kwargs):
     """
     user_id, token = _get_auth(config)
     kwargs.setdefault("token", token)
+    session = _get_session(config) if session is None else session
     if settings in ({}, None):
-        r = session.post(url, params=kwargs)
+        r = _send(session, "POST", url, params=kwargs)
     else:
-        r = session.post(url, params=kwargs, json=settings)
+        r = _send(session, "POST", url, params=kwargs, **_json_body(settings))
+    _invalidate(session, url)
     r.raise_for_status()
-    return r.json()
+    return _decode(r)
+
+
+def _iter_prefetched(fetch, args, window):
+    """Calls fetch on each argument in background threads and yields the results in order
+    Args:
+        fetch (callable): function called with one argument
+        args (iterable): arguments, possibly infinite
+        window (int): maximum number of calls in flight or waiting to be consumed
+
+    Yields:
+        result: fetch(arg) for each arg, in the order of args
+    """
+    args = iter(args)
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=window) as executor:
+        try:
+            for arg in itertools.islice(args, window):
+                pending.append(executor.submit(fetch, arg))
+            while pending:
+                result = pending.popleft().result()
+                for arg in itertools.islice(args, 1):
+                    pending.append(executor.submit(fetch, arg))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _iter_merged(sources, workers, buffer=None):
+    """Consumes several page iterators in background threads and yields their pages as they arrive
+    Args:
+        sources (iterable of (tag, callable)): tag and function returning an iterator of pages for each source
+        workers (int): maximum number of sources consumed at once
+        buffer (int): maximum number of pages waiting to be consumed (default: 2 * workers)
+
+    Yields:
+        tag, page: tag of the source and one of its pages
+    """
+    pages = queue.Queue(buffer or 2 * workers)
+    stop = threading.Event()
+    finished = object()
+
+    def put(entry):
+        # Gives up once the consumer has stopped, so that no worker blocks on a full queue forever
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def consume(tag, source):
+        try:
+            for page in source():
+                if not put((tag, page, None)):
+                    return
+        except Exception as e:
+            put((tag, None, e))
+        finally:
+            put((tag, finished, None))
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    futures = []
+    try:
+        futures = [executor.submit(consume, tag, source) for tag, source in sources]
+        remaining = len(futures)
+        while remaining:
+            tag, page, error = pages.get()
+            if error is not None:
+                raise error
+            if page is finished:
+                remaining -= 1
+                continue
+            yield tag, page
+    finally:
+        stop.set()
+        # Sources not started yet are dropped (shutdown's cancel_futures needs Python 3.9)
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _follow(fetch, finished, offset, limit, interval):
+    """Polls for items past the last offset seen until the producer finishes
+    Args:
+        fetch (callable): called with an offset and a limit, returns the list of items from that offset
+        finished (callable): returns whether the producer stopped adding items
+        offset (int): rank of the first item
+        limit (int): maximum number of items per fetch
+        interval (float): number of seconds between polls, growing up to ten times while nothing new appears
+
+    Yields:
+        page (list): new items
+    """
+    delay = interval
+    done = False
+    while True:
+        page = fetch(offset, limit)
+        offset += len(page)
+        if page:
+            yield page
+            delay = interval
+        if len(page) == limit:
+            continue
+        if done:
+            return
+        # One more fetch after the producer finishes picks up the items it added since the last one
+        done = finished()
+        if not done:
+            time.sleep(delay)
+            if not page:
+                delay = min(delay * 2, interval * 10)
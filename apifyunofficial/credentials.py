@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+
+
+class FileCredentials:
+    def __init__(self, path):
+        """Reads credentials from a JSON file with "user" and "token" fields
+
+        Args:
+            path (str, path-like): path to JSON file with user ID and token
+        """
+        self._path = os.path.abspath(os.fspath(path))
+
+    def key(self):
+        """Returns: key (hashable): identifies the source in the credential cache"""
+        return ("file", self._path)
+
+    def version(self):
+        """Returns: version (hashable): changes whenever the file is modified"""
+        stat = os.stat(self._path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self):
+        """Returns:
+            user_id (str): Apify user ID
+            token (str): Apify token
+        """
+        with open(self._path) as f:
+            data = json.load(f)
+            return data['user'], data['token']
+
+
+class EnvCredentials:
+    def __init__(self, user_var="APIFY_USER_ID", token_var="APIFY_TOKEN"):
+        """Reads credentials from environment variables
+
+        Args:
+            user_var (str): name of the variable holding the user ID (default: APIFY_USER_ID)
+            token_var (str): name of the variable holding the token (default: APIFY_TOKEN)
+        """
+        self._user_var = user_var
+        self._token_var = token_var
+
+    def key(self):
+        """Returns: key (hashable): identifies the source in the credential cache"""
+        return ("env", self._user_var, self._token_var)
+
+    def version(self):
+        """Returns: version (hashable): changes whenever one of the variables changes"""
+        return os.environ.get(self._user_var), os.environ.get(self._token_var)
+
+    def load(self):
+        """Returns:
+            user_id (str): Apify user ID
+            token (str): Apify token
+        """
+        try:
+            return os.environ[self._user_var], os.environ[self._token_var]
+        except KeyError as e:
+            raise KeyError("environment variable {0} is not set".format(e.args[0])) from None
+
+
+class DictCredentials:
+    def __init__(self, data):
+        """Holds credentials in memory
+
+        Args:
+            data (dict): mapping with "user" and "token" fields
+        """
+        self._user_id = data['user']
+        self._token = data['token']
+
+    def key(self):
+        """Returns: key (hashable): identifies the source in the credential cache"""
+        return ("dict", self._user_id, self._token)
+
+    def version(self):
+        """Returns: version (hashable): in-memory credentials never change"""
+        return None
+
+    def load(self):
+        """Returns:
+            user_id (str): Apify user ID
+            token (str): Apify token
+        """
+        return self._user_id, self._token
+
+
+class CredentialProvider:
+    def __init__(self):
+        """Resolves credentials once per source and caches them until the source changes
+
+        A source is any object with key(), version() and load() methods.
+        load() is only called again when version() returns a new value.
+        """
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, config):
+        """Gets credentials for a config
+
+        Args:
+            config (str, path-like, dict or source): path to JSON file, dict with
+                "user" and "token" fields, or a source such as EnvCredentials()
+
+        Returns:
+            user_id (str): Apify user ID
+            token (str): Apify token
+        """
+        source = _as_source(config)
+        key = source.key()
+        version = source.version()
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            auth = tuple(source.load())
+            self._cache[key] = (version, auth)
+            return auth
+
+    def clear(self):
+        """Forgets every cached credential"""
+        with self._lock:
+            self._cache.clear()
+
+
+def _as_source(config):
+    if isinstance(config, (str, os.PathLike)):
+        return FileCredentials(config)
+    if isinstance(config, dict):
+        return DictCredentials(config)
+    return config
+
+
+_provider = CredentialProvider()
+
+
+def get_credentials(config):
+    """Gets credentials from the shared provider
+
+    Args:
+        config (str, path-like, dict or source): path to JSON file, dict with
+            "user" and "token" fields, or a source such as EnvCredentials()
+
+    Returns:
+        user_id (str): Apify user ID
+        token (str): Apify token
+    """
+    return _provider.get(config)
@@ -1,14 +1,17 @@
-import requests
+import itertools
 
-from . import common
+from . import codec, common
+from .Actor import Actor, Task
+from .Crawler import Execution, _combine
+from .Dataset import Dataset
 
 
-def create_crawler(session=requests.Session(), config="apify_config.json", settings={}):
+def create_crawler(session=None, config="apify_config.json", settings={}):
     """Creates crawler with specified settings
     https://www.apify.com/docs/api/v1#/reference/results/create-crawler
 
     Args:
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
         settings (JSON object): crawler settings
 
@@ -16,17 +19,17 @@ def create_crawler(session=requests.Session(), config="apify_config.json", setti
         crawler_settings (JSON object): crawler settings
     """
     user_id, token = common._get_auth(config)
-    url = "https://api.apify.com/v1/" + user_id + "/crawlers"
+    url = common._api_url + "/v1/" + user_id + "/crawlers"
     return common._create(url, session, config, settings)
 
 
-def create_actor(settings, session=requests.Session(), config="apify_config.json", **kwargs):
+def create_actor(settings, session=None, config="apify_config.json", **kwargs):
     """Creates actor with specified settings
     https://www.apify.com/docs/api/v2#/reference/actors/actor-collection/create-actor
 
     Args:
         settings (JSON object): actor settings
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
     kwargs:
         my (bool) : if True, only actors owned by the user are returned (default: False)
@@ -34,81 +37,81 @@ def create_actor(settings, session=requests.Session(), config="apify_config.json
     Returns:
         actor (JSON object): actor
     """
-    url = "https://api.apify.com/v2/acts"
+    url = common._api_url + "/v2/acts"
     return common._create(url, session, config, settings, **kwargs)
 
 
-def create_dataset(name, session=requests.Session(), config="apify_config.json", **kwargs):
+def create_dataset(name, session=None, config="apify_config.json", **kwargs):
     """Creates dataset
     https://www.apify.com/docs/api/v2#/reference/datasets/dataset-collection/create-dataset
 
     Args:
         name (str): unique name for the dataset
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
         settings (JSON object): crawler settings
 
     Returns:
         actor (JSON object): actor
     """
-    url = "https://api.apify.com/v2/datasets"
+    url = common._api_url + "/v2/datasets"
     return common._create(url, session, config, {}, name=name)
 
 
-def create_key_value_store(name, session=requests.Session(), config="apify_config.json"):
+def create_key_value_store(name, session=None, config="apify_config.json"):
     """Creates key-value store
     https://www.apify.com/docs/api/v2#/reference/key-value-stores/store-collection/create-key-value-store
 
     Args:
         name (str): unique name for the key-value store
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
 
     Returns:
         store (JSON object): key-value store
     """
-    url = "https://api.apify.com/v2/key-value-stores"
+    url = common._api_url + "/v2/key-value-stores"
     return common._create(url, session, config, {}, name=name)
 
 
-def create_request_queue(name, session=requests.Session(), config="apify_config.json"):
+def create_request_queue(name, session=None, config="apify_config.json"):
     """Creates key-value store
     https://www.apify.com/docs/api/v2#/reference/request-queues/queue-collection/create-request-queue
 
     Args:
         name (str): unique name for the request queue
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
 
     Returns:
         store (JSON object): key-value store
     """
-    url = "https://api.apify.com/v2/request-queues"
+    url = common._api_url + "/v2/request-queues"
     return common._create(url, session, config, None, name=name)
 
 
-def create_task(session=requests.Session(), config="apify_config.json", settings={}):
+def create_task(session=None, config="apify_config.json", settings={}):
     """Creates task with specified settings
     https://www.apify.com/docs/api/v2#/reference/actor-tasks/tasks-collection/create-a-task
 
     Args:
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
         settings (JSON object): task settings
 
     Returns:
         task (JSON object): actor task
     """
-    url = "https://api.apify.com/v2/actor-tasks"
+    url = common._api_url + "/v2/actor-tasks"
     return common._create(url, session, config, settings)
 
 
-def get_list_of_crawlers(session=requests.Session(), config="apify_config.json", **kwargs):
+def get_list_of_crawlers(session=None, config="apify_config.json", **kwargs):
     """Gets a list of crawlers belonging to a specific user
     https://www.apify.com/docs/api/v1#/reference/crawlers/list-of-crawlers/get-list-of-crawlers
 
     Args:
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
     kwargs:
         offset (int): rank of first request to return (default: 0)
@@ -119,16 +122,16 @@ def get_list_of_crawlers(session=requests.Session(), config="apify_config.json",
         crawler_list (JSON object): basic information about each crawler
     """
     user_id, token = common._get_auth(config)
-    url = "https://api.apify.com/v1/" + user_id + "/crawlers"
-    return common._get_list(url, session, config, **kwargs)
+    url = common._api_url + "/v1/" + user_id + "/crawlers"
+    return common._get_list(url, session, config, cacheable=True, **kwargs)
 
 
-def get_list_of_actors(session=requests.Session(), config="apify_config.json", **kwargs):
+def get_list_of_actors(session=None, config="apify_config.json", **kwargs):
     """Gets list of actors a user created or used
     https://www.apify.com/docs/api/v2#/reference/actors/actor-collection/get-list-of-actors
 
     Args:
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
     kwargs:
         my (bool): if True, only actors owned by the user are returned (default: False)
@@ -139,16 +142,16 @@ def get_list_of_actors(session=requests.Session(), config="apify_config.json", *
     Returns:
         actor_list (JSON object): basic information about each crawler
     """
-    url = "https://api.apify.com/v2/acts"
-    return common._get_list(url, session, config, **kwargs)
+    url = common._api_url + "/v2/acts"
+    return common._get_list(url, session, config, cacheable=True, **kwargs)
 
 
-def get_list_of_datasets(session=requests.Session(), config="apify_config.json", **kwargs):
+def get_list_of_datasets(session=None, config="apify_config.json", **kwargs):
     """Gets list of datasets owned by the user
     https://www.apify.com/docs/api/v2#/reference/datasets/dataset-collection/get-list-of-datasets
 
     Args:
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
     kwargs:
         offset (int): rank of first request to return (default: 0)
@@ -159,16 +162,16 @@ def get_list_of_datasets(session=requests.Session(), config="apify_config.json",
     Returns:
         dataset_list (JSON object): basic information about each dataset
     """
-    url = "https://api.apify.com/v2/datasets"
-    return common._get_list(url, session, config, **kwargs)
+    url = common._api_url + "/v2/datasets"
+    return common._get_list(url, session, config, cacheable=True, **kwargs)
 
 
-def get_list_of_key_value_stores(session=requests.Session(), config="apify_config.json", **kwargs):
+def get_list_of_key_value_stores(session=None, config="apify_config.json", **kwargs):
     """Gets list of key-value stores owned by the user
     https://www.apify.com/docs/api/v2#/reference/key-value-stores/store-collection/get-list-of-key-value-stores
 
     Args:
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
     kwargs:
         offset (int): rank of first store to return (default: 0)
@@ -179,16 +182,16 @@ def get_list_of_key_value_stores(session=requests.Session(), config="apify_confi
     Returns:
         store_list (JSON object): basic information about each key-value store
     """
-    url = "https://api.apify.com/v2/key-value-stores"
-    return common._get_list(url, session, config, **kwargs)
+    url = common._api_url + "/v2/key-value-stores"
+    return common._get_list(url, session, config, cacheable=True, **kwargs)
 
 
-def get_list_of_request_queues(session=requests.Session(), config="apify_config.json", **kwargs):
+def get_list_of_request_queues(session=None, config="apify_config.json", **kwargs):
     """Gets list of requests queues owned by user
     https://www.apify.com/docs/api/v2#/reference/request-queues/queue-collection/get-list-of-request-queues
 
     Args:
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
     kwargs:
         offset (int): rank of first request to return (default: 0)
@@ -199,16 +202,16 @@ def get_list_of_request_queues(session=requests.Session(), config="apify_config.
     Returns:
         queue_list (JSON object): basic information about each key-value store
     """
-    url = "https://api.apify.com/v2/request-queues"
-    return common._get_list(url, session, config, **kwargs)
+    url = common._api_url + "/v2/request-queues"
+    return common._get_list(url, session, config, cacheable=True, **kwargs)
 
 
-def get_list_of_tasks(session=requests.Session(), config="apify_config.json", **kwargs):
+def get_list_of_tasks(session=None, config="apify_config.json", **kwargs):
     """Gets list of tasks a user created or used
     https://www.apify.com/docs/api/v2#/reference/actor-tasks/tasks-collection/get-a-list-of-tasks
 
     Args:
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
     kwargs:
         offset (int): rank of first task to return (default: 0)
@@ -218,11 +221,11 @@ def get_list_of_tasks(session=requests.Session(), config="apify_config.json", **
     Returns:
         actor_list (JSON object): basic information about each crawler
     """
-    url = "https://api.apify.com/v2/actor-tasks"
-    return common._get_list(url, session, config, **kwargs)
+    url = common._api_url + "/v2/actor-tasks"
+    return common._get_list(url, session, config, cacheable=True, **kwargs)
 
 
-def get_public_user_data(user_id, session=requests.Session()):
+def get_public_user_data(user_id, session=None):
     """Gets public information about user
     https://www.apify.com/docs/api/v2#/reference/users/public-data/get-public-user-data
 
@@ -232,22 +235,127 @@ def get_public_user_data(user_id, session=requests.Session()):
     Returns:
         public_user_data (JSON object): public information about user
     """
-    url = "https://api.apify.com/v2/users/" + user_id
-    r = session.get(url)
+    url = common._api_url + "/v2/users/" + user_id
+    session = common._get_session() if session is None else session
+    r = common._send(session, "GET", url)
     r.raise_for_status()
-    return r.json()
+    return common._decode(r)
 
 
-def get_private_user_data(session=requests.Session(), config="apify_config.json"):
+def get_private_user_data(session=None, config="apify_config.json"):
     """Gets public and private information about user
     https://www.apify.com/docs/api/v2#/reference/users/private-data/get-private-user-data
 
     Args:
-        session (requests.Session object): used to send the HTTP requests (default: new session)
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
         config (str, path-like): path to JSON file with user ID and token
 
     Returns:
         user_data (JSON object): public and private information about user
     """
-    url = "https://api.apify.com/v2/users/me"
+    url = common._api_url + "/v2/users/me"
     return common._get_list(url, session, config)
+
+
+def get_results_of_executions(execution_ids, session=None, config="apify_config.json", file=None, workers=4,
+                              limit=1000, combine=False, **kwargs):
+    """Fetches the results of many crawler executions concurrently, paginating each of them
+    https://www.apify.com/docs/api/v1#/reference/executions
+
+    Args:
+        execution_ids (iterable of str): IDs of crawler executions
+        session (requests.Session object): used to send the HTTP requests (default: shared session)
+        config (str, path-like): path to JSON file with user ID and token
+        file (str, path-like or binary file object): where to write the results as JSON lines of
+            {"executionId": ..., "result": ...} (default: None, return an iterator)
+        workers (int): maximum number of requests in flight (default: 4)
+        limit (int): number of results per page (default: 1000)
+        combine (bool): if True, gives each page function result instead of the whole result, with list results flattened (default: False)
+    kwargs:
+        simplified (int): if 1, then results are returned without metadata (default: 0)
+        hideUrl (int): if 1, "url" field will not be added to each page function result (default: 0)
+        skipFailedPages (int): if 1, pages with errors are skipped are errorInfo is hidden (default: 0)
+
+    Returns:
+        out (iterator of (str, JSON object) or int): execution ID and result pairs, merged in the order pages
+            arrive, or the number of results written if file is given
+    """
+    kwargs["format"] = "json"
+    simplified = kwargs.get("simplified", 0)
+
+    def pages(execution_id):
+        execution = Execution(execution_id, session=session, config=config)
+        for offset in itertools.count(0, limit):
+            page = execution.get_results(offset=offset, limit=limit, **kwargs)
+            yield list(_combine(page, simplified)) if combine else page
+            if len(page) < limit:
+                return
+
+    merged = common._iter_merged(((execution_id, lambda e=execution_id: pages(e)) for execution_id in execution_ids),
+                                 workers)
+    results = ((execution_id, result) for execution_id, page in merged for result in page)
+    if file is None:
+        return results
+    if hasattr(file, "write"):
+        return _write_tagged(results, file)
+    with open(file, "wb") as f:
+        return _write_tagged(results, f)
+
+
+def run_and_iter_items(actor_id, input_={}, session=None, config="apify_config.json", task=False, follow=False,
+                       wait=None, limit=1000, prefetch=2, poll_interval=1.0, item_kwargs=None, **kwargs):
+    """Starts an actor or task run, waits for it and iterates over the items of its default dataset
+    https://www.apify.com/docs/api/v2#/reference/actors/run-collection/run-actor
+
+    Args:
+        actor_id (str): actor ID, or task ID if task is True
+        input_ (JSON object): custom input fields (default: None)
+        session (requests.Session object): used for every request of the run and its dataset (default: shared session)
+        config (str, path-like): path to JSON file with user ID and token
+        task (bool): if True, runs the task actor_id instead of an actor (default: False)
+        follow (bool): if True, yields items as the run pushes them instead of once it finishes; cannot be
+            combined with unwind (default: False)
+        wait (float): number of seconds after which the items are read even if the run is still going,
+            if follow is False (default: None, no limit)
+        limit (int): number of items per page (default: 1000)
+        prefetch (int): maximum number of pages in flight or waiting to be consumed (default: 2)
+        poll_interval (float): number of seconds between polls for new items if follow is True (default: 1.0)
+        item_kwargs (dict): fields, omit or unwind options of the items, see Dataset.get_items (default: None)
+    kwargs:
+        timeout (int): timeout for the run (default: timeout from default run configuration)
+        memory (int): memory limit (in MB) (default: memory from default run configuration)
+        build (str): tag or number of actor build to run (default: build from default run configuration)
+
+    Returns:
+        items (iterator of JSON objects): items of the run's default dataset, whatever status the run ended with;
+            the run is started before this function returns
+    """
+    if follow and "unwind" in (item_kwargs or {}):
+        raise ValueError("unwind cannot be used with follow")
+    session = common._get_session(config) if session is None else session
+    if task:
+        details = Task(actor_id, session, config).run_asynchronously(input_, **kwargs)
+    else:
+        details = Actor(actor_id, session, config).run(input_, **kwargs)
+    details = details.get("data", details)
+    run = Actor(details["actId"], session, config).Run(details["id"])
+    dataset = Dataset(details["defaultDatasetId"], session, config)
+    item_kwargs = {} if item_kwargs is None else item_kwargs
+    return _iter_run_items(run, dataset, follow, wait, limit, prefetch, poll_interval, item_kwargs)
+
+
+def _iter_run_items(run, dataset, follow, wait, limit, prefetch, poll_interval, item_kwargs):
+    """Yields: item (JSON object): item of the dataset of a started run, see run_and_iter_items"""
+    if follow:
+        yield from dataset.iter_items(limit, follow=run, poll_interval=poll_interval, **item_kwargs)
+        return
+    run.wait(wait).result()
+    yield from dataset.iter_items(limit, prefetch, **item_kwargs)
+
+
+def _write_tagged(results, f):
+    count = 0
+    for execution_id, result in results:
+        f.write(codec.dumps({"executionId": execution_id, "result": result}) + b"\n")
+        count += 1
+    return count
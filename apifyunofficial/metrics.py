@@ -0,0 +1,195 @@
+import collections
+import contextlib
+import contextvars
+import sys
+import threading
+
+# Modules whose functions are plumbing rather than API operations
+_plumbing = {"apifyunofficial." + name for name in (
+    "common", "scheduler", "cache", "singleflight", "metrics", "codec", "aio.common")}
+
+_operation = contextvars.ContextVar("apifyunofficial_operation", default=None)
+
+_recorder = None
+
+
+class RequestEvent:
+    __slots__ = ("operation", "method", "endpoint", "status", "retries", "queue", "backoff", "ttfb",
+                 "download", "bytes_sent", "bytes_received", "error")
+
+    def __init__(self, operation, method, endpoint, status=None, retries=0, queue=0.0, backoff=0.0, ttfb=None,
+                 download=None, bytes_sent=0, bytes_received=None, error=None):
+        """Timings and sizes of one API request
+
+        Args:
+            operation (str): logical operation, e.g. "Actor.run"
+            method (str): HTTP method
+            endpoint (str): endpoint class, e.g. "v2/acts"
+            status (int): HTTP status of the final response, None if the request failed
+            retries (int): number of throttled attempts retried
+            queue (float): seconds waited for the rate limits and a concurrency slot
+            backoff (float): seconds waited between throttled attempts
+            ttfb (float): seconds from sending the final attempt to receiving its headers, connection included
+            download (float): seconds spent reading the body, None for streamed responses
+            bytes_sent (int): size of the request body
+            bytes_received (int): size of the response body, None if unknown
+            error (str): exception class name if the request failed
+        """
+        self.operation = operation
+        self.method = method
+        self.endpoint = endpoint
+        self.status = status
+        self.retries = retries
+        self.queue = queue
+        self.backoff = backoff
+        self.ttfb = ttfb
+        self.download = download
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.error = error
+
+
+class InMemoryRecorder:
+    def __init__(self):
+        """Aggregates request events in memory, per operation"""
+        self._lock = threading.Lock()
+        self._requests = collections.Counter()
+        self._retries = collections.Counter()
+        self._bytes = collections.Counter()
+        self._durations = {}
+
+    def on_request(self, event):
+        """Records a request
+
+        Args:
+            event (RequestEvent): request timings and sizes
+        """
+        status = "error" if event.status is None else str(event.status)
+        with self._lock:
+            self._requests[(event.operation, event.method, event.endpoint, status)] += 1
+            self._retries[event.operation] += event.retries
+            self._bytes[(event.operation, "sent")] += event.bytes_sent
+            if event.bytes_received is not None:
+                self._bytes[(event.operation, "received")] += event.bytes_received
+            for phase in ("queue", "backoff", "ttfb", "download"):
+                seconds = getattr(event, phase)
+                if seconds is not None:
+                    self._observe(event.operation, phase, seconds)
+
+    def on_decode(self, operation, seconds, size):
+        """Records the decoding of a response body
+
+        Args:
+            operation (str): logical operation
+            seconds (float): time spent decoding
+            size (int): size of the decoded body
+        """
+        with self._lock:
+            self._observe(operation, "decode", seconds)
+
+    def summary(self):
+        """Returns: summary (dict): per operation, request count, retries, bytes and count/total/max seconds per phase"""
+        with self._lock:
+            operations = {key[0] for key in self._requests} | {key[0] for key in self._durations}
+            out = {operation: {"requests": 0, "statuses": {}, "retries": self._retries[operation],
+                               "bytes_sent": self._bytes[(operation, "sent")],
+                               "bytes_received": self._bytes[(operation, "received")], "phases": {}}
+                   for operation in operations}
+            for (operation, method, endpoint, status), count in self._requests.items():
+                out[operation]["requests"] += count
+                out[operation]["statuses"][status] = out[operation]["statuses"].get(status, 0) + count
+            for (operation, phase), (count, total, maximum) in self._durations.items():
+                out[operation]["phases"][phase] = {"count": count, "total": total, "max": maximum}
+            return out
+
+    def prometheus_text(self, prefix="apify"):
+        """Exports the aggregates in the Prometheus text exposition format
+
+        Args:
+            prefix (str): prefix of every metric name (default: "apify")
+
+        Returns:
+            text (str): metrics
+        """
+        lines = []
+        with self._lock:
+            name = prefix + "_requests_total"
+            lines += ["# HELP {0} API requests by operation and final status".format(name),
+                      "# TYPE {0} counter".format(name)]
+            for (operation, method, endpoint, status), count in sorted(self._requests.items()):
+                lines.append("{0}{{operation={1},method={2},endpoint={3},status={4}}} {5}".format(
+                    name, _quote(operation), _quote(method), _quote(endpoint), _quote(status), count))
+            name = prefix + "_request_retries_total"
+            lines += ["# HELP {0} throttled attempts retried".format(name), "# TYPE {0} counter".format(name)]
+            for operation, count in sorted(self._retries.items()):
+                lines.append("{0}{{operation={1}}} {2}".format(name, _quote(operation), count))
+            name = prefix + "_request_bytes_total"
+            lines += ["# HELP {0} request and response body bytes".format(name), "# TYPE {0} counter".format(name)]
+            for (operation, direction), count in sorted(self._bytes.items()):
+                lines.append("{0}{{operation={1},direction={2}}} {3}".format(
+                    name, _quote(operation), _quote(direction), count))
+            name = prefix + "_request_phase_seconds"
+            lines += ["# HELP {0} time spent per request phase".format(name), "# TYPE {0} summary".format(name)]
+            for (operation, phase), (count, total, maximum) in sorted(self._durations.items()):
+                labels = "{{operation={0},phase={1}}}".format(_quote(operation), _quote(phase))
+                lines.append("{0}_count{1} {2}".format(name, labels, count))
+                lines.append("{0}_sum{1} {2!r}".format(name, labels, total))
+        return "\n".join(lines) + "\n"
+
+    def _observe(self, operation, phase, seconds):
+        count, total, maximum = self._durations.get((operation, phase), (0, 0.0, 0.0))
+        self._durations[(operation, phase)] = (count + 1, total + seconds, max(maximum, seconds))
+
+
+def _quote(value):
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+
+def get_recorder():
+    """Returns: recorder: recorder notified of every request, or None"""
+    return _recorder
+
+
+def set_recorder(recorder):
+    """Changes the recorder notified of every request
+
+    Args:
+        recorder: object with on_request(event) and on_decode(operation, seconds, size) methods,
+            such as InMemoryRecorder(), or None to stop recording
+    """
+    global _recorder
+    _recorder = recorder
+
+
+@contextlib.contextmanager
+def operation(name):
+    """Labels the requests sent inside the block, instead of the label derived from the calling method
+
+    Args:
+        name (str): operation label
+    """
+    token = _operation.set(name)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def _current_operation():
+    """Returns: operation (str): explicit label, or the innermost public method of this package on the stack"""
+    name = _operation.get()
+    if name is not None:
+        return name
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("apifyunofficial") and module not in _plumbing:
+            code_name = frame.f_code.co_name
+            self = frame.f_locals.get("self")
+            label = code_name if self is None else type(self).__name__.lstrip("_") + "." + code_name
+            if not code_name.startswith(("_", "<")):
+                return label
+            fallback = fallback or label
+        frame = frame.f_back
+    return fallback or "unknown"
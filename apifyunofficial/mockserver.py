@@ -0,0 +1,718 @@
+import collections
+import csv
+import gzip
+import http.server
+import io
+import itertools
+import random
+import re
+import threading
+import time
+import urllib.parse
+
+from . import codec, common
+
+_collections = ("acts", "actor-tasks", "datasets", "key-value-stores", "request-queues")
+
+
+class MockServer:
+    def __init__(self, latency=0.0, items=1000, item_size=200, throttle=0.0, retry_after=0.1, run_duration=0.0,
+                 max_runs=None, seed=0, compress=False, drop_after=None):
+        """Local stand-in for the Apify API, serving the v1 crawler and execution endpoints and the v2 actor, task,
+        dataset, key-value store and request queue endpoints from memory
+        Use as a context manager to point every object created inside the block at the server.
+
+        Args:
+            latency (float): number of seconds added before each response (default: 0.0)
+            items (int): number of items in each dataset and execution first seen by the server (default: 1000)
+            item_size (int): approximate size of a generated item in bytes (default: 200)
+            throttle (float): probability of answering a request with HTTP 429 (default: 0.0)
+            retry_after (float): Retry-After header of throttled responses, None to omit it (default: 0.1)
+            run_duration (float): number of seconds runs, builds and executions stay RUNNING before they
+                succeed, runs storing their input as OUTPUT (default: 0.0)
+            max_runs (int): number of concurrent actor and task runs after which starting a run fails with
+                HTTP 402, as the account limit reported by /v2/users/me (default: None, no limit)
+            seed (int): seed of the throttling random generator (default: 0)
+            compress (bool): whether to gzip response bodies for clients that accept it, as the API does
+                (default: False)
+            drop_after (int): number of body bytes after which the next longer response is cut short by closing
+                the connection; reset to None once used (default: None)
+        """
+        self.latency = latency
+        self.items = items
+        self.item_size = item_size
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.run_duration = run_duration
+        self.max_runs = max_runs
+        self.compress = compress
+        self.drop_after = drop_after
+        self.requests = collections.Counter()
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._objects = {name: {} for name in _collections + ("crawlers",)}
+        self._datasets = {}
+        self._records = {}
+        self._queues = {}
+        self._runs = {}
+        self._executions = {}
+        self._results = {}
+        self._template = None
+        self._server = None
+        self._thread = None
+        self._previous_url = None
+        self._routes = [(method, re.compile(pattern + r"/?$"), handler) for method, pattern, handler in (
+            ("GET", r"/v2/users/(?P<id>[^/]+)", self._get_user),
+            ("GET", r"/v2/(?P<collection>acts|actor-tasks)/(?P<id>[^/]+)/runs", self._list_runs),
+            ("POST", r"/v2/(?P<collection>acts|actor-tasks)/(?P<id>[^/]+)/runs", self._start_run),
+            ("GET", r"/v2/(?P<collection>acts|actor-tasks)/(?P<id>[^/]+)/runs/(?P<run>[^/]+)", self._get_run),
+            ("GET", r"/v2/actor-runs/(?P<run>[^/]+)", self._get_run),
+            ("POST", r"/v2/(?P<collection>acts|actor-tasks)/(?P<id>[^/]+)/runs/abort(?P<run>[^/]+)", self._abort_run),
+            ("POST", r"/v2/(?P<collection>acts|actor-tasks)/(?P<id>[^/]+)/runs/(?P<run>[^/]+)/abort", self._abort_run),
+            ("POST", r"/v2/actor-runs/(?P<run>[^/]+)/abort", self._abort_run),
+            ("GET", r"/v2/(?P<collection>acts|actor-tasks)/(?P<id>[^/]+)/run-sync", self._run_sync),
+            ("POST", r"/v2/(?P<collection>acts|actor-tasks)/(?P<id>[^/]+)/run-sync", self._run_sync),
+            ("GET", r"/v2/acts/(?P<id>[^/]+)/builds", self._list_builds),
+            ("POST", r"/v2/acts/(?P<id>[^/]+)/builds", self._start_build),
+            ("GET", r"/v2/acts/(?P<id>[^/]+)/builds/(?P<run>[^/]+)", self._get_run),
+            ("POST", r"/v2/acts/(?P<id>[^/]+)/builds/abort(?P<run>[^/]+)", self._abort_run),
+            ("POST", r"/v2/acts/(?P<id>[^/]+)/builds/(?P<run>[^/]+)/abort", self._abort_run),
+            ("GET", r"/v2/acts/(?P<id>[^/]+)/versions", self._list_versions),
+            ("POST", r"/v2/acts/(?P<id>[^/]+)/versions", self._create_version),
+            ("GET", r"/v2/acts/(?P<id>[^/]+)/versions/(?P<version>[^/]+)", self._get_version),
+            ("PUT", r"/v2/acts/(?P<id>[^/]+)/versions/(?P<version>[^/]+)", self._update_version),
+            ("DELETE", r"/v2/acts/(?P<id>[^/]+)/versions/(?P<version>[^/]+)", self._delete_version),
+            ("GET", r"/v2/datasets/(?P<id>[^/]+)/items", self._get_items),
+            ("PUT", r"/v2/datasets/(?P<id>[^/]+)/items", self._put_items),
+            ("POST", r"/v2/datasets/(?P<id>[^/]+)/items", self._put_items),
+            ("GET", r"/v2/key-value-stores/(?P<id>[^/]+)/keys", self._list_keys),
+            ("GET", r"/v2/key-value-stores/(?P<id>[^/]+)/records/(?P<key>[^/]+)/direct-upload-url",
+             self._direct_upload_url),
+            ("GET", r"/v2/key-value-stores/(?P<id>[^/]+)/records/(?P<key>[^/]+)", self._get_record),
+            ("PUT", r"/v2/key-value-stores/(?P<id>[^/]+)/records/(?P<key>[^/]+)", self._put_record),
+            ("DELETE", r"/v2/key-value-stores/(?P<id>[^/]+)/records/(?P<key>[^/]+)", self._delete_record),
+            ("POST", r"/v2/request-queues/(?P<id>[^/]+)/requests", self._add_request),
+            ("GET", r"/v2/request-queues/(?P<id>[^/]+)/head", self._get_head),
+            ("GET", r"/v2/request-queues/(?P<id>[^/]+)/requests/(?P<request>[^/]+)", self._get_request),
+            ("PUT", r"/v2/request-queues/(?P<id>[^/]+)/requests/(?P<request>[^/]+)", self._update_request),
+            ("DELETE", r"/v2/request-queues/(?P<id>[^/]+)/requests/(?P<request>[^/]+)", self._delete_request),
+            ("GET", r"/v2/(?P<collection>[a-z-]+)", self._list_objects),
+            ("POST", r"/v2/(?P<collection>[a-z-]+)", self._create_object),
+            ("GET", r"/v2/(?P<collection>[a-z-]+)/(?P<id>[^/]+)", self._get_object),
+            ("PUT", r"/v2/(?P<collection>[a-z-]+)/(?P<id>[^/]+)", self._update_object),
+            ("DELETE", r"/v2/(?P<collection>[a-z-]+)/(?P<id>[^/]+)", self._delete_object),
+            ("GET", r"/v1/execs/(?P<run>[^/]+)", self._get_execution),
+            ("POST", r"/v1/execs/(?P<run>[^/]+)/stop", self._stop_execution),
+            ("GET", r"/v1/execs/(?P<run>[^/]+)/results", self._get_results),
+            ("GET", r"/v1/(?P<user>[^/]+)/crawlers", self._list_crawlers),
+            ("POST", r"/v1/(?P<user>[^/]+)/crawlers", self._create_crawler),
+            ("GET", r"/v1/(?P<user>[^/]+)/crawlers/(?P<id>[^/]+)", self._get_crawler),
+            ("PUT", r"/v1/(?P<user>[^/]+)/crawlers/(?P<id>[^/]+)", self._update_crawler),
+            ("DELETE", r"/v1/(?P<user>[^/]+)/crawlers/(?P<id>[^/]+)", self._delete_crawler),
+            ("POST", r"/v1/(?P<user>[^/]+)/crawlers/(?P<id>[^/]+)/execute", self._execute),
+            ("GET", r"/v1/(?P<user>[^/]+)/crawlers/(?P<id>[^/]+)/execs", self._list_executions),
+            ("GET", r"/v1/(?P<user>[^/]+)/crawlers/(?P<id>[^/]+)/lastExec", self._last_execution),
+            ("GET", r"/v1/(?P<user>[^/]+)/crawlers/(?P<id>[^/]+)/lastExec/results", self._last_execution_results),
+            ("POST", r"/v1/(?P<user>[^/]+)/crawlers/(?P<id>[^/]+)/lastExec/stop", self._stop_last_execution),
+        )]
+
+    def __enter__(self):
+        self.start()
+        self._previous_url = common._api_url
+        common._api_url = self.url
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        common._api_url = self._previous_url
+        self.stop()
+
+    @property
+    def url(self):
+        """Returns: url (str): root url of the server, to use instead of https://api.apify.com"""
+        return "http://{0}:{1}".format(*self._server.server_address[:2])
+
+    def start(self, host="127.0.0.1", port=0):
+        """Starts serving in a background thread
+
+        Args:
+            host (str): address to listen on (default: "127.0.0.1")
+            port (int): port to listen on, 0 for any free port (default: 0)
+        """
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops serving"""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def add_items(self, dataset_id, items):
+        """Appends items to a dataset, creating it if needed
+
+        Args:
+            dataset_id (str): dataset ID
+            items (list of JSON objects): items to append
+        """
+        with self._lock:
+            self._dataset(dataset_id).extend(codec.dumps(item) for item in items)
+
+    def respond(self, method, path, query, headers, body):
+        """Answers one request
+
+        Args:
+            method (str): HTTP method
+            path (str): url path
+            query (dict): query parameters
+            headers (email.message.Message): request headers
+            body (bytes): request body
+
+        Returns:
+            status (int), headers (dict), body (bytes): response
+        """
+        status, out, payload = self._answer(method, path, query, headers, body)
+        if self.compress and payload and "gzip" in headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload, mtime=0)
+            out["Content-Encoding"] = "gzip"
+        # Ranges count bytes of the body as sent, after any Content-Encoding, like the API's
+        match = re.match(r"bytes=(\d+)-$", headers.get("Range", ""))
+        if method == "GET" and status == 200 and match:
+            first = int(match.group(1))
+            if first >= len(payload):
+                out["Content-Range"] = "bytes */{0}".format(len(payload))
+                return 416, out, b""
+            out["Content-Range"] = "bytes {0}-{1}/{2}".format(first, len(payload) - 1, len(payload))
+            return 206, out, payload[first:]
+        return status, out, payload
+
+    def _answer(self, method, path, query, headers, body):
+        self.requests[method] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.throttle and self._random.random() < self.throttle:
+            self.throttled += 1
+            out = {} if self.retry_after is None else {"Retry-After": str(self.retry_after)}
+            return 429, out, codec.dumps({"error": {"type": "rate-limit-exceeded"}})
+        if headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                with self._lock:
+                    out = handler(query, body, **match.groupdict())
+                break
+        else:
+            out = 404, {"error": {"type": "page-not-found"}}
+        status, payload = out[:2]
+        if isinstance(payload, bytes):
+            return status, {"Content-Type": out[2]} if len(out) > 2 else {}, payload
+        if payload is None:
+            return status, {}, b""
+        return status, {"Content-Type": "application/json; charset=utf-8"}, codec.dumps(payload)
+
+    def _take_drop(self, size):
+        """Returns: sent (int): number of bytes of a response of size bytes to send before dropping the
+        connection, or None to send all of it"""
+        with self._lock:
+            if self.drop_after is None or size <= self.drop_after:
+                return None
+            sent, self.drop_after = self.drop_after, None
+            return sent
+
+    # State
+
+    def _new_id(self, prefix):
+        return "{0}{1:07d}".format(prefix, next(self._ids))
+
+    def _object(self, collection, object_id):
+        objects = self._objects[collection]
+        if object_id not in objects:
+            now = _now()
+            objects[object_id] = {"id": object_id, "name": object_id, "createdAt": now, "modifiedAt": now}
+            if collection == "acts":
+                objects[object_id]["versions"] = [{"versionNumber": "0.0", "sourceType": "SOURCE_CODE"}]
+        return objects[object_id]
+
+    def _dataset(self, dataset_id):
+        if dataset_id not in self._datasets:
+            self._datasets[dataset_id] = [full for full, simplified in self._generated()]
+        return self._datasets[dataset_id]
+
+    def _generated(self):
+        # Encoded once: (item, execution result) pairs shared by every generated dataset and execution
+        if self._template is None:
+            self._template = [(codec.dumps(item), codec.dumps({"url": item["url"], "pageFunctionResult": item,
+                                                               "errorInfo": None}))
+                              for item in (self._item(i) for i in range(self.items))]
+        return self._template
+
+    def _item(self, i):
+        item = {"id": i, "url": "https://example.com/page/{0}".format(i), "title": "Page {0}".format(i),
+                "tags": ["tag{0}".format(j) for j in range(i % 3 + 1)]}
+        item["payload"] = "x" * max(0, self.item_size - len(codec.dumps(item)) - 14)
+        return item
+
+    def _run(self, kind, parent, query, data=None):
+        now = time.time()
+        run_id = self._new_id(kind[0])
+        run = {"id": run_id, "actId": parent, "status": "RUNNING", "startedAt": _now(now), "finishedAt": None,
+               "defaultDatasetId": run_id + "-dataset", "defaultKeyValueStoreId": run_id + "-store",
+               "defaultRequestQueueId": run_id + "-queue", "_kind": kind, "_finishes": now + self.run_duration,
+               "_final": "SUCCEEDED"}
+        if kind == "build":
+            run["buildNumber"] = query.get("version", "0.0") + "." + run_id
+        self._runs[run_id] = run
+        # Every run succeeds and echoes its input as its output
+        records = self._records.setdefault(run["defaultKeyValueStoreId"], {})
+        records["INPUT"] = records["OUTPUT"] = (data or b"{}", "application/json")
+        return run
+
+    def _over_run_limit(self):
+        if self.max_runs is None:
+            return False
+        now = time.time()
+        running = sum(1 for run in self._runs.values()
+                      if run["_kind"] == "run" and run["status"] == "RUNNING" and run["_finishes"] > now)
+        return running >= self.max_runs
+
+    def _wait(self, run, query, key="waitForFinish"):
+        # Long polling: hold the response until the run finishes or the requested time runs out
+        wait = min(float(query.get(key, 0) or 0), max(0.0, run["_finishes"] - time.time()))
+        if wait > 0:
+            self._lock.release()
+            try:
+                time.sleep(wait)
+            finally:
+                self._lock.acquire()
+
+    def _public_run(self, run):
+        out = {k: v for k, v in run.items() if k not in ("_kind", "_finishes", "_final")}
+        if run["status"] == "RUNNING" and time.time() >= run["_finishes"]:
+            run["status"] = out["status"] = run["_final"]
+        if out["status"] != "RUNNING":
+            out["finishedAt"] = run["finishedAt"] = run["finishedAt"] or _now(run["_finishes"])
+        return out
+
+    def _execution(self, crawler_id, query):
+        now = time.time()
+        execution_id = self._new_id("e")
+        execution = {"_id": execution_id, "actId": crawler_id, "status": "RUNNING", "startedAt": _now(now),
+                     "finishedAt": None, "tag": query.get("tag"), "_finishes": now + self.run_duration,
+                     "_final": "SUCCEEDED"}
+        execution["detailsUrl"] = self.url + "/v1/execs/" + execution_id
+        execution["resultsUrl"] = execution["detailsUrl"] + "/results"
+        self._executions[execution_id] = execution
+        return execution
+
+    def _results_of(self, execution_id):
+        if execution_id not in self._results:
+            self._results[execution_id] = [(result, item) for item, result in self._generated()]
+        return self._results[execution_id]
+
+    # v2 collections
+
+    def _list_objects(self, query, body, collection):
+        if collection not in self._objects:
+            return 404, {"error": {"type": "page-not-found"}}
+        return 200, {"data": _page(list(self._objects[collection].values()), query)}
+
+    def _create_object(self, query, body, collection):
+        if collection not in self._objects:
+            return 404, {"error": {"type": "page-not-found"}}
+        settings = codec.loads(body) if body else {}
+        object_id = self._new_id(collection[0])
+        obj = self._object(collection, query.get("name") or settings.get("name") or object_id)
+        obj.update(settings)
+        return 201, {"data": obj}
+
+    def _get_object(self, query, body, collection, id):
+        if collection not in self._objects:
+            return 404, {"error": {"type": "page-not-found"}}
+        obj = dict(self._object(collection, id))
+        if collection == "datasets":
+            obj["itemCount"] = obj["cleanItemCount"] = len(self._dataset(id))
+        elif collection == "request-queues":
+            obj["totalRequestCount"] = len(self._queues.get(id, {}))
+        return 200, {"data": obj}
+
+    def _update_object(self, query, body, collection, id):
+        obj = self._object(collection, id)
+        obj.update(codec.loads(body) if body else {})
+        obj["modifiedAt"] = _now()
+        return 200, {"data": obj}
+
+    def _delete_object(self, query, body, collection, id):
+        self._objects.get(collection, {}).pop(id, None)
+        if collection == "datasets":
+            self._datasets.pop(id, None)
+        return 204, None
+
+    def _get_user(self, query, body, id):
+        return 200, {"data": {"id": "mock-user" if id == "me" else id, "username": "mock",
+                              "plan": {"maxConcurrentActorJobs": self.max_runs or 32, "maxActorMemoryGbytes": 32}}}
+
+    # Actors and tasks
+
+    def _list_runs(self, query, body, collection, id):
+        runs = [self._public_run(run) for run in self._runs.values() if run["actId"] == id and run["_kind"] == "run"]
+        return 200, {"data": _page(runs, query)}
+
+    def _start_run(self, query, body, collection, id):
+        self._object(collection, id)
+        if self._over_run_limit():
+            return 402, {"error": {"type": "actor-concurrent-runs-limit-exceeded",
+                                   "message": "Maximum number of concurrent runs reached"}}
+        run = self._run("run", id, query, body or None)
+        self._wait(run, query)
+        return 201, {"data": self._public_run(run)}
+
+    def _get_run(self, query, body, run, collection=None, id=None):
+        if run not in self._runs:
+            return 404, {"error": {"type": "record-not-found"}}
+        self._wait(self._runs[run], query)
+        return 200, {"data": self._public_run(self._runs[run])}
+
+    def _abort_run(self, query, body, run, collection=None, id=None):
+        if run not in self._runs:
+            return 404, {"error": {"type": "record-not-found"}}
+        if self._public_run(self._runs[run])["status"] == "RUNNING":
+            self._runs[run].update(status="ABORTED", _final="ABORTED", _finishes=time.time())
+        return 200, {"data": self._public_run(self._runs[run])}
+
+    def _run_sync(self, query, body, collection, id):
+        self._object(collection, id)
+        if self._over_run_limit():
+            return 402, {"error": {"type": "actor-concurrent-runs-limit-exceeded",
+                                   "message": "Maximum number of concurrent runs reached"}}
+        run = self._run("run", id, query, body or None)
+        self._wait(run, {"waitForFinish": 300})
+        key = query.get("outputRecordKey", "OUTPUT")
+        value = self._records[run["defaultKeyValueStoreId"]].get(key)
+        if value is None:
+            return 404, {"error": {"type": "record-not-found"}}
+        return 201, value[0], value[1]
+
+    def _list_builds(self, query, body, id):
+        builds = [self._public_run(run) for run in self._runs.values() if run["actId"] == id and run["_kind"] == "build"]
+        return 200, {"data": _page(builds, query)}
+
+    def _start_build(self, query, body, id):
+        self._object("acts", id)
+        build = self._run("build", id, query)
+        self._wait(build, query)
+        return 201, {"data": self._public_run(build)}
+
+    def _list_versions(self, query, body, id):
+        versions = self._object("acts", id)["versions"]
+        return 200, {"data": {"total": len(versions), "items": versions}}
+
+    def _create_version(self, query, body, id):
+        version = codec.loads(body) if body else {}
+        versions = self._object("acts", id)["versions"]
+        version.setdefault("versionNumber", "0.{0}".format(len(versions)))
+        versions.append(version)
+        return 201, {"data": version}
+
+    def _find_version(self, id, version):
+        for found in self._object("acts", id)["versions"]:
+            if found["versionNumber"] == version:
+                return found
+        return None
+
+    def _get_version(self, query, body, id, version):
+        found = self._find_version(id, version)
+        if found is None:
+            return 404, {"error": {"type": "record-not-found"}}
+        return 200, {"data": found}
+
+    def _update_version(self, query, body, id, version):
+        found = self._find_version(id, version)
+        if found is None:
+            return 404, {"error": {"type": "record-not-found"}}
+        found.update(codec.loads(body) if body else {})
+        return 200, {"data": found}
+
+    def _delete_version(self, query, body, id, version):
+        versions = self._object("acts", id)["versions"]
+        versions[:] = [found for found in versions if found["versionNumber"] != version]
+        return 204, None
+
+    # Datasets
+
+    def _get_items(self, query, body, id):
+        items = self._dataset(id)
+        return _items_response(items, query, [codec.loads(item) for item in items] if query.get("format") in (
+            "csv",) else None)
+
+    def _put_items(self, query, body, id):
+        data = codec.loads(body)
+        self._dataset(id).extend(codec.dumps(item) for item in (data if isinstance(data, list) else [data]))
+        return 201, None
+
+    # Key-value stores
+
+    def _list_keys(self, query, body, id):
+        keys = sorted(self._records.get(id, {}))
+        start = query.get("exclusiveStartKey")
+        if start is not None:
+            keys = [key for key in keys if key > start]
+        limit = int(query.get("limit", 1000))
+        items = [{"key": key, "size": len(self._records[id][key][0])} for key in keys[:limit]]
+        return 200, {"data": {"items": items, "count": len(items), "limit": limit, "exclusiveStartKey": start,
+                              "isTruncated": len(keys) > limit,
+                              "nextExclusiveStartKey": keys[limit - 1] if len(keys) > limit else None}}
+
+    def _get_record(self, query, body, id, key):
+        value = self._records.get(id, {}).get(urllib.parse.unquote(key))
+        if value is None:
+            return 404, {"error": {"type": "record-not-found"}}
+        return 200, value[0], value[1]
+
+    def _put_record(self, query, body, id, key):
+        self._records.setdefault(id, {})[urllib.parse.unquote(key)] = (body, "application/json")
+        return 201, None
+
+    def _delete_record(self, query, body, id, key):
+        self._records.get(id, {}).pop(urllib.parse.unquote(key), None)
+        return 204, None
+
+    def _direct_upload_url(self, query, body, id, key):
+        return 200, {"data": {"signedUrl": self.url + "/v2/key-value-stores/{0}/records/{1}".format(id, key)}}
+
+    # Request queues
+
+    def _add_request(self, query, body, id):
+        request = codec.loads(body)
+        queue = self._queues.setdefault(id, collections.OrderedDict())
+        for request_id, existing in queue.items():
+            if existing["uniqueKey"] == request["uniqueKey"]:
+                return 200, {"data": {"requestId": request_id, "wasAlreadyPresent": True, "wasAlreadyHandled": False}}
+        request["id"] = self._new_id("r")
+        queue[request["id"]] = request
+        if query.get("forefront") in ("1", "true", "True"):
+            queue.move_to_end(request["id"], last=False)
+        return 201, {"data": {"requestId": request["id"], "wasAlreadyPresent": False, "wasAlreadyHandled": False}}
+
+    def _get_head(self, query, body, id):
+        limit = int(query.get("limit", 100))
+        items = list(itertools.islice(self._queues.get(id, {}).values(), limit))
+        return 200, {"data": {"limit": limit, "queueModifiedAt": _now(), "items": items}}
+
+    def _get_request(self, query, body, id, request):
+        found = self._queues.get(id, {}).get(request)
+        if found is None:
+            return 404, {"error": {"type": "record-not-found"}}
+        return 200, {"data": found}
+
+    def _update_request(self, query, body, id, request):
+        queue = self._queues.setdefault(id, collections.OrderedDict())
+        queue[request] = dict(codec.loads(body), id=request)
+        return 200, {"data": {"requestId": request, "wasAlreadyPresent": True, "wasAlreadyHandled": False}}
+
+    def _delete_request(self, query, body, id, request):
+        self._queues.get(id, {}).pop(request, None)
+        return 204, None
+
+    # v1 crawlers and executions
+
+    def _list_crawlers(self, query, body, user):
+        return 200, list(self._objects["crawlers"].values())
+
+    def _create_crawler(self, query, body, user):
+        settings = codec.loads(body) if body else {}
+        crawler = self._object("crawlers", settings.get("customId") or self._new_id("c"))
+        crawler.update(settings)
+        return 201, crawler
+
+    def _get_crawler(self, query, body, user, id):
+        return 200, self._object("crawlers", id)
+
+    def _update_crawler(self, query, body, user, id):
+        crawler = self._object("crawlers", id)
+        crawler.update(codec.loads(body) if body else {})
+        return 200, crawler
+
+    def _delete_crawler(self, query, body, user, id):
+        self._objects["crawlers"].pop(id, None)
+        return 204, None
+
+    def _execute(self, query, body, user, id):
+        self._object("crawlers", id)
+        execution = self._execution(id, query)
+        self._wait(execution, query, "wait")
+        return 200, self._public_run(execution)
+
+    def _crawler_executions(self, id, query):
+        executions = [self._public_run(e) for e in self._executions.values() if e["actId"] == id]
+        if query.get("status"):
+            executions = [e for e in executions if e["status"] == query["status"]]
+        return executions
+
+    def _list_executions(self, query, body, user, id):
+        executions = self._crawler_executions(id, query)
+        if query.get("desc") in ("1", "true"):
+            executions.reverse()
+        offset = int(query.get("offset", 0))
+        return 200, executions[offset:offset + int(query.get("limit", 1000))]
+
+    def _last_execution(self, query, body, user, id):
+        executions = self._crawler_executions(id, query)
+        if not executions:
+            return 404, {"type": "record-not-found"}
+        return 200, executions[-1]
+
+    def _last_execution_results(self, query, body, user, id):
+        executions = self._crawler_executions(id, query)
+        if not executions:
+            return 404, {"type": "record-not-found"}
+        return self._get_results(query, body, executions[-1]["_id"])
+
+    def _stop_last_execution(self, query, body, user, id):
+        executions = self._crawler_executions(id, {})
+        if not executions:
+            return 404, {"type": "record-not-found"}
+        return self._stop_execution(query, body, executions[-1]["_id"])
+
+    def _get_execution(self, query, body, run):
+        if run not in self._executions:
+            return 404, {"type": "record-not-found"}
+        return 200, self._public_run(self._executions[run])
+
+    def _stop_execution(self, query, body, run):
+        if run not in self._executions:
+            return 404, {"type": "record-not-found"}
+        execution = self._executions[run]
+        if self._public_run(execution)["status"] == "RUNNING":
+            execution.update(status="STOPPED", _final="STOPPED", _finishes=time.time())
+        return 200, self._public_run(execution)
+
+    def _get_results(self, query, body, run):
+        if run not in self._executions:
+            return 404, {"type": "record-not-found"}
+        simplified = query.get("simplified") in ("1", "true")
+        results = [result[simplified] for result in self._results_of(run)]
+        return _items_response(results, query, [codec.loads(result) for result in results] if query.get(
+            "format") in ("csv",) else None)
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    # Large fan-outs open many connections at once; a short listen backlog would drop and delay them
+    request_queue_size = 1024
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, small responses wait for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query, keep_blank_values=True))
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        status, headers, out = self.server.mock.respond(self.command, url.path, query, self.headers, body)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        sent = self.server.mock._take_drop(len(out))
+        if sent is not None:
+            self.wfile.write(out[:sent])
+            self.close_connection = True
+            return
+        self.wfile.write(out)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _now(timestamp=None):
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(timestamp))
+
+
+def _page(items, query):
+    if query.get("desc") in ("1", "true"):
+        items = items[::-1]
+    offset = int(query.get("offset", 0))
+    limit = int(query.get("limit", 1000))
+    page = items[offset:offset + limit]
+    return {"total": len(items), "offset": offset, "limit": limit, "count": len(page), "desc": "desc" in query,
+            "items": page}
+
+
+def _items_response(encoded, query, decoded=None):
+    """Returns: status (int), body (bytes), content type (str): a page of dataset items or execution results"""
+    format_ = query.get("format", "json")
+    offset = int(query.get("offset", 0))
+    limit = int(query.get("limit", len(encoded)))
+    order = slice(None, None, -1) if query.get("desc") in ("1", "true") else slice(None)
+    page = encoded[order][offset:offset + limit]
+    unwind = query.get("unwind")
+    if unwind:
+        page = [codec.dumps(out) for item in page for out in _unwind(codec.loads(item), unwind)]
+    if format_ == "json":
+        return 200, b"[" + b",".join(page) + b"]", "application/json; charset=utf-8"
+    if format_ == "jsonl":
+        return 200, b"".join(item + b"\n" for item in page), "application/jsonl; charset=utf-8"
+    if format_ == "csv":
+        rows = decoded[order][offset:offset + limit]
+        if unwind:
+            rows = [out for row in rows for out in _unwind(row, unwind)]
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]) if rows else [], extrasaction="ignore")
+        if query.get("skipHeaderRow") not in ("1", "true"):
+            writer.writeheader()
+        writer.writerows({k: v if isinstance(v, str) else codec.dumps(v).decode() for k, v in row.items()}
+                         for row in rows)
+        bom = b"\xef\xbb\xbf" if query.get("bom") in ("1", "true") else b""
+        return 200, bom + out.getvalue().encode(), "text/csv; charset=utf-8"
+    return 400, {"error": {"type": "invalid-parameter", "message": "format not supported by the mock server"}}
+
+
+def _unwind(item, field):
+    """Yields: item (JSON object): item once per element of its list field, objects merged into it"""
+    value = item.get(field)
+    if not isinstance(value, list) or not value:
+        yield item
+        return
+    for element in value:
+        out = {k: v for k, v in item.items() if k != field}
+        if isinstance(element, dict):
+            out.update(element)
+        else:
+            out[field] = element
+        yield out
+
+
+def main():
+    """Serves the mock API until interrupted: python -m apifyunofficial.mockserver --port 8000"""
+    import argparse
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--item-size", type=int, default=200)
+    parser.add_argument("--throttle", type=float, default=0.0)
+    parser.add_argument("--run-duration", type=float, default=0.0)
+    parser.add_argument("--max-runs", type=int, default=None)
+    args = parser.parse_args()
+    server = MockServer(args.latency, args.items, args.item_size, args.throttle, run_duration=args.run_duration,
+                        max_runs=args.max_runs)
+    server.start(args.host, args.port)
+    print("Serving the mock Apify API on " + server.url, flush=True)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
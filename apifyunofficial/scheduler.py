@@ -0,0 +1,329 @@
+import collections
+import email.utils
+import random
+import threading
+import time
+import urllib.parse
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        """Allows rate requests per second on average and burst requests at once
+
+        Args:
+            rate (float): tokens added per second
+            burst (float): maximum number of tokens
+        """
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes a token, possibly borrowed from the future
+
+        Returns:
+            delay (float): number of seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            return max(delay, self._blocked_until - now)
+
+    def block(self, seconds):
+        """Holds every request for at least seconds, e.g. after a Retry-After header
+
+        Args:
+            seconds (float): number of seconds to wait
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class AdaptiveLimit:
+    def __init__(self, initial=None, minimum=1, maximum=256, cooldown=1.0):
+        """Limits concurrent requests, growing the limit by one after each full window without throttling
+        and halving it when the API throttles (at most once per cooldown)
+
+        Args:
+            initial (int): starting limit, None for no limit until the API first throttles, which then sets it
+                to half the requests in flight (default: None)
+            minimum (int): lowest limit (default: 1)
+            maximum (int): highest limit (default: 256)
+            cooldown (float): minimum number of seconds between two decreases (default: 1.0)
+        """
+        self.limit = initial
+        self._minimum = minimum
+        self._maximum = maximum
+        self._cooldown = cooldown
+        self._active = 0
+        self._successes = 0
+        self._decreased = 0.0
+        self._condition = threading.Condition()
+        self._async_waiters = collections.deque()
+
+    def try_acquire(self):
+        """Returns: acquired (bool): whether a slot was taken"""
+        with self._condition:
+            if not self._free():
+                return False
+            self._active += 1
+            return True
+
+    def acquire(self):
+        """Waits for a free slot"""
+        with self._condition:
+            while not self._free():
+                self._condition.wait()
+            self._active += 1
+
+    async def acquire_async(self):
+        """Waits for a free slot without blocking the event loop"""
+        # Imported here, so that sync users do not pay for loading asyncio
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._free():
+                    self._active += 1
+                    return
+                waiter = loop, loop.create_future()
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1]
+            except asyncio.CancelledError:
+                with self._condition:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+                    else:
+                        # Woken for a slot it will not take: pass the slot on
+                        self._wake()
+                raise
+
+    def release(self, throttled):
+        """Frees a slot and adapts the limit
+
+        Args:
+            throttled (bool): whether the request was rejected with HTTP 429
+        """
+        with self._condition:
+            now = time.monotonic()
+            if throttled:
+                self._successes = 0
+                if now - self._decreased >= self._cooldown:
+                    self.limit = max(self._minimum, min(self._maximum, (self._active if self.limit is None
+                                                                        else self.limit) // 2))
+                    self._decreased = now
+            elif self.limit is not None:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self._maximum:
+                    self.limit += 1
+                    self._successes = 0
+            self._active -= 1
+            self._condition.notify_all()
+            self._wake()
+
+    def _free(self):
+        # Called with the condition held
+        return self.limit is None or self._active < self.limit
+
+    def _wake(self):
+        # Called with the condition held: wakes as many waiting coroutines as there are free slots
+        free = len(self._async_waiters) if self.limit is None else self.limit - self._active
+        while free > 0 and self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(_resolve, future)
+            free -= 1
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Scheduler:
+    def __init__(self, rate=250, burst=None, concurrency=None, min_concurrency=1, max_concurrency=256,
+                 max_retries=8, backoff=0.5, max_backoff=60):
+        """Sends every request through per-endpoint-class token buckets and an adaptive concurrency limit,
+        retrying requests throttled with HTTP 429
+        Requests the API holds open on purpose (run-sync, waitForFinish and crawler wait long polls) are paced by
+        the token buckets but never take a concurrency slot, so they cannot starve the other requests.
+
+        Args:
+            rate (float): requests per second allowed per endpoint class (default: 250)
+            burst (float): requests allowed at once per endpoint class (default: rate)
+            concurrency (int): initial number of concurrent requests, None for no limit until the API
+                first throttles (default: None)
+            min_concurrency (int): lowest number of concurrent requests (default: 1)
+            max_concurrency (int): highest number of concurrent requests (default: 256)
+            max_retries (int): maximum number of retries of a throttled request (default: 8)
+            backoff (float): base number of seconds to wait without a Retry-After header (default: 0.5)
+            max_backoff (float): maximum number of seconds to wait between retries (default: 60)
+        """
+        self._rate = rate
+        self._burst = rate if burst is None else burst
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+        self._limit = AdaptiveLimit(concurrency, min_concurrency, max_concurrency)
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self.requests = 0
+        self.throttled = 0
+
+    def get_concurrency(self):
+        """Returns: concurrency (int): current concurrency limit, None while there is none"""
+        return self._limit.limit
+
+    def admit(self, url):
+        """Returns: delay (float): number of seconds to wait before sending a request to url"""
+        return self._bucket(url).reserve()
+
+    def acquire(self):
+        """Waits for a concurrency slot"""
+        self._limit.acquire()
+
+    def try_acquire(self):
+        """Returns: acquired (bool): whether a concurrency slot was taken"""
+        return self._limit.try_acquire()
+
+    async def acquire_async(self):
+        """Waits for a concurrency slot without blocking the event loop"""
+        await self._limit.acquire_async()
+
+    def release(self, throttled, limited=True):
+        """Frees a concurrency slot
+
+        Args:
+            throttled (bool): whether the request was rejected with HTTP 429
+            limited (bool): whether the request took a concurrency slot (default: True)
+        """
+        self.requests += 1
+        self.throttled += throttled
+        if limited:
+            self._limit.release(throttled)
+
+    def retry_delay(self, url, retry_after, attempt):
+        """Gets how long to wait before retrying a throttled request, and holds its endpoint class as long
+
+        Args:
+            url (str): url of the throttled request
+            retry_after (str): value of the Retry-After header, or None
+            attempt (int): number of retries already made
+
+        Returns:
+            delay (float): number of seconds to wait, or None if the request should not be retried
+        """
+        if attempt >= self._max_retries:
+            return None
+        delay = _parse_retry_after(retry_after)
+        if delay is None:
+            delay = min(self._max_backoff, self._backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+        else:
+            delay += random.uniform(0, min(1.0, delay * 0.1))
+        self._bucket(url).block(delay)
+        return delay
+
+    def send(self, session, method, url, trace=None, **kwargs):
+        """Sends a request once the rate limits allow it, retrying it while it is throttled
+
+        Args:
+            session (requests.Session): used to send the HTTP requests
+            method (str): HTTP method
+            url (str): url to request
+            trace (dict): if given, receives "queue" and "backoff" seconds, "retries" and the
+                time.perf_counter() value "sent" at which the final attempt was sent (default: None)
+            kwargs: passed to session.request
+
+        Returns:
+            r (requests.Response): response, throttled if retries ran out
+        """
+        trace = {} if trace is None else trace
+        trace.update(queue=0.0, backoff=0.0, retries=0)
+        limited = not _is_long_poll(url, kwargs.get("params"))
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            time.sleep(self.admit(url))
+            if limited:
+                self.acquire()
+            trace["sent"] = time.perf_counter()
+            trace["queue"] += trace["sent"] - start
+            throttled = False
+            try:
+                r = session.request(method, url, **kwargs)
+                throttled = r.status_code == 429
+            finally:
+                self.release(throttled, limited)
+            if not throttled:
+                return r
+            delay = self.retry_delay(url, r.headers.get("Retry-After"), attempt)
+            if delay is None:
+                return r
+            r.close()
+            time.sleep(delay)
+            trace["backoff"] += delay
+            attempt += 1
+            trace["retries"] = attempt
+
+    def _bucket(self, url):
+        key = _endpoint_class(url)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._buckets_lock:
+                bucket = self._buckets.setdefault(key, TokenBucket(self._rate, self._burst))
+        return bucket
+
+
+def _endpoint_class(url):
+    """Returns: endpoint_class (str): API version and collection, e.g. "v2/datasets" or "v1/execs" """
+    segments = urllib.parse.urlsplit(url).path.strip("/").split("/")
+    if segments[0] == "v1":
+        return "v1/execs" if len(segments) > 1 and segments[1] == "execs" else "v1/crawlers"
+    return "/".join(segments[:2])
+
+
+def _is_long_poll(url, params):
+    """Returns: long_poll (bool): whether the API holds the request open until a run, build or execution finishes"""
+    if urllib.parse.urlsplit(url).path.rstrip("/").endswith("/run-sync"):
+        return True
+    params = params or {}
+    return str(params.get("waitForFinish") or 0) != "0" or str(params.get("wait") or 0) != "0"
+
+
+def _parse_retry_after(value):
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+_scheduler = Scheduler()
+
+
+def get_scheduler():
+    """Returns: scheduler (Scheduler): scheduler every request goes through, or None"""
+    return _scheduler
+
+
+def set_scheduler(scheduler):
+    """Changes the scheduler every request goes through
+
+    Args:
+        scheduler (Scheduler): new scheduler, None to send requests directly
+    """
+    global _scheduler
+    _scheduler = scheduler
@@ -0,0 +1,67 @@
+import concurrent.futures
+import threading
+
+
+class SingleFlight:
+    def __init__(self):
+        """Lets concurrent threads asking for the same key share one call"""
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Calls fn, unless a call for key is already in flight, in which case waits for its result
+
+        Args:
+            key (hashable): identifies identical calls
+            fn (callable): function called without arguments
+
+        Returns:
+            result: return value of fn, possibly from another thread's call
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        """Lets concurrent asyncio tasks asking for the same key share one call"""
+        self._calls = {}
+
+    async def do(self, key, fn):
+        """Awaits fn(), unless a call for key is already in flight, in which case awaits its result
+        Cancelling one caller does not cancel the shared call.
+
+        Args:
+            key (hashable): identifies identical calls
+            fn (callable): coroutine function called without arguments
+
+        Returns:
+            result: return value of fn, possibly from another task's call
+        """
+        # Imported here, so that sync users do not pay for loading asyncio
+        import asyncio
+
+        key = (asyncio.get_running_loop(), key)
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
@@ -0,0 +1,327 @@
+import concurrent.futures
+import heapq
+import itertools
+import math
+import threading
+import time
+
+from . import common
+
+# Statuses of crawler executions, actor runs and builds that are still going
+_active_statuses = ("READY", "RUNNING", "TIMING-OUT", "ABORTING")
+
+
+class _Wait:
+    __slots__ = ("handle", "future", "deadline", "interval", "status", "errors")
+
+    def __init__(self, handle, future, deadline, interval):
+        self.handle = handle
+        self.future = future
+        self.deadline = deadline
+        self.interval = interval
+        self.status = None
+        self.errors = 0
+
+
+class ExecutionWaiter:
+    def __init__(self, min_interval=1.0, max_interval=60.0, backoff=1.5, max_errors=5):
+        """Waits for any number of crawler executions from one background thread
+        Each execution is polled on its own schedule: the interval starts at min_interval, grows by backoff after
+        every poll that finds the status unchanged, and starts over when the status changes.
+
+        Args:
+            min_interval (float): number of seconds between the first polls (default: 1.0)
+            max_interval (float): maximum number of seconds between two polls (default: 60.0)
+            backoff (float): factor the interval grows by while the status stays the same (default: 1.5)
+            max_errors (int): number of failed polls in a row after which a wait fails (default: 5)
+        """
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._max_errors = max_errors
+        self._heap = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._threads = []
+        self._workers = 1
+        self._closed = False
+        self._active = 0
+        self.polls = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def wait_for(self, execution, timeout=None, callback=None):
+        """Starts waiting for an execution to finish
+
+        Args:
+            execution (Crawler.Execution): execution to wait for
+            timeout (float): number of seconds after which the wait ends even if the execution is still running (default: None, no limit)
+            callback (callable): called with the latest execution details once the wait ends (default: None)
+
+        Returns:
+            future (concurrent.futures.Future): resolves to the latest execution details once the execution
+                finishes or the timeout runs out
+        """
+        future = concurrent.futures.Future()
+        if callback is not None:
+            future.add_done_callback(_notify(callback))
+        now = time.monotonic()
+        deadline = None if timeout is None else now + timeout
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("waiter is closed")
+            self._active += 1
+            self._push(_Wait(execution, future, deadline, self._min_interval), now)
+            self._start()
+        return future
+
+    def wait_all(self, executions, timeout=None):
+        """Waits for several executions to finish
+
+        Args:
+            executions (iterable of Crawler.Execution): executions to wait for
+            timeout (float): number of seconds after which the waits end (default: None, no limit)
+
+        Returns:
+            details (list of JSON objects): latest details of each execution, in the same order
+        """
+        return [future.result() for future in [self.wait_for(execution, timeout) for execution in executions]]
+
+    def pending(self):
+        """Returns: pending (int): number of executions being waited for"""
+        return self._active
+
+    def close(self, cancel=False):
+        """Stops the background thread
+
+        Args:
+            cancel (bool): if True, cancels the waits in progress instead of letting them end first (default: False)
+        """
+        with self._condition:
+            if not cancel:
+                while self._active:
+                    self._condition.wait()
+            self._closed = True
+            for _, _, wait in self._heap:
+                wait.future.cancel()
+            self._active -= len(self._heap)
+            self._heap = []
+            self._condition.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def _start(self):
+        # Called with the condition held
+        if len(self._threads) < min(self._workers, self._active):
+            thread = threading.Thread(target=self._run, name="apify-{0}-{1}".format(
+                type(self).__name__.lower(), len(self._threads)), daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _push(self, wait, now):
+        # Called with the condition held
+        when = now + wait.interval
+        if wait.deadline is not None:
+            when = min(when, wait.deadline)
+        heapq.heappush(self._heap, (when, next(self._order), wait))
+        self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    delay = self._heap[0][0] - time.monotonic() if self._heap else None
+                    if delay is not None and delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                if self._closed:
+                    return
+                _, _, wait = heapq.heappop(self._heap)
+            done = self._poll(wait)
+            with self._condition:
+                if not done and not self._closed:
+                    self._push(wait, time.monotonic())
+                    continue
+                if not done:
+                    wait.future.cancel()
+                self._active -= 1
+                self._condition.notify_all()
+
+    def _poll(self, wait):
+        """Returns: done (bool): whether the wait ended"""
+        if wait.future.cancelled():
+            return True
+        try:
+            details = _fetch_details(wait.handle)
+        except Exception as e:
+            wait.errors += 1
+            if wait.errors >= self._max_errors:
+                _settle(wait.future, exception=e)
+                return True
+            wait.interval = min(self._max_interval, wait.interval * self._backoff)
+            return False
+        self.polls += 1
+        wait.errors = 0
+        status = details.get("data", details).get("status")
+        timed_out = wait.deadline is not None and time.monotonic() >= wait.deadline
+        if not _is_active(details) or timed_out:
+            _settle(wait.future, details)
+            return True
+        if status == wait.status:
+            wait.interval = min(self._max_interval, wait.interval * self._backoff)
+        else:
+            wait.interval = self._min_interval
+        wait.status = status
+        return False
+
+
+class RunWaiter(ExecutionWaiter):
+    def __init__(self, connections=8, max_wait=60, min_wait=1, max_errors=5, session=None,
+                 config="apify_config.json"):
+        """Waits for any number of actor runs, task runs and builds on a few connections
+        Each connection long-polls one run at a time with waitForFinish and moves on to the run that has waited the
+        longest, so a finished run is noticed at once while few runs are going, and within one round of short
+        long-polls while many are. The length of a long-poll is max_wait shared out among the pending runs.
+        The long-polls are paced by the scheduler's rate limits but take none of its concurrency slots, so they
+        never hold up other API calls.
+
+        Args:
+            connections (int): number of long-polls in flight at once (default: 8)
+            max_wait (int): longest long-poll in seconds, the API caps it at 60 (default: 60)
+            min_wait (int): shortest long-poll in seconds (default: 1)
+            max_errors (int): number of failed polls in a row after which a wait fails (default: 5)
+            session (requests.Session object): used for runs given as run details (default: shared session)
+            config (str, path-like): path to JSON file with user ID and token, used for runs given as run details
+        """
+        super().__init__(min_interval=0.0, max_interval=max_wait, max_errors=max_errors)
+        self._workers = connections
+        self._max_wait = max_wait
+        self._min_wait = min_wait
+        self._session = session
+        self._config = config
+
+    def wait_for(self, run, timeout=None, callback=None):
+        """Starts waiting for a run or build to finish
+
+        Args:
+            run (Actor.Run, Actor.Build or JSON object): run or build to wait for, or run details as returned by
+                Actor.run and Task.run_asynchronously
+            timeout (float): number of seconds after which the wait ends even if the run is still going (default: None, no limit)
+            callback (callable): called with the latest run details once the wait ends (default: None)
+
+        Returns:
+            future (concurrent.futures.Future): resolves to the latest run details once the run finishes
+                or the timeout runs out
+        """
+        if isinstance(run, dict):
+            from .Actor import _Run
+
+            details = run.get("data", run)
+            run = _Run(details["actId"], details["id"], self._session, self._config)
+        return super().wait_for(run, timeout, callback)
+
+    def as_completed(self, runs, timeout=None):
+        """Waits for several runs or builds, yielding each one as it finishes
+
+        Args:
+            runs (iterable of Actor.Run, Actor.Build or JSON objects): runs or builds to wait for
+            timeout (float): number of seconds after which the remaining waits end (default: None, no limit)
+
+        Yields:
+            details (JSON object): latest details of each run, in the order they finish
+        """
+        futures = [self.wait_for(run, timeout) for run in runs]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+    def _poll(self, wait):
+        """Returns: done (bool): whether the wait ended"""
+        if wait.future.cancelled():
+            return True
+        seconds = max(self._min_wait, min(self._max_wait, self._max_wait * self._workers // max(1, self._active)))
+        if wait.deadline is not None:
+            seconds = min(seconds, max(0, math.ceil(wait.deadline - time.monotonic())))
+        try:
+            details = _fetch_details(wait.handle, waitForFinish=seconds)
+        except Exception as e:
+            wait.errors += 1
+            if wait.errors >= self._max_errors:
+                _settle(wait.future, exception=e)
+                return True
+            wait.interval = min(self._max_interval, max(self._min_wait, wait.interval * 2))
+            return False
+        self.polls += 1
+        wait.errors = 0
+        wait.interval = 0.0
+        if not _is_active(details) or (wait.deadline is not None and time.monotonic() >= wait.deadline):
+            _settle(wait.future, details)
+            return True
+        return False
+
+
+def _fetch_details(handle, **kwargs):
+    """Gets fresh details of an execution, run or build, bypassing the response cache
+
+    Args:
+        handle (Crawler.Execution, Actor.Run or Actor.Build): object whose details are fetched
+    kwargs:
+        waitForFinish (int): maximum number of seconds the API holds the request while a run or build is going
+
+    Returns:
+        details (JSON object): details as returned by the API
+    """
+    kwargs["token"] = handle.get_token()
+    r = common._send(handle.get_session(), "GET", handle._base_url, params=kwargs)
+    r.raise_for_status()
+    return common._decode(r)
+
+
+def _is_active(details):
+    """Returns: active (bool): whether the execution, run or build described by details is still going"""
+    return details.get("data", details).get("status") in _active_statuses
+
+
+def _notify(callback):
+    def done(future):
+        if not future.cancelled() and future.exception() is None:
+            callback(future.result())
+    return done
+
+
+def _settle(future, result=None, exception=None):
+    # The caller may have cancelled the future in the meantime
+    try:
+        if exception is None:
+            future.set_result(result)
+        else:
+            future.set_exception(exception)
+    except concurrent.futures.InvalidStateError:
+        pass
+
+
+_waiter = None
+_run_waiter = None
+_waiter_lock = threading.Lock()
+
+
+def get_execution_waiter():
+    """Returns: waiter (ExecutionWaiter): waiter shared by every execution, created on first use"""
+    global _waiter
+    with _waiter_lock:
+        if _waiter is None:
+            _waiter = ExecutionWaiter()
+        return _waiter
+
+
+def get_run_waiter():
+    """Returns: waiter (RunWaiter): waiter shared by every actor run and build, created on first use"""
+    global _run_waiter
+    with _waiter_lock:
+        if _run_waiter is None:
+            _run_waiter = RunWaiter()
+        return _run_waiter
@@ -0,0 +1,61 @@
+"""Compares the JSON codecs available to apifyunofficial on dataset-like item payloads
+
+Usage: python benchmarks/codec_bench.py [items]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apifyunofficial import codec  # noqa: E402
+
+
+def make_items(count, seed=0):
+    """Returns: items (list of dict): items shaped like a typical e-commerce crawl result"""
+    rng = random.Random(seed)
+    words = ["apify", "crawler", "product", "price", "review", "catalog", "stock", "café", "über", "日本"]
+    return [
+        {
+            "url": "https://shop.example.com/p/{0}?ref=list&page={1}".format(i, i // 50),
+            "title": " ".join(rng.choice(words) for _ in range(8)),
+            "price": round(rng.uniform(1, 1000), 2),
+            "currency": "USD",
+            "inStock": rng.random() > 0.2,
+            "rating": {"average": round(rng.uniform(1, 5), 1), "count": rng.randint(0, 5000)},
+            "tags": [rng.choice(words) for _ in range(rng.randint(0, 6))],
+            "images": ["https://cdn.example.com/{0}/{1}.jpg".format(i, j) for j in range(rng.randint(1, 4))],
+            "description": " ".join(rng.choice(words) for _ in range(60)),
+            "#debug": {"requestId": "{0:016x}".format(rng.getrandbits(64)), "retryCount": 0, "loadedUrl": None},
+        }
+        for i in range(count)
+    ]
+
+
+def best_of(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    items = make_items(count)
+    print("{0} items".format(count))
+    print("{0:<8} {1:>12} {2:>12} {3:>12} {4:>12}".format("codec", "encode MB/s", "decode MB/s", "encode it/s", "decode it/s"))
+    for name in codec.available_codecs():
+        c = codec._codecs[name]()
+        body = c.dumps(items)
+        size = len(body) / 1e6
+        encode = best_of(lambda: c.dumps(items))
+        decode = best_of(lambda: c.loads(body))
+        print("{0:<8} {1:>12.1f} {2:>12.1f} {3:>12.0f} {4:>12.0f}".format(
+            name, size / encode, size / decode, count / encode, count / decode))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measures how long a fresh interpreter takes to import apifyunofficial
+
+Usage: python benchmarks/import_time.py [runs] [--baseline REF]
+
+With --baseline, the same cases are also timed against the package as it is at the git revision REF
+(e.g. the commit before a change), extracted to a temporary directory.
+"""
+import argparse
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(here)
+
+CASES = [
+    ("baseline (interpreter only)", "pass"),
+    ("import apifyunofficial", "import apifyunofficial"),
+    ("first use of one class", "import apifyunofficial; apifyunofficial.Dataset"),
+]
+
+
+def measure(code, runs, path):
+    env = dict(os.environ, PYTHONPATH=path + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, cwd=path, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def extract(ref, path):
+    """Writes the apifyunofficial package as it is at git revision ref into path"""
+    archive = subprocess.run(["git", "-C", root, "archive", ref, "apifyunofficial"], stdout=subprocess.PIPE,
+                             check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("runs", type=int, nargs="?", default=20, help="interpreters started per case")
+    parser.add_argument("--baseline", help="git revision whose package is timed for comparison")
+    args = parser.parse_args()
+    if args.baseline is None:
+        for label, code in CASES:
+            print("{0:<45} {1:8.1f} ms".format(label, measure(code, args.runs, root) * 1000))
+        return
+    with tempfile.TemporaryDirectory() as baseline:
+        extract(args.baseline, baseline)
+        print("{0:<45} {1:>11} {2:>11}".format("case", args.baseline[:11], "current"))
+        for label, code in CASES:
+            print("{0:<45} {1:8.1f} ms {2:8.1f} ms".format(
+                label, measure(code, args.runs, baseline) * 1000, measure(code, args.runs, root) * 1000))
+
+
+if __name__ == "__main__":
+    main()
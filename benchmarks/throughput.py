@@ -0,0 +1,205 @@
+"""Measures requests/sec, items/sec and peak memory of the main client operations against the local mock server
+The server runs in its own process, so its work counts towards neither the client's time nor its memory.
+
+Usage: python benchmarks/throughput.py [--latency SECONDS] [--items N] [--item-size BYTES] [--throttle P]
+                                       [--repeat N] [--only SUBSTRING]
+"""
+import argparse
+import concurrent.futures
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(here)
+sys.path.insert(0, root)
+
+import apifyunofficial  # noqa: E402
+from apifyunofficial import common, scheduler  # noqa: E402
+
+CONFIG = {"user": "bench", "token": "bench"}
+CALLS = 200
+
+
+def actor_get(items):
+    actor = apifyunofficial.Actor("bench-actor", config=CONFIG)
+    for _ in range(CALLS):
+        actor.get()
+    return 0
+
+
+def actor_get_threaded(items):
+    with concurrent.futures.ThreadPoolExecutor(16) as executor:
+        # Distinct actors so that concurrent identical GETs are not coalesced
+        list(executor.map(lambda i: apifyunofficial.Actor("bench-actor-{0}".format(i), config=CONFIG).get(),
+                          range(CALLS)))
+    return 0
+
+
+def actor_run(items):
+    actor = apifyunofficial.Actor("bench-actor", config=CONFIG)
+    for _ in range(CALLS // 2):
+        actor.run({"start": 1})
+    return 0
+
+
+def actor_run_synchronously(items):
+    actor = apifyunofficial.Actor("bench-actor", config=CONFIG)
+    for _ in range(CALLS // 4):
+        actor.run_synchronously({"start": 1})
+    return 0
+
+
+def dataset_get_items(items):
+    return len(apifyunofficial.Dataset("bench-dataset", config=CONFIG).get_items())
+
+
+def dataset_get_items_stream(items):
+    return sum(1 for _ in apifyunofficial.Dataset("bench-dataset", config=CONFIG).get_items(stream=True))
+
+
+def dataset_iter_items(items):
+    return sum(1 for _ in apifyunofficial.Dataset("bench-dataset", config=CONFIG).iter_items(limit=1000))
+
+
+def dataset_export(items):
+    chunks = apifyunofficial.Dataset("bench-dataset", config=CONFIG).export(chunk_size=2000)
+    return sum(chunk.count(b"\n") for chunk in chunks)
+
+
+def dataset_writer(items):
+    payload = "x" * 200
+    with apifyunofficial.Dataset("bench-writer", config=CONFIG).writer(max_bytes=1 << 20) as writer:
+        for i in range(items):
+            writer.write({"id": i, "payload": payload})
+    return items
+
+
+def store_put(items):
+    store = apifyunofficial.Store("bench-store", config=CONFIG)
+    for i in range(CALLS):
+        store.Record("key{0}".format(i)).put({"value": i})
+    return 0
+
+
+def store_get(items):
+    store = apifyunofficial.Store("bench-store", config=CONFIG)
+    store.Record("key").put({"value": 0})
+    for _ in range(CALLS):
+        store.Record("key").get()
+    return 0
+
+
+def queue_add_request(items):
+    queue = apifyunofficial.Queue("bench-queue", config=CONFIG)
+    start = time.perf_counter_ns()
+    for i in range(CALLS):
+        queue.add_request("{0}-{1}".format(start, i), "https://example.com/{0}".format(i), "GET")
+    return 0
+
+
+def queue_get_head(items):
+    queue = apifyunofficial.Queue("bench-queue", config=CONFIG)
+    for _ in range(CALLS):
+        queue.get_head(limit=100)
+    return 0
+
+
+def _execution():
+    details = apifyunofficial.Crawler("bench-crawler", config=CONFIG).start()
+    return apifyunofficial.Execution(details["_id"], config=CONFIG)
+
+
+def execution_get_results(items):
+    return len(_execution().get_results())
+
+
+def execution_get_results_combine(items):
+    return len(_execution().get_results(combine=True))
+
+
+def execution_get_results_stream(items):
+    return sum(1 for _ in _execution().get_results(stream=True))
+
+
+CASES = [
+    ("Actor.get", actor_get),
+    ("Actor.get x16 threads", actor_get_threaded),
+    ("Actor.run", actor_run),
+    ("Actor.run_synchronously", actor_run_synchronously),
+    ("Dataset.get_items", dataset_get_items),
+    ("Dataset.get_items stream", dataset_get_items_stream),
+    ("Dataset.iter_items", dataset_iter_items),
+    ("Dataset.export", dataset_export),
+    ("DatasetWriter.write", dataset_writer),
+    ("Store.Record.put", store_put),
+    ("Store.Record.get", store_get),
+    ("Queue.add_request", queue_add_request),
+    ("Queue.get_head", queue_get_head),
+    ("Execution.get_results", execution_get_results),
+    ("Execution.get_results combine", execution_get_results_combine),
+    ("Execution.get_results stream", execution_get_results_stream),
+]
+
+
+def start_server(args):
+    command = [sys.executable, "-m", "apifyunofficial.mockserver", "--port", "0", "--latency", str(args.latency),
+               "--items", str(args.items), "--item-size", str(args.item_size), "--throttle", str(args.throttle)]
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, env=env, text=True)
+    url = server.stdout.readline().split()[-1]
+    return server, url
+
+
+def measure(func, items, repeat):
+    """Returns: seconds (float), requests (int), processed (int), peak (int): best time and its counts, peak bytes"""
+    scheduler_ = scheduler.get_scheduler()
+    best = None
+    for _ in range(repeat):
+        requests = scheduler_.requests
+        start = time.perf_counter()
+        processed = func(items)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best[0]:
+            best = seconds, scheduler_.requests - requests, processed
+    # Tracing slows the client down, so memory is measured in a separate run
+    tracemalloc.start()
+    func(items)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best + (peak,)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    parser.add_argument("--items", type=int, default=20000, help="items per dataset and execution")
+    parser.add_argument("--item-size", type=int, default=300, help="approximate bytes per item")
+    parser.add_argument("--throttle", type=float, default=0.0, help="probability of an HTTP 429 response")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best is reported")
+    parser.add_argument("--only", default="", help="only run the cases whose name contains this")
+    args = parser.parse_args()
+
+    server, url = start_server(args)
+    common._api_url = url
+    try:
+        print("{0} items of ~{1} bytes, {2}s latency, {3:.0%} throttled".format(
+            args.items, args.item_size, args.latency, args.throttle))
+        print("{0:<32} {1:>9} {2:>9} {3:>10} {4:>12} {5:>10}".format(
+            "case", "seconds", "requests", "req/s", "items/s", "peak MiB"))
+        for name, func in CASES:
+            if args.only not in name:
+                continue
+            seconds, requests, processed, peak = measure(func, args.items, args.repeat)
+            print("{0:<32} {1:>9.3f} {2:>9} {3:>10.0f} {4:>12} {5:>10.1f}".format(
+                name, seconds, requests, requests / seconds,
+                "{0:.0f}".format(processed / seconds) if processed else "-", peak / (1 << 20)))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -27,7 +27,8 @@ REQUIRED = [
 
 # What packages are optional?
 EXTRAS = {
-    # 'fancy feature': ['django'],
+    'async': ['aiohttp'],
+    'fast': ['orjson'],
 }
 
 # The rest you shouldn't have to touch too much :)
@@ -0,0 +1,16 @@
+import pytest
+
+from apifyunofficial import mockserver
+
+
+@pytest.fixture
+def server():
+    """Local stand-in for the API, which every object created during the test talks to"""
+    with mockserver.MockServer(items=100, item_size=50) as server:
+        yield server
+
+
+@pytest.fixture
+def config():
+    """Credentials accepted by the stand-in server"""
+    return {"user": "test", "token": "test"}
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+
+import aiohttp
+import pytest
+import requests
+
+import apifyunofficial
+from apifyunofficial import aio
+
+
+def _strip_times(details):
+    # Timestamps and generated IDs differ between two runs; everything else must match
+    return {key: value for key, value in details.items() if not key.endswith("At") and key != "id"
+            and not key.startswith("default") and key != "stats"}
+
+
+def test_sync_and_async_return_the_same_values(server, config):
+    actor = apifyunofficial.Actor("actor", config=config)
+    dataset = apifyunofficial.Dataset("dataset", config=config)
+    store = apifyunofficial.Store("store", config=config)
+    store.Record("key").put({"a": 1})
+    expected = (actor.get(), dataset.get_items(), dataset.get_items(format="csv"), store.Record("key").get(),
+                actor.run({"x": 1})["data"])
+
+    async def main():
+        try:
+            async_actor = aio.AsyncActor("actor", config=config)
+            async_dataset = aio.AsyncDataset("dataset", config=config)
+            return (await async_actor.get(), await async_dataset.get_items(),
+                    await async_dataset.get_items(format="csv"),
+                    await aio.AsyncStore("store", config=config).Record("key").get(),
+                    (await async_actor.run({"x": 1}))["data"])
+        finally:
+            await aio.close_default_session()
+
+    got = asyncio.run(main())
+    assert got[:4] == expected[:4]
+    assert _strip_times(got[4]) == _strip_times(expected[4])
+
+
+def test_errors_are_raised(server, config):
+    with pytest.raises(requests.HTTPError) as sync_error:
+        apifyunofficial.Actor("actor", config=config).Run("missing").get()
+
+    async def main():
+        try:
+            await aio.AsyncActor("actor", config=config).Run("missing").get()
+        finally:
+            await aio.close_default_session()
+
+    with pytest.raises(aiohttp.ClientResponseError) as async_error:
+        asyncio.run(main())
+    assert async_error.value.status == sync_error.value.response.status_code == 404
+
+
+def test_session_limit_bounds_connections(server, config):
+    server.latency = 0.05
+    lock = threading.Lock()
+    active = [0, 0]
+    respond = server.respond
+
+    def counting(*args):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        try:
+            return respond(*args)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    server.respond = counting
+
+    async def main():
+        session = aio.create_session(limit=2)
+        try:
+            datasets = [aio.AsyncDataset("dataset{0}".format(i), session=session, config=config) for i in range(8)]
+            return await asyncio.gather(*(dataset.get_items(limit=5) for dataset in datasets))
+        finally:
+            await session.close()
+
+    pages = asyncio.run(main())
+    assert [len(page) for page in pages] == [5] * 8
+    assert active[1] == 2
+
+
+@pytest.mark.parametrize("content_type, body", [
+    ("application/json; charset=utf-8", b'{"a": [1, 2]}'),
+    ("application/jsonl", b'{"a": 1}\n{"a": 2}\n'),
+    ("text/plain; charset=utf-8", "é ✓".encode()),
+    ("image/png", b"\x89PNG\r\n\x1a\n\x00\xff"),
+])
+def test_run_synchronously_decodes_like_sync(server, config, content_type, body):
+    respond = server.respond
+
+    def output(method, path, query, headers, request_body):
+        status, out, payload = respond(method, path, query, headers, request_body)
+        if path.endswith("/run-sync"):
+            return status, {"Content-Type": content_type}, body
+        return status, out, payload
+
+    server.respond = output
+    expected = (apifyunofficial.Actor("actor", config=config).run_synchronously({"x": 1}),
+                apifyunofficial.Task("task", config=config).run_synchronously({"x": 1}))
+
+    async def main():
+        try:
+            return (await aio.AsyncActor("actor", config=config).run_synchronously({"x": 1}),
+                    await aio.AsyncTask("task", config=config).run_synchronously({"x": 1}))
+        finally:
+            await aio.close_default_session()
+
+    assert asyncio.run(main()) == expected
@@ -0,0 +1,24 @@
+import apifyunofficial
+
+
+def test_unknown_limits_use_default_concurrency(server, config, monkeypatch):
+    server.run_duration = 0.2
+    runner = apifyunofficial.BatchRunner(apifyunofficial.Actor("actor", config=config))
+    monkeypatch.setattr(runner, "get_account_limit", lambda: None)
+    results = list(runner.run({"i": i} for i in range(20)))
+    assert sorted(input_["i"] for input_, _ in results) == list(range(20))
+    assert all(details["data"]["status"] == "SUCCEEDED" for _, details in results)
+    assert runner.limit == 8
+
+
+def test_timed_out_runs_do_not_grow_limit(server, config, monkeypatch):
+    server.run_duration = 5
+    server.max_runs = 2
+    runner = apifyunofficial.BatchRunner(apifyunofficial.Actor("actor", config=config), concurrency=4)
+    monkeypatch.setattr(runner, "get_account_limit", lambda: None)
+    batch = runner.run(({"i": i} for i in range(3)), timeout=0.2)
+    _, details = next(batch)
+    batch.close()
+    assert details["data"]["status"] == "RUNNING"
+    assert runner.rejected == 1
+    assert runner.limit == 2
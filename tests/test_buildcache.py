@@ -0,0 +1,61 @@
+import apifyunofficial
+from apifyunofficial import buildcache, codec
+
+
+def test_unchanged_source_reuses_build(server, config):
+    actor = apifyunofficial.Actor("actor", config=config)
+    with apifyunofficial.BuildCache(":memory:") as build_cache:
+        first = actor.build("0.0", build_cache=build_cache)["data"]
+        assert actor.build("0.0", build_cache=build_cache)["data"]["id"] == first["id"]
+        actor.Version("0.0").update({"sourceCode": "changed"})
+        assert actor.build("0.0", build_cache=build_cache)["data"]["id"] != first["id"]
+        assert (build_cache.hits, build_cache.misses) == (1, 2)
+
+
+def test_build_options_are_part_of_the_key(server, config):
+    actor = apifyunofficial.Actor("actor", config=config)
+    with apifyunofficial.BuildCache(":memory:") as build_cache:
+        plain = actor.build("0.0", build_cache=build_cache)["data"]["id"]
+        tagged = actor.build("0.0", build_cache=build_cache, tag="beta")["data"]["id"]
+        beta = actor.build("0.0", build_cache=build_cache, betaPackages=True)["data"]["id"]
+        assert len({plain, tagged, beta}) == 3
+        assert actor.build("0.0", build_cache=build_cache, tag="beta")["data"]["id"] == tagged
+
+
+def test_force_rebuilds_and_is_not_sent(server, config):
+    actor = apifyunofficial.Actor("actor", config=config)
+    with apifyunofficial.BuildCache(":memory:") as build_cache:
+        first = actor.build("0.0", build_cache=build_cache)["data"]["id"]
+        assert actor.build("0.0", build_cache=build_cache, force=True)["data"]["id"] != first
+    sent = []
+    server_respond = server.respond
+
+    def respond(method, path, query, headers, body):
+        sent.append(query)
+        return server_respond(method, path, query, headers, body)
+
+    server.respond = respond
+    actor.build("0.0", force=True)
+    assert "force" not in sent[-1]
+
+
+def test_failed_builds_are_not_reused(server, config):
+    server.run_duration = 5
+    actor = apifyunofficial.Actor("actor", config=config)
+    with apifyunofficial.BuildCache(":memory:") as build_cache:
+        first = actor.build("0.0", build_cache=build_cache)["data"]["id"]
+        actor.Build(first).abort()
+        assert actor.build("0.0", build_cache=build_cache)["data"]["id"] != first
+
+
+def test_source_hash_does_not_depend_on_codec():
+    settings = {"sourceType": "SOURCE_CODE", "sourceCode": "é ✓ </script>", "envVars": [{"name": "A", "value": "1"}]}
+    previous = codec.get_codec()
+    try:
+        hashes = set()
+        for name in codec.available_codecs():
+            codec.set_codec(name)
+            hashes.add(buildcache._source_hash(settings, {"tag": "beta"}))
+    finally:
+        codec.set_codec(previous)
+    assert len(hashes) == 1
@@ -0,0 +1,41 @@
+import time
+
+import requests
+
+import apifyunofficial
+
+
+def test_metadata_is_cached(server, config):
+    response_cache = apifyunofficial.ResponseCache(ttl=60)
+    actor = apifyunofficial.Actor("actor", requests.Session(), config)
+    actor.set_cache(response_cache)
+    assert actor.get() == actor.get()
+    actor.get_list_of_versions()
+    actor.get_list_of_versions()
+    assert response_cache.hits == 2
+
+
+def test_run_status_is_not_cached(server, config):
+    server.run_duration = 0.2
+    actor = apifyunofficial.Actor("actor", requests.Session(), config)
+    actor.set_cache(apifyunofficial.ResponseCache(ttl=60))
+    run = actor.Run(actor.run()["data"]["id"])
+    assert run.get()["data"]["status"] == "RUNNING"
+    time.sleep(0.3)
+    assert run.get()["data"]["status"] == "SUCCEEDED"
+
+
+def test_items_and_records_are_not_cached(server, config):
+    session = requests.Session()
+    response_cache = apifyunofficial.ResponseCache(ttl=60)
+    dataset = apifyunofficial.Dataset("dataset", session, config)
+    dataset.set_cache(response_cache)
+    count = dataset.get()["data"]["itemCount"]
+    dataset.put_items([{"id": "new"}])
+    assert dataset.get()["data"]["itemCount"] == count + 1
+    record = apifyunofficial.Store("store", session, config).Record("key")
+    record.put({"value": 1})
+    assert record.get() == {"value": 1}
+    server._records["store"]["key"] = (b'{"value": 2}', "application/json")
+    assert record.get() == {"value": 2}
+    assert response_cache.hits == 0
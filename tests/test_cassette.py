@@ -0,0 +1,62 @@
+import gzip
+
+import pytest
+
+import apifyunofficial
+from apifyunofficial import codec, mockserver
+from apifyunofficial.cassette import Cassette, CassetteError
+
+CONFIG = {"user": "test", "token": "secret-token"}
+
+
+def _exercise(session):
+    actor = apifyunofficial.Actor("actor", session=session, config=CONFIG)
+    dataset = apifyunofficial.Dataset("dataset", session=session, config=CONFIG)
+    return (actor.update({"b": 1, "a": [1, 2], "text": "é"})["data"]["id"], dataset.get_items(limit=5),
+            dataset.get_items(format="csv", limit=5))
+
+
+def _record(path):
+    with mockserver.MockServer(items=20, item_size=50):
+        with Cassette(path, mode="record") as cassette:
+            return _exercise(cassette.session())
+
+
+@pytest.fixture
+def restore_codec():
+    previous = codec.get_codec()
+    yield
+    codec.set_codec(previous)
+
+
+def test_replay_returns_recorded_responses(tmp_path):
+    path = tmp_path / "run.cassette"
+    recorded = _record(path)
+    with Cassette(path, time_scale=0) as cassette:
+        assert _exercise(cassette.session()) == recorded
+
+
+def test_redacted_parameters_are_not_stored(tmp_path):
+    path = tmp_path / "run.cassette"
+    _record(path)
+    with gzip.open(path, "rb") as f:
+        assert b"secret-token" not in f.read()
+
+
+def test_unrecorded_request_raises(tmp_path):
+    path = tmp_path / "run.cassette"
+    _record(path)
+    with Cassette(path, time_scale=0) as cassette:
+        with pytest.raises(CassetteError):
+            apifyunofficial.Actor("other", session=cassette.session(), config=CONFIG).get()
+
+
+@pytest.mark.parametrize("recorded_with", codec.available_codecs())
+def test_replay_matches_bodies_of_any_codec(tmp_path, restore_codec, recorded_with):
+    path = tmp_path / "run.cassette"
+    codec.set_codec(recorded_with)
+    recorded = _record(path)
+    for replayed_with in codec.available_codecs():
+        codec.set_codec(replayed_with)
+        with Cassette(path, time_scale=0) as cassette:
+            assert _exercise(cassette.session()) == recorded
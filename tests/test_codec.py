@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+import apifyunofficial
+from apifyunofficial import codec
+
+PAYLOADS = [
+    {"text": "é ✓", "list": [1, 2.5, None, True]},
+    {1: "non-string key"},
+    {"big": 2 ** 70 + 1},
+    {"negative": -(2 ** 63) - 3, "float": 0.1234567890123456789},
+]
+
+DOCUMENTS = [
+    b'{"big": 1180591620717411303425}',
+    b'[-9223372036854775811, 18446744073709551617]',
+    b'{"nan": NaN, "inf": Infinity, "ninf": -Infinity}',
+    '{"text": "\u00e9 \u2713", "big": 1180591620717411303425}',
+]
+
+
+@pytest.fixture(params=codec.available_codecs())
+def codec_name(request):
+    previous = codec.get_codec()
+    codec.set_codec(request.param)
+    yield request.param
+    codec.set_codec(previous)
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_codecs_accept_what_json_accepts(codec_name, payload):
+    assert json.loads(codec.dumps(payload)) == json.loads(json.dumps(payload))
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_codecs_decode_what_json_decodes(codec_name, document):
+    # repr, so that float and int, and NaN, compare exactly
+    assert repr(codec.loads(document)) == repr(json.loads(document))
+
+
+def test_codecs_reject_what_json_rejects(codec_name):
+    with pytest.raises(ValueError):
+        codec.loads(b'{"a": }')
+
+
+def test_put_items_with_any_codec(codec_name, server, config):
+    dataset = apifyunofficial.Dataset("codec-dataset-" + codec_name, config=config)
+    dataset.put_items([{1: "x"}, {"big": 2 ** 70 + 1}])
+    items = dataset.get_items(offset=100)
+    assert items == [{"1": "x"}, {"big": 2 ** 70 + 1}]
+    assert isinstance(items[1]["big"], int)
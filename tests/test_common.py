@@ -0,0 +1,64 @@
+import threading
+
+import apifyunofficial
+from apifyunofficial import common, mockserver
+
+
+class _Writer:
+    """Writable that has nothing but write, like many sockets and pipes wrapped for streaming"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+
+
+def test_download_into_write_only_file(server, config):
+    dataset = apifyunofficial.Dataset("dataset", config=config)
+    writer = _Writer()
+    assert dataset.get_items(file=writer, attachment=1, format="csv") is writer
+    assert b"".join(writer.chunks).count(b"\n") >= 100
+
+
+def test_iter_merged_close_drops_pending_sources():
+    started = []
+    release = threading.Event()
+
+    def source(tag):
+        def pages():
+            started.append(tag)
+            yield [tag]
+            release.wait(1)
+        return pages
+
+    merged = common._iter_merged(((tag, source(tag)) for tag in range(10)), workers=1)
+    assert next(merged) == (0, [0])
+    merged.close()
+    release.set()
+    threading.Event().wait(0.3)
+    assert started == [0]
+
+
+def _download(server, config, tmp_path, **kwargs):
+    dataset = apifyunofficial.Dataset("dataset", config=config)
+    expected = dataset.get_items(format="csv").encode()
+    for name, value in kwargs.items():
+        setattr(server, name, value)
+    path = dataset.get_items(file=str(tmp_path / "items.csv"), attachment=1, format="csv")
+    with open(path, "rb") as f:
+        return f.read(), expected
+
+
+def test_download_resumes_after_dropped_connection(server, config, tmp_path):
+    got, expected = _download(server, config, tmp_path, drop_after=1000)
+    assert got == expected
+    assert server.drop_after is None
+
+
+def test_download_resumes_from_compressing_server(config, tmp_path):
+    # Large enough for the connection to drop well after the first decoded bytes reach the file
+    with mockserver.MockServer(items=5000, item_size=300, compress=True) as server:
+        got, expected = _download(server, config, tmp_path, drop_after=20000)
+    assert got == expected
+    assert server.drop_after is None
@@ -0,0 +1,112 @@
+import io
+import time
+
+import pytest
+import requests
+
+import apifyunofficial
+from apifyunofficial import codec
+
+
+class _Writer:
+    """Writable whose write returns None"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+
+
+def test_export_jsonl(server, config):
+    dataset = apifyunofficial.Dataset("dataset", config=config)
+    f = io.BytesIO()
+    assert dataset.export(f, chunk_size=7, workers=3) == len(f.getvalue())
+    assert [codec.loads(line) for line in f.getvalue().splitlines()] == dataset.get_items()
+
+
+def test_export_csv_has_one_header_and_bom(server, config):
+    dataset = apifyunofficial.Dataset("dataset", config=config)
+    expected = dataset.get_items(format="csv", bom=1).encode()
+    f = io.BytesIO()
+    dataset.export(f, format_="csv", chunk_size=30, bom=1)
+    assert f.getvalue() == expected
+    assert f.getvalue().count(b"\xef\xbb\xbf") == 1
+
+
+def test_export_to_write_only_file(server, config, tmp_path):
+    dataset = apifyunofficial.Dataset("dataset", config=config)
+    writer = _Writer()
+    written = dataset.export(writer, offset=10, chunk_size=25)
+    assert written == len(b"".join(writer.chunks))
+    assert len(b"".join(writer.chunks).splitlines()) == 90
+    path = tmp_path / "items.jsonl"
+    assert dataset.export(str(path)) == path.stat().st_size
+
+
+def _record_puts(server):
+    bodies = []
+    respond = server.respond
+
+    def recording(method, path, query, headers, body):
+        if method == "PUT" and path.endswith("/items"):
+            bodies.append(body)
+        return respond(method, path, query, headers, body)
+
+    server.respond = recording
+    return bodies
+
+
+def test_writer_splits_batches_by_size(server, config):
+    bodies = _record_puts(server)
+    dataset = apifyunofficial.Dataset("writer-dataset", config=config)
+    items = [{"i": i, "text": "x" * (i % 40)} for i in range(200)]
+    with dataset.writer(max_bytes=500) as writer:
+        writer.write_many(items)
+    assert all(len(body) <= 500 for body in bodies)
+    assert writer.stats()["batches"] == len(bodies) > 1
+    assert writer.stats()["items"] == 200
+    assert sorted(dataset.get_items(offset=100), key=lambda item: item["i"]) == items
+
+
+def test_ordered_writer_keeps_order(server, config):
+    server.latency = 0.01
+    dataset = apifyunofficial.Dataset("writer-dataset", config=config)
+    items = [{"i": i} for i in range(100)]
+    with dataset.writer(max_bytes=100, workers=8, ordered=True) as writer:
+        writer.write_many(items)
+    assert dataset.get_items(offset=100) == items
+
+
+def test_flush_interval_uploads_idle_buffer(server, config):
+    dataset = apifyunofficial.Dataset("writer-dataset", config=config)
+    with dataset.writer(flush_interval=0.1) as writer:
+        writer.write({"i": 0})
+        deadline = time.monotonic() + 2
+        while not dataset.get_items(offset=100) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert dataset.get_items(offset=100) == [{"i": 0}]
+
+
+def test_upload_errors_surface_on_close(server, config):
+    respond = server.respond
+
+    def failing(method, path, query, headers, body):
+        if method == "PUT":
+            return 400, {}, b'{"error": {"type": "invalid-input"}}'
+        return respond(method, path, query, headers, body)
+
+    server.respond = failing
+    writer = apifyunofficial.Dataset("writer-dataset", config=config).writer()
+    writer.write({"i": 0})
+    with pytest.raises(requests.HTTPError):
+        writer.close()
+
+
+def test_write_after_close_raises(server, config):
+    writer = apifyunofficial.Dataset("writer-dataset", config=config).writer()
+    writer.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.write({"i": 0})
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.flush()
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import apifyunofficial
+from apifyunofficial import aio
+
+
+def _unwound(items):
+    return [(item["id"], tag) for item in items for tag in item["tags"]]
+
+
+def test_iter_items_unwind(server, config):
+    dataset = apifyunofficial.Dataset("dataset", config=config)
+    expected = _unwound(dataset.get_items())
+    items = list(dataset.iter_items(limit=7, unwind="tags"))
+    assert [(item["id"], item["tags"]) for item in items] == expected
+
+
+def test_follow_yields_items_pushed_while_running(server, config):
+    server.run_duration = 1.0
+    actor = apifyunofficial.Actor("actor", config=config)
+    details = actor.run()["data"]
+    dataset_id = details["defaultDatasetId"]
+    dataset = apifyunofficial.Dataset(dataset_id, config=config)
+    generated = len(dataset.get_items())
+
+    def push():
+        for i in range(5):
+            time.sleep(0.1)
+            server.add_items(dataset_id, [{"id": "pushed-{0}".format(i)}])
+
+    threading.Thread(target=push).start()
+    items = list(dataset.iter_items(limit=30, follow=actor.Run(details["id"]), poll_interval=0.05))
+    assert len(items) == generated + 5
+    assert [item["id"] for item in items[generated:]] == ["pushed-{0}".format(i) for i in range(5)]
+
+
+def test_follow_rejects_unwind(server, config):
+    actor = apifyunofficial.Actor("actor", config=config)
+    run = actor.Run(actor.run()["data"]["id"])
+    with pytest.raises(ValueError):
+        next(apifyunofficial.Dataset("dataset", config=config).iter_items(follow=run, unwind="tags"))
+    with pytest.raises(ValueError):
+        apifyunofficial.run_and_iter_items("actor", config=config, follow=True, item_kwargs={"unwind": "tags"})
+
+
+def test_run_and_iter_items_starts_run_at_once(server, config):
+    server.run_duration = 0.2
+    actor = apifyunofficial.Actor("actor", config=config)
+    runs = actor.get_list_of_runs()["data"]["total"]
+    items = apifyunofficial.run_and_iter_items("actor", config=config)
+    assert actor.get_list_of_runs()["data"]["total"] == runs + 1
+    assert len(list(items)) == 100
+
+
+def test_async_run_and_iter_items_unwind(server, config):
+    server.run_duration = 0.2
+    expected = _unwound(apifyunofficial.Dataset("dataset", config=config).get_items())
+
+    async def main():
+        try:
+            return [item async for item in aio.run_and_iter_items("actor", config=config, limit=7,
+                                                                    item_kwargs={"unwind": "tags"})]
+        finally:
+            await aio.close_default_session()
+
+    items = asyncio.run(main())
+    assert [(item["id"], item["tags"]) for item in items] == expected
+
+
+def test_async_follow_rejects_unwind(server, config):
+    async def main():
+        async for _ in aio.run_and_iter_items("actor", config=config, follow=True, item_kwargs={"unwind": "tags"}):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
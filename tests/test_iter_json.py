@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+import apifyunofficial
+from apifyunofficial import common
+
+
+class _Response:
+    """Stand-in for a streamed requests.Response that yields the given chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        return iter(self._chunks)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("chunks, items", [
+    ([b"[1.", b"5]"], [1.5]),
+    ([b"[1, 2e", b"5]"], [1, 2e5]),
+    ([b"[12", b"3]"], [123]),
+    ([b"[-", b"4, tr", b"ue, nu", b"ll]"], [-4, True, None]),
+    ([b'[{"a": "x', b'y"}, [1', b", 2]", b" ]"], [{"a": "xy"}, [1, 2]]),
+])
+def test_items_cut_at_chunk_boundaries(chunks, items):
+    r = _Response(chunks)
+    assert list(common._iter_json(r)) == items
+    assert r.closed
+
+
+def test_every_split_point():
+    body = json.dumps([1.25, -3e-2, 17, "a,b]", {"k": [True, None]}, 1e10]).encode()
+    for split in range(1, len(body)):
+        assert list(common._iter_json(_Response([body[:split], body[split:]]))) == json.loads(body)
+
+
+def test_invalid_json_raises():
+    with pytest.raises(ValueError):
+        list(common._iter_json(_Response([b"[1.", b"x]"])))
+
+
+def test_jsonl_lines_cut_at_chunk_boundaries():
+    assert list(common._iter_json(_Response([b'{"a": 1.', b'5}\n{"a"', b": 2}\n"]), jsonl=True)) == [{"a": 1.5},
+                                                                                                    {"a": 2}]
+
+
+def test_streamed_items_match_downloaded_items(server, config):
+    server.add_items("floats", [{"value": i / 7, "big": i * 1e300} for i in range(5000)])
+    dataset = apifyunofficial.Dataset("floats", config=config)
+    assert list(dataset.get_items(stream=True, offset=100)) == dataset.get_items(offset=100)
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import apifyunofficial
+from apifyunofficial import codec, mockserver
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_generated_items(config):
+    with mockserver.MockServer(items=30, item_size=300):
+        items = apifyunofficial.Dataset("dataset", config=config).get_items()
+    assert [item["id"] for item in items] == list(range(30))
+    assert all(abs(len(codec.dumps(item)) - 300) <= 16 for item in items)
+
+
+def test_throttled_requests_are_retried(server, config):
+    server.throttle = 0.5
+    dataset = apifyunofficial.Dataset("dataset", config=config)
+    assert [len(dataset.get_items(offset=i, limit=5)) for i in range(10)] == [5] * 10
+    assert server.throttled > 0
+
+
+def test_queue_round_trip(server, config):
+    queue = apifyunofficial.Queue("queue", config=config)
+    queue.add_request("key", "https://example.com/", "GET")
+    head = queue.get_head()
+    assert [item["uniqueKey"] for item in head["data"]["items"]] == ["key"]
+
+
+def test_execution_results(server, config):
+    details = apifyunofficial.Crawler("crawler", config=config).start()
+    execution = apifyunofficial.Execution(details["_id"], config=config)
+    assert len(execution.get_results()) == 100
+
+
+def test_throughput_benchmark_runs():
+    out = subprocess.run([sys.executable, os.path.join(root, "benchmarks", "throughput.py"), "--items", "50",
+                          "--repeat", "1", "--only", "Actor.get"], capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    assert "Actor.get x16 threads" in out.stdout
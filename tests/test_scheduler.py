@@ -0,0 +1,98 @@
+import asyncio
+import concurrent.futures
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import apifyunofficial
+from apifyunofficial import aio, scheduler
+
+
+@pytest.fixture
+def fresh_scheduler():
+    previous = scheduler.get_scheduler()
+    scheduler_ = scheduler.Scheduler()
+    scheduler.set_scheduler(scheduler_)
+    yield scheduler_
+    scheduler.set_scheduler(previous)
+
+
+def test_long_polls_take_no_concurrency_slot(fresh_scheduler, server, config):
+    scheduler.set_scheduler(scheduler.Scheduler(concurrency=1))
+    server.run_duration = 0.5
+    actor = apifyunofficial.Actor("actor", config=config)
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(actor.run_synchronously, {"i": i}) for i in range(8)]
+        time.sleep(0.1)
+        actor.get()
+        assert time.perf_counter() - start < 0.4
+        assert [future.result() for future in futures] == [{"i": i} for i in range(8)]
+    assert time.perf_counter() - start < 1.0
+
+
+def test_no_concurrency_limit_until_throttled(fresh_scheduler, server, config):
+    assert fresh_scheduler.get_concurrency() is None
+    server.throttle = 1.0
+    server.retry_after = 0.01
+    with pytest.raises(Exception):
+        apifyunofficial.Actor("actor", config=config).get()
+    assert fresh_scheduler.get_concurrency() == 1
+
+
+def test_async_fan_out_keeps_session_limit(fresh_scheduler, server, config):
+    server.latency = 0.3
+
+    async def main():
+        session = aio.create_session(limit=100)
+        try:
+            datasets = [aio.AsyncDataset("dataset-{0}".format(i), session, config) for i in range(64)]
+            start = time.perf_counter()
+            await asyncio.gather(*(dataset.get() for dataset in datasets))
+            return time.perf_counter() - start
+        finally:
+            await session.close()
+
+    assert asyncio.run(main()) < 0.9
+
+
+def test_async_waiters_are_woken_by_release():
+    limit = scheduler.AdaptiveLimit(initial=1)
+    order = []
+
+    async def worker(name):
+        await limit.acquire_async()
+        order.append(name)
+        await asyncio.sleep(0.01)
+        limit.release(False)
+
+    async def main():
+        await asyncio.wait_for(asyncio.gather(*(worker(i) for i in range(5))), 1)
+
+    asyncio.run(main())
+    assert sorted(order) == list(range(5))
+
+
+def test_cancelled_async_waiter_passes_its_slot_on():
+    limit = scheduler.AdaptiveLimit(initial=1)
+
+    async def main():
+        await limit.acquire_async()
+        cancelled = asyncio.ensure_future(limit.acquire_async())
+        waiting = asyncio.ensure_future(limit.acquire_async())
+        await asyncio.sleep(0)
+        limit.release(False)
+        cancelled.cancel()
+        await asyncio.wait_for(waiting, 1)
+
+    asyncio.run(main())
+
+
+def test_import_does_not_load_asyncio():
+    code = "import sys; import apifyunofficial.scheduler; print('asyncio' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,50 @@
+import asyncio
+import concurrent.futures
+import os
+import subprocess
+import sys
+import threading
+
+from apifyunofficial import singleflight
+
+
+def test_threads_share_one_call():
+    flights = singleflight.SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        release.wait(1)
+        return "result"
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(flights.do, "key", fn) for _ in range(4)]
+        threading.Event().wait(0.1)
+        release.set()
+        assert [future.result() for future in futures] == ["result"] * 4
+    assert len(calls) == 1
+
+
+def test_tasks_share_one_call():
+    flights = singleflight.AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flights.do("key", fn) for _ in range(4)))
+
+    assert asyncio.run(main()) == ["result"] * 4
+    assert len(calls) == 1
+
+
+def test_sync_use_does_not_load_asyncio():
+    code = ("import sys; import apifyunofficial; apifyunofficial.Dataset; apifyunofficial.Actor; "
+            "apifyunofficial.run_and_iter_items; print('asyncio' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,43 @@
+import time
+
+import apifyunofficial
+from apifyunofficial import scheduler, waiter
+
+
+def test_run_waiter_resolves_runs_as_they_finish(server, config):
+    server.run_duration = 0.3
+    actors = [apifyunofficial.Actor("actor-{0}".format(i), config=config) for i in range(20)]
+    runs = [actor.Run(actor.run()["data"]["id"]) for actor in actors]
+    with waiter.RunWaiter(connections=4, max_wait=2, config=config) as run_waiter:
+        details = list(run_waiter.as_completed(runs))
+    assert {run["data"]["status"] for run in details} == {"SUCCEEDED"}
+    assert run_waiter.pending() == 0
+
+
+def test_run_waiter_deadline(server, config):
+    server.run_duration = 5
+    run = apifyunofficial.Actor("actor", config=config).run()
+    with waiter.RunWaiter(config=config) as run_waiter:
+        start = time.perf_counter()
+        details = run_waiter.wait_for(run, timeout=0.5).result()
+    assert details["data"]["status"] == "RUNNING"
+    assert time.perf_counter() - start < 2
+
+
+def test_long_polls_do_not_block_other_calls(server, config):
+    previous = scheduler.get_scheduler()
+    scheduler.set_scheduler(scheduler.Scheduler(concurrency=1))
+    try:
+        server.run_duration = 2
+        actor = apifyunofficial.Actor("actor", config=config)
+        run_waiter = waiter.RunWaiter(connections=8, config=config)
+        runs = [actor.run() for _ in range(8)]
+        futures = [run_waiter.wait_for(run) for run in runs]
+        time.sleep(0.2)
+        start = time.perf_counter()
+        actor.get_list_of_runs()
+        assert time.perf_counter() - start < 0.5
+        run_waiter.close(cancel=True)
+        assert all(future.cancelled() or future.done() for future in futures)
+    finally:
+        scheduler.set_scheduler(previous)